@@ -1,8 +1,19 @@
-from typing import List
+from typing import Any, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.list_params import (
+    NEXT_CURSOR_HEADER,
+    get_list_params,
+    paginate,
+)
+from app.api.responses import (
+    etag_response,
+    render_json,
+    rows_response,
+    rows_to_dicts,
+)
 from app.api.validators import (
     check_invested_amount_before_delete,
     check_project_data_before_update,
@@ -10,16 +21,28 @@ from app.api.validators import (
 )
 from app.core.db import get_async_session
 from app.core.user import current_superuser
-from app.crud import charity_project_crud
+from app.crud import allocation_crud, charity_project_crud
+from app.models import CharityProject
+from app.schemas.allocation import AllocationDB, AllocationStatus
 from app.schemas.charity_project import (
+    CharityProjectBatchResult,
     CharityProjectCreate,
     CharityProjectDB,
     CharityProjectUpdate,
 )
+from app.schemas.export import ExportFormat
+from app.schemas.list_params import ListParams
+from app.services.allocation_ledger import allocation_ledger
+from app.services.export import export_response
 from app.services.investment import (
     check_and_close_fully_invested_object,
-    invest_open_donations_in_project,
+    create_and_invest,
+)
+from app.services.project_batch import (
+    PROJECT_BATCH_MAX_SIZE,
+    create_projects_batch,
 )
+from app.services.response_cache import project_list_cache
 
 router = APIRouter()
 
@@ -30,10 +53,61 @@ router = APIRouter()
     response_model_exclude_none=True,
 )
 async def get_all_charity_projects(
+    request: Request,
+    response: Response,
+    params: ListParams = Depends(get_list_params),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Возвращает список проектов с фильтрами и курсорной пагинацией.
+    Ответ кэшируется; по ETag и If-None-Match возвращается 304.
+    """
+    cache_key, cached = await project_list_cache.get(
+        key=str(sorted(request.query_params.multi_items()))
+    )
+    if cached is None:
+        # Только нужные столбцы и сериализация без Pydantic:
+        # response_model описывает схему ответа в OpenAPI.
+        projects = await charity_project_crud.get_all(
+            session=session,
+            params=params,
+            fields=CharityProjectDB.__fields__,
+        )
+        projects = paginate(db_objs=projects, params=params, response=response)
+        headers = {}
+        if NEXT_CURSOR_HEADER in response.headers:
+            headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+        cached = render_json(
+            rows_to_dicts(projects, exclude_none=True), headers=headers
+        )
+        await project_list_cache.set(cache_key, cached)
+    return etag_response(cached=cached, request=request)
+
+
+@router.get("/export", dependencies=[Depends(current_superuser)])
+async def export_charity_projects(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Возвращает список всех проектов."""
-    return await charity_project_crud.get_all(session=session)
+    """
+    Потоковая выгрузка всех проектов в NDJSON или CSV.
+    Только для суперюзеров.
+    """
+    return export_response(
+        columns=[
+            CharityProject.id,
+            CharityProject.name,
+            CharityProject.description,
+            CharityProject.full_amount,
+            CharityProject.invested_amount,
+            CharityProject.fully_invested,
+            CharityProject.create_date,
+            CharityProject.close_date,
+        ],
+        session=session,
+        export_format=export_format,
+        filename="charity_projects",
+    )
 
 
 @router.post(
@@ -51,13 +125,66 @@ async def create_charity_project(
     Только для суперюзеров.
     """
     await check_project_name_exists(name=obj_in.name, session=session)
-    project = await charity_project_crud.create(obj_in=obj_in, session=session)
-    project = await invest_open_donations_in_project(
-        project=project, session=session
+    project = await create_and_invest(
+        crud=charity_project_crud, obj_in=obj_in, session=session
     )
     return project
 
 
+@router.post(
+    "/batch",
+    response_model=List[CharityProjectBatchResult],
+    dependencies=[Depends(current_superuser)],
+    response_model_exclude_none=True,
+)
+async def create_charity_projects_batch(
+    items: List[Any] = Body(
+        ..., min_items=1, max_items=PROJECT_BATCH_MAX_SIZE
+    ),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Создаёт пачку проектов одной транзакцией. Элементы пачки
+    (как в CharityProjectCreate) проверяются по одному: для каждого
+    возвращается созданный проект или ошибка (данные некорректны,
+    имя занято или повторяется в пачке). Только для суперюзеров.
+    """
+    return await create_projects_batch(items=items, session=session)
+
+
+@router.get("/{project_id}/status", response_model=AllocationStatus)
+async def get_charity_project_status(
+    project_id: int, session: AsyncSession = Depends(get_async_session)
+):
+    """Статус распределения средств проекта."""
+    return await charity_project_crud.get_or_404(
+        obj_id=project_id, session=session
+    )
+
+
+@router.get(
+    "/{project_id}/allocations",
+    response_model=List[AllocationDB],
+    dependencies=[Depends(current_superuser)],
+)
+async def get_charity_project_allocations(
+    project_id: int,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Какие пожертвования вложены в проект: пожертвования и суммы
+    в порядке распределения. Только для суперюзеров.
+    """
+    await charity_project_crud.get_or_404(obj_id=project_id, session=session)
+    allocations = await allocation_crud.get_by_project(
+        project_id=project_id,
+        fields=AllocationDB.__fields__,
+        session=session,
+    )
+    return rows_response(allocations, response=response)
+
+
 @router.delete(
     "/{project_id}",
     response_model=CharityProjectDB,
@@ -71,11 +198,13 @@ async def delete_charity_project(
     инвестированы средства, его можно только закрыть.
     Только для суперюзеров.
     """
-    project = await charity_project_crud.get_or_404(
-        obj_id=project_id, session=session
-    )
-    check_invested_amount_before_delete(project)
-    await charity_project_crud.delete(db_obj=project, session=session)
+    async with allocation_ledger.exclusive():
+        project = await charity_project_crud.get_or_404(
+            obj_id=project_id, session=session
+        )
+        check_invested_amount_before_delete(project)
+        await charity_project_crud.delete(db_obj=project, session=session)
+    await project_list_cache.invalidate()
     return project
 
 
@@ -94,14 +223,16 @@ async def update_charity_project(
     требуемую сумму меньше уже вложенной.
     Только для суперюзеров.
     """
-    project = await charity_project_crud.get_or_404(
-        obj_id=project_id, session=session
-    )
-    await check_project_data_before_update(
-        db_obj=project, obj_in=obj_in, session=session
-    )
-    project = check_and_close_fully_invested_object(db_obj=project)
-    project = await charity_project_crud.update(
-        db_obj=project, obj_in=obj_in, session=session
-    )
+    async with allocation_ledger.exclusive():
+        project = await charity_project_crud.get_or_404(
+            obj_id=project_id, session=session
+        )
+        await check_project_data_before_update(
+            db_obj=project, obj_in=obj_in, session=session
+        )
+        project = check_and_close_fully_invested_object(db_obj=project)
+        project = await charity_project_crud.update(
+            db_obj=project, obj_in=obj_in, session=session
+        )
+    await project_list_cache.invalidate()
     return project
@@ -1,19 +1,36 @@
+from http import HTTPStatus
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.validators import check_donation_amount_is_positive
+from app.api.list_params import get_list_params, paginate
+from app.api.responses import rows_response
+from app.api.validators import (
+    check_donation_amount_is_positive,
+    check_donation_belongs_to_user,
+)
 from app.core.db import get_async_session
 from app.core.user import current_superuser, current_user
-from app.crud import donation_crud
-from app.models import User
+from app.crud import allocation_crud, donation_crud, donor_balance_crud
+from app.models import Donation, User
+from app.schemas.allocation import AllocationDB, AllocationStatus
 from app.schemas.donation import (
     DonationCreate,
+    DonationImportResult,
+    DonationSummary,
     DonationtDB,
     ExtendedDonationtDB,
 )
-from app.services.investment import invest_donation_in_open_projects
+from app.schemas.export import ExportFormat
+from app.schemas.list_params import ListParams
+from app.services.donation_import import (
+    DonationImportError,
+    import_donations,
+    parse_donations,
+)
+from app.services.export import export_response
+from app.services.investment import create_and_invest
 
 router = APIRouter()
 
@@ -25,13 +42,71 @@ router = APIRouter()
     dependencies=[Depends(current_superuser)],
 )
 async def get_all_donations(
+    response: Response,
+    params: ListParams = Depends(get_list_params),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Возвращает список всех пожертвований.
+    Возвращает список всех пожертвований с фильтрами и курсорной
+    пагинацией. Только для суперюзеров.
+    """
+    donations = await donation_crud.get_all(
+        session=session, params=params, fields=ExtendedDonationtDB.__fields__
+    )
+    donations = paginate(db_objs=donations, params=params, response=response)
+    return rows_response(donations, response=response, exclude_none=True)
+
+
+@router.get("/export", dependencies=[Depends(current_superuser)])
+async def export_donations(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Потоковая выгрузка всех пожертвований в NDJSON или CSV.
     Только для суперюзеров.
     """
-    return await donation_crud.get_all(session=session)
+    return export_response(
+        columns=[
+            Donation.id,
+            Donation.comment,
+            Donation.full_amount,
+            Donation.invested_amount,
+            Donation.fully_invested,
+            Donation.create_date,
+            Donation.close_date,
+            Donation.user_id,
+        ],
+        session=session,
+        export_format=export_format,
+        filename="donations",
+    )
+
+
+@router.post("/import", response_model=DonationImportResult)
+async def import_donations_file(
+    request: Request,
+    import_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    user: User = Depends(current_superuser),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Массовый импорт пожертвований из тела запроса в NDJSON или CSV
+    (поля comment, full_amount, user_id). Пожертвования создаются
+    в порядке файла и распределяются одной транзакцией, как если бы
+    их создавали по одному. Только для суперюзеров.
+    """
+    try:
+        donations = parse_donations(
+            data=await request.body(), import_format=import_format
+        )
+        return await import_donations(
+            donations=donations, user_id=user.id, session=session
+        )
+    except DonationImportError as error:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=str(error)
+        )
 
 
 @router.post(
@@ -46,19 +121,83 @@ async def create_donation(
 ):
     """Сделать пожертвование."""
     check_donation_amount_is_positive(obj_in=obj_in)
-    donation = await donation_crud.create(
-        obj_in=obj_in, session=session, user_id=user.id
-    )
-    donation = await invest_donation_in_open_projects(
-        donation=donation, session=session
+    donation = await create_and_invest(
+        crud=donation_crud, obj_in=obj_in, session=session, user_id=user.id
     )
     return donation
 
 
 @router.get("/my", response_model=List[DonationtDB])
 async def get_user_donations(
+    response: Response,
+    params: ListParams = Depends(get_list_params),
     user: User = Depends(current_user),
     session: AsyncSession = Depends(get_async_session),
 ):
     """Получить список пожертвований пользователя, выполняющего запрос."""
-    return await donation_crud.get_by_user(user_id=user.id, session=session)
+    donations = await donation_crud.get_by_user(
+        user_id=user.id,
+        session=session,
+        params=params,
+        fields=DonationtDB.__fields__,
+    )
+    donations = paginate(db_objs=donations, params=params, response=response)
+    return rows_response(donations, response=response)
+
+
+@router.get("/my/summary", response_model=DonationSummary)
+async def get_user_donations_summary(
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Сводка пожертвований пользователя, выполняющего запрос: количество,
+    сумма, вложенные средства и число открытых пожертвований.
+    Читается из счётчиков пользователя, без обхода пожертвований.
+    """
+    donor_balance = await donor_balance_crud.get(
+        user_id=user.id, session=session
+    )
+    if donor_balance is None:
+        return DonationSummary()
+    return donor_balance
+
+
+@router.get("/{donation_id}/status", response_model=AllocationStatus)
+async def get_donation_status(
+    donation_id: int,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Статус распределения средств пожертвования.
+    Доступен автору пожертвования и суперюзерам.
+    """
+    donation = await donation_crud.get_or_404(
+        obj_id=donation_id, session=session
+    )
+    check_donation_belongs_to_user(donation=donation, user=user)
+    return donation
+
+
+@router.get("/{donation_id}/allocations", response_model=List[AllocationDB])
+async def get_donation_allocations(
+    donation_id: int,
+    response: Response,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Куда вложены средства пожертвования: проекты и суммы в порядке
+    распределения. Доступно автору пожертвования и суперюзерам.
+    """
+    donation = await donation_crud.get_or_404(
+        obj_id=donation_id, session=session
+    )
+    check_donation_belongs_to_user(donation=donation, user=user)
+    allocations = await allocation_crud.get_by_donation(
+        donation_id=donation_id,
+        fields=AllocationDB.__fields__,
+        session=session,
+    )
+    return rows_response(allocations, response=response)
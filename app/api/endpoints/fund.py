@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_session
+from app.core.user import current_superuser
+from app.schemas.fund_balance import FundSummary
+from app.services.fund_balance import get_fund_summary
+
+router = APIRouter()
+
+
+@router.get(
+    "/summary",
+    response_model=FundSummary,
+    dependencies=[Depends(current_superuser)],
+)
+async def get_summary(session: AsyncSession = Depends(get_async_session)):
+    """
+    Сводка фонда: количество и суммы пожертвований и проектов,
+    вложенные, свободные и недостающие средства.
+    Только для суперюзеров.
+    """
+    return await get_fund_summary(session=session)
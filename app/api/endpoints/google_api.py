@@ -1,41 +1,126 @@
+from functools import partial
+from http import HTTPStatus
+
 from aiogoogle import Aiogoogle
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from app.core.config import settings
 from app.core.db import get_async_session
 from app.core.google_client import get_service
 from app.core.user import current_superuser
-from app.crud import charity_project_crud
-from app.services.google_api import (
-    set_user_permissions,
-    spreadsheets_create,
-    spreadsheets_update_value,
+from app.schemas.report import ReportJob
+from app.services.google_api import REPORT_DEFAULT_SIZE, REPORT_MAX_SIZE
+from app.services.report import (
+    ReportSink,
+    create_report,
+    create_report_sink,
+    get_report_file_path,
 )
+from app.services.report_jobs import report_jobs
 
 router = APIRouter()
 
 
+async def get_report_sink(
+    wrapper_services: Aiogoogle = Depends(get_service),
+) -> ReportSink:
+    """Получатель отчёта по настройкам."""
+    return create_report_sink(wrapper_services=wrapper_services)
+
+
 @router.get(
     "/",
     response_model=str,
     dependencies=[Depends(current_superuser)],
 )
 async def get_report(
+    limit: int = Query(REPORT_DEFAULT_SIZE, ge=1, le=REPORT_MAX_SIZE),
     session: AsyncSession = Depends(get_async_session),
-    wrapper_services: Aiogoogle = Depends(get_service),
+    report_sink: ReportSink = Depends(get_report_sink),
 ):
     """
-    Получение отчёта в Google Sheets.
+    Получение отчёта в Google Sheets (или в локальном файле, если так
+    задано в настройках): limit самых быстро закрытых проектов.
+    Лист создаётся по размеру отчёта.
     Только для суперюзеров.
     """
-    closed_projects = (
-        await charity_project_crud.get_projects_by_completion_rate(
-            session=session
-        )
+    return await create_report(
+        session=session, report_sink=report_sink, limit=limit
     )
-    spreadsheet_id = await spreadsheets_create(wrapper_services)
-    await set_user_permissions(spreadsheet_id, wrapper_services)
-    report_spreadsheet_url = await spreadsheets_update_value(
-        spreadsheet_id, closed_projects, wrapper_services
+
+
+@router.post(
+    "/reports",
+    response_model=ReportJob,
+    response_model_exclude_none=True,
+    status_code=HTTPStatus.ACCEPTED,
+    dependencies=[Depends(current_superuser)],
+)
+async def start_report(
+    limit: int = Query(REPORT_DEFAULT_SIZE, ge=1, le=REPORT_MAX_SIZE),
+    session: AsyncSession = Depends(get_async_session),
+    report_sink: ReportSink = Depends(get_report_sink),
+):
+    """
+    Запускает формирование отчёта в фоне и возвращает задачу.
+    Одинаковые запросы в течение REPORT_DEDUP_WINDOW секунд
+    получают одну задачу.
+    Только для суперюзеров.
+    """
+    return report_jobs.start(
+        key=(settings.report_backend, settings.report_format, limit),
+        work=partial(
+            _create_report_in_background,
+            bind=session.bind,
+            report_sink=report_sink,
+            limit=limit,
+        ),
+        window=settings.report_dedup_window,
     )
-    return report_spreadsheet_url
+
+
+@router.get(
+    "/reports/{job_id}",
+    response_model=ReportJob,
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_superuser)],
+)
+async def get_report_job(job_id: str):
+    """
+    Статус задачи формирования отчёта и ссылка на готовый отчёт.
+    Только для суперюзеров.
+    """
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Отчёт с переданным id не найден.",
+        )
+    return job
+
+
+@router.get("/files/{file_name}", dependencies=[Depends(current_superuser)])
+async def get_report_file(file_name: str):
+    """
+    Скачивание отчёта, сформированного в локальный файл.
+    Только для суперюзеров.
+    """
+    path = get_report_file_path(file_name)
+    if not path:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Файл отчёта не найден.",
+        )
+    return FileResponse(path, filename=file_name)
+
+
+async def _create_report_in_background(
+    bind: AsyncEngine, report_sink: ReportSink, limit: int
+) -> str:
+    """Фоновая задача работает со своей сессией БД."""
+    async with AsyncSession(bind=bind) as session:
+        return await create_report(
+            session=session, report_sink=report_sink, limit=limit
+        )
@@ -0,0 +1,67 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from http import HTTPStatus
+from typing import List, Optional
+
+from fastapi import HTTPException, Query, Response
+
+from app.schemas.list_params import ListParams
+
+MAX_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(db_obj) -> str:
+    """Курсор на объект: ключ (create_date, id) в base64."""
+    key = json.dumps([db_obj.create_date.isoformat(), db_obj.id])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Ключ (create_date, id) из курсора, иначе вызов ошибки 422."""
+    try:
+        create_date, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(create_date), int(obj_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail="Некорректный курсор пагинации!",
+        )
+
+
+def get_list_params(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fully_invested: Optional[bool] = None,
+    create_date_from: Optional[datetime] = None,
+    create_date_to: Optional[datetime] = None,
+    full_amount_min: Optional[int] = Query(None, ge=1),
+    full_amount_max: Optional[int] = Query(None, ge=1),
+) -> ListParams:
+    """
+    Параметры запроса списка. Без limit возвращается весь список;
+    курсор следующей страницы передаётся в заголовке X-Next-Cursor.
+    """
+    return ListParams(
+        limit=limit,
+        after=decode_cursor(cursor) if cursor is not None else None,
+        fully_invested=fully_invested,
+        create_date_from=create_date_from,
+        create_date_to=create_date_to,
+        full_amount_min=full_amount_min,
+        full_amount_max=full_amount_max,
+    )
+
+
+def paginate(db_objs: List, params: ListParams, response: Response) -> List:
+    """
+    Обрезает выборку из limit + 1 объектов до страницы и, если есть
+    следующая страница, выставляет заголовок с её курсором.
+    """
+    if params.limit is None or len(db_objs) <= params.limit:
+        return db_objs
+    db_objs = db_objs[: params.limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(db_objs[-1])
+    return db_objs
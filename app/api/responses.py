@@ -0,0 +1,80 @@
+import hashlib
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Row
+
+from app.services.response_cache import CachedResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON-ответ, сериализуемый orjson. Для словарей из строк БД результат
+    совпадает с JSONResponse: компактный UTF-8, даты в формате ISO 8601.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def rows_to_dicts(
+    rows: Sequence[Row], exclude_none: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Словари для ответа из строк БД без валидации через Pydantic.
+    С exclude_none поля со значением None пропускаются,
+    как при response_model_exclude_none.
+    """
+    if not exclude_none:
+        return [row._asdict() for row in rows]
+    return [
+        {
+            key: value
+            for key, value in row._asdict().items()
+            if value is not None
+        }
+        for row in rows
+    ]
+
+
+def rows_response(
+    rows: Sequence[Row], response: Response, exclude_none: bool = False
+) -> ORJSONResponse:
+    """
+    Ответ со списком строк БД. Заголовки, выставленные в response
+    (например, курсор следующей страницы), переносятся в ответ.
+    """
+    return ORJSONResponse(
+        content=rows_to_dicts(rows, exclude_none=exclude_none),
+        headers=dict(response.headers),
+    )
+
+
+def render_json(
+    content: Any, headers: Optional[Dict[str, str]] = None
+) -> CachedResponse:
+    """
+    Сериализует ответ через orjson и добавляет ETag — хэш тела ответа.
+    """
+    body = ORJSONResponse(content).body
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return CachedResponse(body=body, headers=dict(headers or {}, ETag=etag))
+
+
+def etag_response(cached: CachedResponse, request: Request) -> Response:
+    """Ответ 304 без тела, если у клиента актуальная версия (If-None-Match)."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = {etag.strip() for etag in if_none_match.split(",")}
+        if "*" in etags or cached.headers["ETag"] in etags:
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED, headers=cached.headers
+            )
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers=cached.headers,
+    )
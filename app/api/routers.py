@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from app.api.endpoints import (
     charity_project_router,
     donation_router,
+    fund_router,
     google_api_router,
     user_router,
 )
@@ -18,6 +19,11 @@ main_router.include_router(
     prefix="/donation",
     tags=["Donations"],
 )
+main_router.include_router(
+    fund_router,
+    prefix="/fund",
+    tags=["Fund"],
+)
 main_router.include_router(
     google_api_router,
     prefix="/google",
@@ -4,7 +4,7 @@ from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import CharityProject
+from app.models import CharityProject, Donation, User
 from app.schemas.charity_project import CharityProjectUpdate
 from app.schemas.donation import DonationCreate
 
@@ -65,3 +65,12 @@ def check_donation_amount_is_positive(obj_in: DonationCreate):
             status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
             detail="Сумма пожертвования должна быть целой и положительной!",
         )
+
+
+def check_donation_belongs_to_user(donation: Donation, user: User):
+    """Вызывает исключение, если пожертвование сделано другим пользователем."""
+    if not user.is_superuser and donation.user_id != user.id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail="Нельзя просматривать чужие пожертвования!",
+        )
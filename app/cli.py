@@ -0,0 +1,141 @@
+"""
+Служебные команды приложения.
+
+    python -m app.cli reconcile [--fix]
+    python -m app.cli import-donations FILE --user-id ID [--format csv]
+
+Команды, меняющие распределение средств, не выполняются в режиме
+ALLOCATION_MODE=ledger: очереди в памяти приложения разошлись бы с БД.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, engine
+from app.schemas.export import ExportFormat
+from app.services.donation_import import (
+    DonationImportError,
+    import_donations,
+    parse_donations,
+)
+from app.services.fund_balance import reconcile_fund_balance
+from app.services.investment import LEDGER_ALLOCATION_MODE
+
+LEDGER_MODE_ERROR = (
+    "В режиме ALLOCATION_MODE=ledger очереди распределения хранятся "
+    "в памяти приложения, и изменения из другого процесса разойдутся "
+    "с ними. Остановите приложение и выполните команду "
+    "с ALLOCATION_MODE=immediate."
+)
+
+
+def refuse_in_ledger_mode() -> bool:
+    """Сообщает об ошибке и возвращает True в режиме ledger."""
+    if settings.allocation_mode != LEDGER_ALLOCATION_MODE:
+        return False
+    print(LEDGER_MODE_ERROR, file=sys.stderr)
+    return True
+
+
+async def reconcile(fix: bool) -> int:
+    """
+    Сверяет сводку фонда с таблицами. Возвращает код выхода:
+    1, если найдены расхождения и они не исправлены или исправлять
+    нельзя из-за режима ledger.
+    """
+    if fix and refuse_in_ledger_mode():
+        return 1
+    async with AsyncSessionLocal() as session:
+        drift = await reconcile_fund_balance(session=session, fix=fix)
+    await engine.dispose()
+    if not drift:
+        print("Сводка фонда совпадает с таблицами.")
+        return 0
+    for field, (stored, calculated) in drift.items():
+        print(f"{field}: в сводке {stored}, по таблицам {calculated}")
+    if fix:
+        print("Сводка фонда пересчитана.")
+        return 0
+    return 1
+
+
+async def import_donations_file(
+    path: Path, import_format: ExportFormat, user_id: int
+) -> int:
+    """
+    Импортирует пожертвования из файла. Возвращает код выхода:
+    1, если файл не прошёл проверку или включён режим ledger
+    и ничего не создано.
+    """
+    if refuse_in_ledger_mode():
+        return 1
+    try:
+        donations = parse_donations(
+            data=path.read_bytes(), import_format=import_format
+        )
+        async with AsyncSessionLocal() as session:
+            result = await import_donations(
+                donations=donations, user_id=user_id, session=session
+            )
+    except DonationImportError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        await engine.dispose()
+    print(
+        f"Импортировано пожертвований: {result.imported_count} "
+        f"на сумму {result.imported_amount}, "
+        f"распределено {result.invested_amount}."
+    )
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    reconcile_parser = commands.add_parser(
+        "reconcile", help="сверить сводку фонда с таблицами"
+    )
+    reconcile_parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="перезаписать сводку пересчитанными значениями",
+    )
+    import_parser = commands.add_parser(
+        "import-donations", help="массовый импорт пожертвований"
+    )
+    import_parser.add_argument("path", type=Path, help="файл NDJSON или CSV")
+    import_parser.add_argument(
+        "--user-id",
+        type=int,
+        required=True,
+        help="пользователь для пожертвований без user_id",
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=[import_format.value for import_format in ExportFormat],
+        help="формат файла, по умолчанию — по расширению",
+    )
+    args = parser.parse_args()
+    if args.command == "reconcile":
+        sys.exit(asyncio.run(reconcile(fix=args.fix)))
+    if args.command == "import-donations":
+        import_format = ExportFormat(
+            args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+        )
+        sys.exit(
+            asyncio.run(
+                import_donations_file(
+                    path=args.path,
+                    import_format=import_format,
+                    user_id=args.user_id,
+                )
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,10 @@
 """Импорты класса Base и всех моделей для Alembic."""
 from app.core.db import Base  # noqa
-from app.models import CharityProject, Donation, User  # noqa
+from app.models import (  # noqa
+    Allocation,
+    CharityProject,
+    Donation,
+    DonorBalance,
+    FundBalance,
+    User,
+)
@@ -0,0 +1,98 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+MEMORY_CACHE_URL = "memory://"
+
+
+class CacheBackend(ABC):
+    """Хранилище кэша: байтовые значения с TTL и счётчики версий."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Значение по ключу или None, если его нет или истёк TTL."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Сохраняет значение на ttl секунд."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Увеличивает счётчик на единицу и возвращает новое значение."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    Кэш в памяти процесса. При переполнении вытесняются давно
+    не использованные значения (LRU). Счётчики хранятся отдельно
+    и не вытесняются.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._values: OrderedDict = OrderedDict()
+        self._counters = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        item = self._values.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCache(CacheBackend):
+    """
+    Кэш в Redis, общий для всех процессов приложения. Подойдёт любой
+    клиент с асинхронными get, set(ex=...) и incr, например
+    redis.asyncio.Redis или его локальная замена.
+    """
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+
+def create_cache_backend(cache_url: Optional[str]) -> CacheBackend:
+    """Хранилище кэша по адресу: memory:// (по умолчанию) или redis://."""
+    if cache_url is None or cache_url == MEMORY_CACHE_URL:
+        return MemoryCache(max_size=settings.cache_max_size)
+    if cache_url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError(
+                "Для кэша в Redis установите пакет redis>=4.2."
+            )
+        return RedisCache(client=aioredis.from_url(cache_url))
+    raise ValueError(f"Неизвестное хранилище кэша: {cache_url}")
+
+
+cache_backend = create_cache_backend(settings.cache_url)
@@ -1,6 +1,7 @@
 from typing import Optional
 
 from pydantic import BaseSettings
+from typing_extensions import Literal
 
 
 class Settings(BaseSettings):
@@ -24,6 +25,60 @@ class Settings(BaseSettings):
     auth_provider_x509_cert_url: Optional[str] = None
     client_x509_cert_url: Optional[str] = None
     email: Optional[str] = None
+    # Реализация распределения средств: "python" (построчно) или "sql"
+    investment_engine: Literal["python", "sql"] = "python"
+    # Режим распределения: "immediate" (в запросе), "deferred"
+    # (фоновой задачей раз в allocation_interval_ms миллисекунд
+    # или после allocation_batch_size новых объектов) или "ledger"
+    # (в запросе по очередям в памяти процесса с записью в БД с теми же
+    # интервалом и размером пачки; только для одного процесса)
+    allocation_mode: Literal["immediate", "deferred", "ledger"] = "immediate"
+    allocation_interval_ms: int = 200
+    allocation_batch_size: int = 500
+    # Как часто (секунды) сверять очереди режима ledger с БД, 0 — никогда
+    allocation_ledger_check_interval: int = 300
+    # Пул соединений: размер, сверх размера, пересоздание соединений
+    # (секунды), ожидание свободного соединения (секунды), проверка
+    # соединения перед выдачей из пула
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_recycle: int = 3600
+    pool_timeout: int = 30
+    pool_pre_ping: bool = True
+    # PRAGMA, применяемые к каждому соединению SQLite
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -65536
+    sqlite_mmap_size: int = 268435456
+    # Хранилище кэша: memory:// (в памяти процесса) или redis://...
+    cache_url: Optional[str] = None
+    cache_max_size: int = 1024
+    # Время жизни кэша списка проектов в секундах, 0 — кэш выключен
+    project_list_cache_ttl: int = 0
+    # Кэш пользователей по JWT: время жизни в секундах (0 — выключен)
+    # и число записей
+    user_cache_ttl: int = 30
+    user_cache_max_size: int = 10000
+    # Адрес документов Discovery API Google и каталог, в котором они
+    # сохраняются между перезапусками (None — только в памяти)
+    google_discovery_url: str = (
+        "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest"
+    )
+    google_discovery_cache_dir: Optional[str] = None
+    # Окно в секундах, в течение которого одинаковые запросы
+    # на формирование отчёта получают одну и ту же задачу
+    report_dedup_window: int = 60
+    # Куда формируется отчёт: "google" (Google Sheets) или "local"
+    # (файл report_format — csv, xlsx или parquet — в каталоге report_dir)
+    report_backend: Literal["google", "local"] = "google"
+    report_format: Literal["csv", "xlsx", "parquet"] = "csv"
+    report_dir: str = "reports"
+    # Запросы к API Google: тайм-аут в секундах, число повторов
+    # на ответы 429 и 5xx и начальная задержка повтора в секундах
+    google_request_timeout: float = 30
+    google_retry_count: int = 3
+    google_retry_backoff: float = 0.5
 
     class Config:
         env_file = ".env"
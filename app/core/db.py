@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import Column, Integer, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    AsyncSession,
+)
 from sqlalchemy.orm import declarative_base, declared_attr, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
@@ -15,9 +21,63 @@ class PreBase:
 
 Base = declarative_base(cls=PreBase)
 
-engine = create_async_engine(settings.database_url)
 
-AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
+def get_engine_options(database_url: str) -> dict:
+    """
+    Параметры пула соединений из настроек. Для файловой SQLite вместо
+    NullPool (новое соединение на каждую сессию) используется пул;
+    SQLite в памяти остаётся на StaticPool с единственным соединением.
+    """
+    url = make_url(database_url)
+    options = {"pool_pre_ping": settings.pool_pre_ping}
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return options
+        options["poolclass"] = AsyncAdaptedQueuePool
+    options.update(
+        pool_size=settings.pool_size,
+        max_overflow=settings.pool_max_overflow,
+        pool_recycle=settings.pool_recycle,
+        pool_timeout=settings.pool_timeout,
+    )
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Настраивает новое соединение SQLite: WAL позволяет читать,
+    не дожидаясь фиксации записи, busy_timeout — ждать блокировку
+    вместо ошибки "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma, value in (
+        ("journal_mode", settings.sqlite_journal_mode),
+        ("synchronous", settings.sqlite_synchronous),
+        ("busy_timeout", settings.sqlite_busy_timeout_ms),
+        ("cache_size", settings.sqlite_cache_size),
+        ("mmap_size", settings.sqlite_mmap_size),
+    ):
+        cursor.execute(f"PRAGMA {pragma} = {value}")
+    cursor.close()
+
+
+def make_engine(database_url: str) -> AsyncEngine:
+    """Создаёт движок с настройками пула и PRAGMA для SQLite."""
+    engine = create_async_engine(
+        database_url, **get_engine_options(database_url)
+    )
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+engine = make_engine(settings.database_url)
+
+# Объекты не истекают после commit: ответ собирается из уже известных
+# атрибутов без повторного SELECT.
+AsyncSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
 
 
 async def get_async_session():
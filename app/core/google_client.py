@@ -1,5 +1,12 @@
+import json
+import os
+from typing import Dict, Optional, Tuple
+
 from aiogoogle import Aiogoogle
 from aiogoogle.auth.creds import ServiceAccountCreds
+from aiogoogle.models import Request
+from aiogoogle.resource import GoogleAPI
+from fastapi import Request as HTTPRequest
 
 from app.core.config import settings
 
@@ -7,23 +14,117 @@ SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive",
 ]
-INFO = {
-    "type": settings.type,
-    "project_id": settings.project_id,
-    "private_key_id": settings.private_key_id,
-    "private_key": settings.private_key,
-    "client_email": settings.client_email,
-    "client_id": settings.client_id,
-    "auth_uri": settings.auth_uri,
-    "token_uri": settings.token_uri,
-    "auth_provider_x509_cert_url": settings.auth_provider_x509_cert_url,
-    "client_x509_cert_url": settings.client_x509_cert_url,
-}
-
-credentionals = ServiceAccountCreds(scopes=SCOPES, **INFO)
-
-
-async def get_service():
-    """Авторизация сервис-аккаунта."""
-    async with Aiogoogle(service_account_creds=credentionals) as aiogoogle:
-        yield aiogoogle
+
+
+def get_credentials() -> ServiceAccountCreds:
+    """Учётные данные сервис-аккаунта из настроек."""
+    return ServiceAccountCreds(
+        scopes=SCOPES,
+        type=settings.type,
+        project_id=settings.project_id,
+        private_key_id=settings.private_key_id,
+        private_key=settings.private_key,
+        client_email=settings.client_email,
+        client_id=settings.client_id,
+        auth_uri=settings.auth_uri,
+        token_uri=settings.token_uri,
+        auth_provider_x509_cert_url=settings.auth_provider_x509_cert_url,
+        client_x509_cert_url=settings.client_x509_cert_url,
+    )
+
+
+class GoogleClient(Aiogoogle):
+    """
+    Долгоживущий клиент API Google, создаётся при запуске приложения.
+    Запросы идут через одну HTTP-сессию, токен сервис-аккаунта
+    переиспользуется до истечения срока, а документы Discovery API
+    запрашиваются один раз: они хранятся в памяти и, если задан
+    cache_dir, на диске.
+    """
+
+    def __init__(
+        self,
+        service_account_creds: ServiceAccountCreds,
+        discovery_url: str,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__(service_account_creds=service_account_creds)
+        self.discovery_url = discovery_url
+        self.cache_dir = cache_dir
+        self._apis: Dict[Tuple[str, str], GoogleAPI] = {}
+        self._http = None
+
+    async def start(self) -> None:
+        """Открывает общую HTTP-сессию."""
+        self._http = self.session_factory()
+
+    async def stop(self) -> None:
+        """Закрывает общую HTTP-сессию."""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def send(self, *args, **kwargs):
+        if self._http is None:
+            return await super().send(*args, **kwargs)
+        return await self._http.send(*args, **kwargs)
+
+    async def discover(
+        self, api_name: str, api_version: str, validate: bool = False
+    ) -> GoogleAPI:
+        """Описание API по документу Discovery API из кэша."""
+        key = (api_name, api_version)
+        if key not in self._apis:
+            discovery_document = self._read_cached_document(*key)
+            if discovery_document is None:
+                discovery_document = await self.as_anon(
+                    Request(
+                        method="GET",
+                        url=self.discovery_url.format(
+                            api=api_name, version=api_version
+                        ),
+                    )
+                )
+                self._write_cached_document(*key, discovery_document)
+            self._apis[key] = GoogleAPI(discovery_document, validate)
+        return self._apis[key]
+
+    def _get_cache_path(self, api_name: str, api_version: str) -> str:
+        return os.path.join(self.cache_dir, f"{api_name}.{api_version}.json")
+
+    def _read_cached_document(
+        self, api_name: str, api_version: str
+    ) -> Optional[dict]:
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._get_cache_path(api_name, api_version)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cached_document(
+        self, api_name: str, api_version: str, discovery_document: dict
+    ) -> None:
+        """Атомарная запись документа: через временный файл."""
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._get_cache_path(api_name, api_version)
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(discovery_document, file)
+        os.replace(f"{path}.tmp", path)
+
+
+def create_google_client() -> GoogleClient:
+    """Клиент API Google по настройкам."""
+    return GoogleClient(
+        service_account_creds=get_credentials(),
+        discovery_url=settings.google_discovery_url,
+        cache_dir=settings.google_discovery_cache_dir,
+    )
+
+
+async def get_service(request: HTTPRequest) -> GoogleClient:
+    """Клиент API Google, созданный при запуске приложения."""
+    return request.app.state.google_client
@@ -0,0 +1,46 @@
+from sqlalchemy import Integer, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class seconds_between(FunctionElement):
+    """
+    Количество секунд между двумя датами: seconds_between(start, end).
+    SQL зависит от СУБД, см. функции компиляции ниже.
+    """
+
+    type = Integer()
+    name = "seconds_between"
+    inherit_cache = True
+
+
+@compiles(seconds_between)
+def compile_seconds_between(element, compiler, **kw):
+    """СУБД со стандартным EXTRACT."""
+    start, end = element.clauses
+    return "CAST(EXTRACT(EPOCH FROM %s - %s) AS INTEGER)" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw),
+    )
+
+
+@compiles(seconds_between, "postgresql")
+def compile_seconds_between_postgresql(element, compiler, **kw):
+    """
+    Даты усекаются до секунд, как strftime("%s") в SQLite: иначе
+    CAST округляет дробную разность и результаты СУБД расходятся.
+    """
+    start, end = element.clauses
+    return (
+        "CAST(EXTRACT(EPOCH FROM date_trunc('second', %s) "
+        "- date_trunc('second', %s)) AS INTEGER)"
+    ) % (compiler.process(end, **kw), compiler.process(start, **kw))
+
+
+@compiles(seconds_between, "sqlite")
+def compile_seconds_between_sqlite(element, compiler, **kw):
+    """В SQLite нет интервалов: разность Unix-времени из strftime."""
+    start, end = element.clauses
+    return compiler.process(
+        func.strftime("%s", end) - func.strftime("%s", start), **kw
+    )
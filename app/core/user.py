@@ -1,22 +1,26 @@
-from typing import Union
+from typing import Any, Dict, Optional, Union
 
-from fastapi import Depends
+import jwt
+from fastapi import Depends, Request
 from fastapi_users import (
     BaseUserManager,
     FastAPIUsers,
     IntegerIDMixin,
     InvalidPasswordException,
+    exceptions,
 )
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db import get_async_session
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -29,8 +33,42 @@ async def get_user_db(session: AsyncSession = Depends(get_async_session)):
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
+class CachingJWTStrategy(JWTStrategy):
+    """
+    JWT-стратегия с кэшем пользователей. Подпись и срок действия токена
+    проверяются при каждом запросе, а пользователь загружается из БД
+    только при промахе кэша.
+    """
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager
+    ) -> Optional[User]:
+        if token is None:
+            return None
+        try:
+            data = decode_jwt(
+                token,
+                self.decode_key,
+                self.token_audience,
+                algorithms=[self.algorithm],
+            )
+            user_id = user_manager.parse_id(data["user_id"])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+        user = user_cache.get(user_id=user_id, token=token)
+        if user is not None:
+            return user
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        if user.is_active:
+            user_cache.set(user_id=user_id, token=token, user=user)
+        return user
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=settings.secret, lifetime_seconds=3600)
+    return CachingJWTStrategy(secret=settings.secret, lifetime_seconds=3600)
 
 
 auth_backend = AuthenticationBackend(
@@ -55,6 +93,24 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
                 reason="Пароль не должен содержать e-mail"
             )
 
+    async def on_after_update(
+        self,
+        user: User,
+        update_dict: Dict[str, Any],
+        request: Optional[Request] = None,
+    ) -> None:
+        user_cache.invalidate(user_id=user.id)
+
+    async def on_after_reset_password(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        user_cache.invalidate(user_id=user.id)
+
+    async def on_after_verify(
+        self, user: User, request: Optional[Request] = None
+    ) -> None:
+        user_cache.invalidate(user_id=user.id)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     """Возвращает объект класса UserManager."""
@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class UserCache:
+    """
+    LRU-кэш активных пользователей с коротким TTL по ключу
+    (id пользователя, токен). Хранятся значения столбцов: на каждый
+    запрос создаётся новый объект User, не привязанный к сессии,
+    поэтому параллельные запросы не делят один объект ORM.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict = OrderedDict()
+        self._versions: Dict[int, int] = {}
+
+    def get(self, user_id: int, token: str) -> Optional[User]:
+        """Пользователь из кэша или None."""
+        entry = self._entries.get((user_id, token))
+        if entry is None:
+            return None
+        expires_at, version, values = entry
+        if (
+            expires_at <= time.monotonic() or
+            version != self._versions.get(user_id, 0)
+        ):
+            del self._entries[(user_id, token)]
+            return None
+        self._entries.move_to_end((user_id, token))
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user_id: int, token: str, user: User) -> None:
+        if not settings.user_cache_ttl:
+            return
+        self._entries[(user_id, token)] = (
+            time.monotonic() + settings.user_cache_ttl,
+            self._versions.get(user_id, 0),
+            {
+                column.key: getattr(user, column.key)
+                for column in User.__table__.columns
+            },
+        )
+        self._entries.move_to_end((user_id, token))
+        while len(self._entries) > settings.user_cache_max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбрасывает все записи пользователя, по любым токенам."""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+user_cache = UserCache()
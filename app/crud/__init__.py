@@ -1,2 +1,5 @@
+from .allocation import allocation_crud  # noqa
 from .charity_project import charity_project_crud  # noqa
 from .donation import donation_crud  # noqa
+from .donor_balance import donor_balance_crud  # noqa
+from .fund_balance import fund_balance_crud  # noqa
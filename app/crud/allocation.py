@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, List
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import BaseCRUD
+from app.crud.donor_balance import donor_balance_crud
+from app.models import Allocation
+
+
+class AllocationCRUD(BaseCRUD):
+    """
+    Дополнение базовой реализации CRUD для журнала распределения.
+    Записи создаются только через record в транзакции распределения
+    и не меняются.
+    """
+
+    async def record(
+        self, allocations: List[Dict[str, int]], session: AsyncSession
+    ) -> None:
+        """
+        Добавляет ненулевые суммы в журнал и учитывает их в счётчиках
+        авторов пожертвований. Транзакцию не фиксирует.
+        """
+        allocations = [
+            allocation for allocation in allocations if allocation["amount"]
+        ]
+        await self.create_many(objs_in_data=allocations, session=session)
+        donor_balance_crud.add_allocations(session, allocations=allocations)
+
+    async def get_by_donation(
+        self, donation_id: int, fields: Iterable[str], session: AsyncSession
+    ) -> List[Row]:
+        """Куда вложены средства пожертвования, в порядке распределения."""
+        allocations = await session.execute(
+            self.select_list(fields=fields).where(
+                Allocation.donation_id == donation_id
+            )
+        )
+        return allocations.all()
+
+    async def get_by_project(
+        self, project_id: int, fields: Iterable[str], session: AsyncSession
+    ) -> List[Row]:
+        """Какие пожертвования вложены в проект, в порядке распределения."""
+        allocations = await session.execute(
+            self.select_list(fields=fields).where(
+                Allocation.project_id == project_id
+            )
+        )
+        return allocations.all()
+
+
+allocation_crud = AllocationCRUD(model=Allocation)
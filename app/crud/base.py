@@ -1,38 +1,148 @@
 from http import HTTPStatus
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import and_, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import Select
+
+from app.crud.fund_balance import fund_balance_crud
+from app.schemas.list_params import ListParams
+
+CREATE_MANY_BATCH_SIZE = 1000
 
 
 class BaseCRUD:
     """Абстрактная реализация CRUD."""
 
     NOT_FOUND_MSG = "Объект с переданным id не найден."
+    # Префикс счётчиков сводки фонда (donations, projects) или None.
+    BALANCE_PREFIX: Optional[str] = None
 
     def __init__(self, model) -> None:
         self.model = model
 
-    async def get_all(self, session: AsyncSession):
-        """Получить все объекты из БД."""
-        all_db_objs = await session.execute(select(self.model))
+    def add_to_balance(
+        self, session: AsyncSession, count: int, amount: int
+    ) -> None:
+        """Учитывает изменение количества и суммы объектов в сводке фонда."""
+        if self.BALANCE_PREFIX is None:
+            return
+        fund_balance_crud.add(
+            session,
+            **{
+                f"{self.BALANCE_PREFIX}_count": count,
+                f"{self.BALANCE_PREFIX}_amount": amount,
+            },
+        )
+
+    async def get_all(
+        self,
+        session: AsyncSession,
+        params: Optional[ListParams] = None,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """
+        Получить объекты из БД в порядке создания. С params — отфильтровать
+        и вернуть страницу из limit + 1 объектов (лишний объект означает,
+        что есть следующая страница). С fields — вернуть строки только
+        с этими столбцами, без загрузки объектов ORM.
+        """
+        all_db_objs = await session.execute(
+            self.select_list(params=params, fields=fields)
+        )
+        if fields is not None:
+            return all_db_objs.all()
         return all_db_objs.scalars().all()
 
+    def select_list(
+        self,
+        params: Optional[ListParams] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Select:
+        """
+        Запрос списка объектов с фильтрами и курсорной пагинацией
+        по (create_date, id): страница начинается сразу после ключа
+        params.after. С fields выбираются только столбцы с этими именами.
+        """
+        model = self.model
+        if fields is None:
+            stmt = select(model)
+        else:
+            stmt = select(*(getattr(model, field) for field in fields))
+        stmt = stmt.order_by(model.create_date, model.id)
+        if params is None:
+            return stmt
+        if params.after is not None:
+            create_date, obj_id = params.after
+            stmt = stmt.where(
+                or_(
+                    model.create_date > create_date,
+                    and_(model.create_date == create_date, model.id > obj_id),
+                )
+            )
+        if params.fully_invested is not None:
+            stmt = stmt.where(model.fully_invested.is_(params.fully_invested))
+        if params.create_date_from is not None:
+            stmt = stmt.where(model.create_date >= params.create_date_from)
+        if params.create_date_to is not None:
+            stmt = stmt.where(model.create_date <= params.create_date_to)
+        if params.full_amount_min is not None:
+            stmt = stmt.where(model.full_amount >= params.full_amount_min)
+        if params.full_amount_max is not None:
+            stmt = stmt.where(model.full_amount <= params.full_amount_max)
+        if params.limit is not None:
+            stmt = stmt.limit(params.limit + 1)
+        return stmt
+
     async def create(
-        self, obj_in, session: AsyncSession, user_id: Optional[int] = None
+        self,
+        obj_in,
+        session: AsyncSession,
+        user_id: Optional[int] = None,
+        commit: bool = True,
     ):
-        """Создание объекта и сохранение в БД. Возвращает объект."""
+        """
+        Создание объекта и сохранение в БД. Возвращает объект.
+        При commit=False объект только отправляется в БД (flush),
+        транзакцию фиксирует вызывающий код.
+        """
         obj_in_data = obj_in.dict()
         if user_id is not None:
             obj_in_data["user_id"] = user_id
         db_obj = self.model(**obj_in_data)
         session.add(db_obj)
+        self.add_to_balance(session, count=1, amount=db_obj.full_amount)
+        if not commit:
+            await session.flush()
+            return db_obj
         await session.commit()
         await session.refresh(db_obj)
         return db_obj
 
+    async def create_many(
+        self, objs_in_data: List[Dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """
+        Сохраняет объекты в БД без загрузки объектов ORM: один
+        executemany-запрос на каждые CREATE_MANY_BATCH_SIZE объектов.
+        Порядок id совпадает с порядком objs_in_data.
+        Транзакцию фиксирует вызывающий код.
+        """
+        for start in range(0, len(objs_in_data), CREATE_MANY_BATCH_SIZE):
+            await session.execute(
+                insert(self.model),
+                objs_in_data[start:start + CREATE_MANY_BATCH_SIZE],
+            )
+        if self.BALANCE_PREFIX is None:
+            return
+        self.add_to_balance(
+            session,
+            count=len(objs_in_data),
+            amount=sum(obj_in["full_amount"] for obj_in in objs_in_data),
+        )
+
     async def get_or_404(self, obj_id: int, session: AsyncSession):
         """Получение объекта из БД, иначе вызов ошибки 404."""
         db_obj = await session.execute(
@@ -49,16 +159,21 @@ class BaseCRUD:
     async def delete(self, db_obj, session: AsyncSession):
         """Удалить объект из БД. Ничего не возвращает."""
         await session.delete(db_obj)
+        self.add_to_balance(session, count=-1, amount=-db_obj.full_amount)
         await session.commit()
 
     async def update(self, db_obj, obj_in, session: AsyncSession):
         """Обновляет объект в БД. Возвращает обновлённый объект."""
         project_data = jsonable_encoder(db_obj)
         obj_in_data = obj_in.dict(exclude_unset=True)
+        full_amount = db_obj.full_amount
         for field in project_data:
             if field in obj_in_data:
                 setattr(db_obj, field, obj_in_data[field])
         session.add(db_obj)
+        self.add_to_balance(
+            session, count=0, amount=db_obj.full_amount - full_amount
+        )
         await session.commit()
         await session.refresh(db_obj)
         return db_obj
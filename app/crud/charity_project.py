@@ -1,4 +1,7 @@
-from sqlalchemy import func, select
+from typing import AsyncIterator, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import BaseCRUD
@@ -8,22 +11,67 @@ from app.models import CharityProject
 class CharityProjectCRUD(BaseCRUD):
     """Дополнение базовой реализации CRUD для модели проектов."""
 
-    async def get_projects_by_completion_rate(self, session: AsyncSession):
-        """Возвращает список закрытых проектов отсортированных по скорости сбора средств."""
-        stmt = (
-            select(
-                CharityProject,
-                (
-                    func.strftime("%s", CharityProject.close_date).__sub__(
-                        func.strftime("%s", CharityProject.create_date)
-                    )
-                ).label("completion_rate"),
+    BALANCE_PREFIX = "projects"
+
+    async def get_existing_names(
+        self, names: Iterable[str], session: AsyncSession
+    ) -> Set[str]:
+        """Имена из names, уже занятые проектами, — одним IN-запросом."""
+        existing_names = await session.execute(
+            select(CharityProject.name).where(
+                CharityProject.name.in_(set(names))
             )
-            .where(CharityProject.fully_invested.is_(True))
-            .order_by("completion_rate")
+        )
+        return set(existing_names.scalars())
+
+    async def get_by_names(
+        self, names: Iterable[str], session: AsyncSession
+    ) -> List[CharityProject]:
+        """Проекты с именами из names."""
+        projects = await session.execute(
+            select(CharityProject).where(CharityProject.name.in_(set(names)))
+        )
+        return projects.scalars().all()
+
+    async def get_projects_by_completion_rate(
+        self, session: AsyncSession, limit: Optional[int] = None
+    ):
+        """
+        Возвращает список закрытых проектов отсортированных по скорости
+        сбора средств: пары (проект, время сбора в секундах).
+        Время сбора хранится в индексированном столбце, поэтому
+        первые limit проектов читаются по индексу.
+        """
+        stmt = (
+            select(CharityProject, CharityProject.completion_rate)
+            .where(CharityProject.completion_rate.is_not(None))
+            .order_by(CharityProject.completion_rate, CharityProject.id)
+            .limit(limit)
         )
         closed_projects = await session.execute(stmt)
         return closed_projects
 
+    async def stream_projects_by_completion_rate(
+        self, session: AsyncSession, limit: int, batch_size: int
+    ) -> AsyncIterator[List[Row]]:
+        """
+        Те же проекты, что в get_projects_by_completion_rate, порциями
+        по batch_size строк (name, description, completion_rate):
+        в памяти одновременно только одна порция.
+        """
+        closed_projects = await session.stream(
+            select(
+                CharityProject.name,
+                CharityProject.description,
+                CharityProject.completion_rate,
+            )
+            .where(CharityProject.completion_rate.is_not(None))
+            .order_by(CharityProject.completion_rate, CharityProject.id)
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in closed_projects.partitions():
+            yield batch
+
 
 charity_project_crud = CharityProjectCRUD(model=CharityProject)
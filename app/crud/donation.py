@@ -1,18 +1,73 @@
-from sqlalchemy import select
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import BaseCRUD
+from app.crud.donor_balance import donor_balance_crud
 from app.models import Donation
+from app.schemas.list_params import ListParams
 
 
 class DonationCRUD(BaseCRUD):
     """Расширение CRUD для модели пожертвований."""
 
-    async def get_by_user(self, user_id: int, session: AsyncSession):
-        """Получение объектов из БД, созданных пользователем."""
+    BALANCE_PREFIX = "donations"
+
+    async def create(
+        self,
+        obj_in,
+        session: AsyncSession,
+        user_id: Optional[int] = None,
+        commit: bool = True,
+    ):
+        """Создание пожертвования с учётом в счётчиках пользователя."""
+        donor_balance_crud.add(
+            session,
+            user_id=user_id,
+            donations_count=1,
+            donations_amount=obj_in.full_amount,
+            open_donations_count=1,
+        )
+        return await super().create(
+            obj_in=obj_in, session=session, user_id=user_id, commit=commit
+        )
+
+    async def create_many(
+        self, objs_in_data: List[Dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """Массовое создание с учётом в счётчиках пользователей."""
+        await super().create_many(objs_in_data=objs_in_data, session=session)
+        amounts = defaultdict(list)
+        for obj_in in objs_in_data:
+            amounts[obj_in.get("user_id")].append(obj_in["full_amount"])
+        for user_id, user_amounts in amounts.items():
+            donor_balance_crud.add(
+                session,
+                user_id=user_id,
+                donations_count=len(user_amounts),
+                donations_amount=sum(user_amounts),
+                open_donations_count=len(user_amounts),
+            )
+
+    async def get_by_user(
+        self,
+        user_id: int,
+        session: AsyncSession,
+        params: Optional[ListParams] = None,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        """
+        Получение объектов из БД, созданных пользователем.
+        С fields — строки только с этими столбцами.
+        """
         db_objs = await session.execute(
-            select(self.model).where(self.model.user_id == user_id)
+            self.select_list(params=params, fields=fields).where(
+                self.model.user_id == user_id
+            )
         )
+        if fields is not None:
+            return db_objs.all()
         return db_objs.scalars().all()
 
 
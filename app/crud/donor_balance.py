@@ -0,0 +1,148 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models import Donation, DonorBalance
+
+DONOR_BALANCE_DELTAS_KEY = "donor_balance_deltas"
+DONOR_ALLOCATIONS_KEY = "donor_allocations"
+DONOR_BALANCE_FIELDS = (
+    "donations_count",
+    "donations_amount",
+    "invested_amount",
+    "open_donations_count",
+)
+DONATION_IDS_CHUNK_SIZE = 500
+
+
+class DonorBalanceCRUD:
+    """CRUD для счётчиков пожертвований пользователей."""
+
+    async def get(
+        self, user_id: int, session: AsyncSession
+    ) -> Optional[DonorBalance]:
+        """Счётчики пользователя: чтение одной строки по индексу."""
+        donor_balance = await session.execute(
+            select(DonorBalance).where(DonorBalance.user_id == user_id)
+        )
+        return donor_balance.scalars().first()
+
+    def add(
+        self, session: AsyncSession, user_id: Optional[int], **deltas: int
+    ) -> None:
+        """
+        Копит изменения счётчиков пользователя в сессии, как сводка
+        фонда. Они записываются одним upsert-запросом перед фиксацией
+        транзакции. Пожертвования без пользователя не учитываются.
+        """
+        if user_id is None:
+            return
+        pending = session.sync_session.info.setdefault(
+            DONOR_BALANCE_DELTAS_KEY, {}
+        )
+        user_deltas = pending.setdefault(user_id, {})
+        for field, delta in deltas.items():
+            user_deltas[field] = user_deltas.get(field, 0) + delta
+
+    def add_allocations(
+        self, session: AsyncSession, allocations: Iterable[Dict[str, int]]
+    ) -> None:
+        """
+        Копит в сессии суммы, вложенные из пожертвований. Авторы
+        пожертвований и закрытие пожертвований определяются перед
+        фиксацией транзакции, когда пожертвования уже обновлены.
+        """
+        amounts = session.sync_session.info.setdefault(
+            DONOR_ALLOCATIONS_KEY, defaultdict(int)
+        )
+        for allocation in allocations:
+            amounts[allocation["donation_id"]] += allocation["amount"]
+
+
+def _add_donor_allocations(session: Session) -> None:
+    """
+    Переводит накопленные суммы в изменения счётчиков авторов
+    пожертвований: пожертвование, вложенное полностью, закрылось
+    в этой транзакции. Изменения объектов сессии записываются в БД
+    до чтения пожертвований.
+    """
+    amounts = session.info.pop(DONOR_ALLOCATIONS_KEY, {})
+    if not amounts:
+        return
+    session.flush()
+    pending = session.info.setdefault(DONOR_BALANCE_DELTAS_KEY, {})
+    donation_ids = list(amounts)
+    for start in range(0, len(donation_ids), DONATION_IDS_CHUNK_SIZE):
+        donations = session.execute(
+            select(
+                Donation.id,
+                Donation.user_id,
+                Donation.full_amount,
+                Donation.invested_amount,
+            ).where(
+                Donation.id.in_(
+                    donation_ids[start:start + DONATION_IDS_CHUNK_SIZE]
+                )
+            )
+        )
+        for donation in donations:
+            if donation.user_id is None:
+                continue
+            deltas = pending.setdefault(donation.user_id, {})
+            deltas["invested_amount"] = (
+                deltas.get("invested_amount", 0) + amounts[donation.id]
+            )
+            if donation.invested_amount == donation.full_amount:
+                deltas["open_donations_count"] = (
+                    deltas.get("open_donations_count", 0) - 1
+                )
+
+
+@event.listens_for(Session, "before_commit", insert=True)
+def write_donor_balance_deltas(session: Session) -> None:
+    """
+    Записывает накопленные в сессии изменения счётчиков пользователей:
+    один executemany-запрос INSERT ... ON CONFLICT DO UPDATE, строки
+    в порядке user_id. Выполняется раньше записи сводки фонда.
+    """
+    _add_donor_allocations(session)
+    pending = session.info.pop(DONOR_BALANCE_DELTAS_KEY, {})
+    rows = [
+        dict(
+            {field: deltas.get(field, 0) for field in DONOR_BALANCE_FIELDS},
+            user_id=user_id,
+        )
+        for user_id, deltas in sorted(pending.items())
+        if any(deltas.values())
+    ]
+    if not rows:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        stmt = postgresql.insert(DonorBalance)
+    else:
+        stmt = sqlite.insert(DonorBalance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DonorBalance.user_id],
+        set_={
+            field: getattr(DonorBalance, field) + stmt.excluded[field]
+            for field in DONOR_BALANCE_FIELDS
+        },
+    )
+    session.execute(stmt, rows)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_donor_balance_deltas(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    """Изменения счётчиков из отменённой транзакции не записываются."""
+    if transaction.parent is None:
+        session.info.pop(DONOR_BALANCE_DELTAS_KEY, None)
+        session.info.pop(DONOR_ALLOCATIONS_KEY, None)
+
+
+donor_balance_crud = DonorBalanceCRUD()
@@ -0,0 +1,99 @@
+from typing import Dict
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models import CharityProject, Donation, FundBalance
+from app.models.fund_balance import FUND_BALANCE_ID
+
+FUND_BALANCE_DELTAS_KEY = "fund_balance_deltas"
+
+
+class FundBalanceCRUD:
+    """CRUD для сводки фонда."""
+
+    async def get(self, session: AsyncSession) -> FundBalance:
+        """Сводка фонда: чтение одной строки."""
+        return await session.get(
+            FundBalance, FUND_BALANCE_ID, populate_existing=True
+        )
+
+    def add(self, session: AsyncSession, **deltas: int) -> None:
+        """
+        Копит изменения счётчиков сводки в сессии. Они записываются
+        одним UPDATE перед фиксацией транзакции, последним запросом в ней:
+        строка сводки блокируется как можно короче и всегда после
+        блокировок очереди распределения.
+        """
+        pending = session.sync_session.info.setdefault(
+            FUND_BALANCE_DELTAS_KEY, {}
+        )
+        for field, delta in deltas.items():
+            pending[field] = pending.get(field, 0) + delta
+
+    async def calculate(self, session: AsyncSession) -> Dict[str, int]:
+        """Счётчики сводки, пересчитанные по таблицам полным проходом."""
+        values = {}
+        for model, prefix in (
+            (Donation, "donations"),
+            (CharityProject, "projects"),
+        ):
+            totals = await session.execute(
+                select(
+                    func.count(model.id),
+                    func.coalesce(func.sum(model.full_amount), 0),
+                )
+            )
+            values[f"{prefix}_count"], values[f"{prefix}_amount"] = (
+                totals.one()
+            )
+        invested_amount = await session.execute(
+            select(func.coalesce(func.sum(Donation.invested_amount), 0))
+        )
+        values["invested_amount"] = invested_amount.scalar_one()
+        return values
+
+    async def rebuild(
+        self, session: AsyncSession, values: Dict[str, int]
+    ) -> None:
+        """Перезаписывает счётчики сводки. Транзакцию не фиксирует."""
+        session.sync_session.info.pop(FUND_BALANCE_DELTAS_KEY, None)
+        await session.execute(
+            update(FundBalance)
+            .where(FundBalance.id == FUND_BALANCE_ID)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def write_fund_balance_deltas(session: Session) -> None:
+    """Записывает накопленные в сессии изменения сводки фонда."""
+    deltas = session.info.pop(FUND_BALANCE_DELTAS_KEY, {})
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    session.execute(
+        update(FundBalance)
+        .where(FundBalance.id == FUND_BALANCE_ID)
+        .values(
+            {
+                field: getattr(FundBalance, field) + delta
+                for field, delta in deltas.items()
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_fund_balance_deltas(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    """Изменения сводки из отменённой транзакции не записываются."""
+    if transaction.parent is None:
+        session.info.pop(FUND_BALANCE_DELTAS_KEY, None)
+
+
+fund_balance_crud = FundBalanceCRUD()
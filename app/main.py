@@ -2,7 +2,76 @@ from fastapi import FastAPI
 
 from app.api.routers import main_router
 from app.core.config import settings
+from app.core.db import engine
+from app.core.google_client import create_google_client
+from app.services.allocation_ledger import allocation_ledger
+from app.services.allocation_queue import allocation_queue
+from app.services.deferred_allocation import deferred_allocator
+from app.services.investment import (
+    DEFERRED_ALLOCATION_MODE,
+    LEDGER_ALLOCATION_MODE,
+    allocate_pending,
+    invalidate_project_list,
+)
+from app.services.report_jobs import report_jobs
 
 app = FastAPI(title=settings.app_title, description=settings.app_description)
 
 app.include_router(main_router)
+
+
+@app.on_event("startup")
+async def start_allocation_queue():
+    """В SQLite нет блокировок строк, распределение идёт через очередь."""
+    if engine.dialect.name == "sqlite":
+        allocation_queue.start()
+
+
+@app.on_event("startup")
+async def start_deferred_allocator():
+    """В отложенном режиме средства распределяет фоновая задача."""
+    if settings.allocation_mode == DEFERRED_ALLOCATION_MODE:
+        deferred_allocator.start(
+            work=allocate_pending,
+            bind=engine,
+            interval_ms=settings.allocation_interval_ms,
+            batch_size=settings.allocation_batch_size,
+            on_commit=invalidate_project_list,
+        )
+
+
+@app.on_event("startup")
+async def start_allocation_ledger():
+    """
+    В режиме ledger очереди распределения восстанавливаются по БД
+    и дальше живут в памяти процесса.
+    """
+    if settings.allocation_mode == LEDGER_ALLOCATION_MODE:
+        await allocation_ledger.start(
+            bind=engine,
+            recover=allocate_pending,
+            interval_ms=settings.allocation_interval_ms,
+            batch_size=settings.allocation_batch_size,
+            check_interval=settings.allocation_ledger_check_interval,
+            on_commit=invalidate_project_list,
+        )
+
+
+@app.on_event("startup")
+async def start_google_client():
+    """Один клиент API Google на всё время работы приложения."""
+    app.state.google_client = create_google_client()
+    await app.state.google_client.start()
+
+
+@app.on_event("shutdown")
+async def stop_allocation_queue():
+    await deferred_allocator.stop()
+    await allocation_ledger.stop()
+    await allocation_queue.stop()
+
+
+@app.on_event("shutdown")
+async def stop_google_client():
+    await report_jobs.stop()
+    await app.state.google_client.stop()
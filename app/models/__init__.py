@@ -1,3 +1,6 @@
+from .allocation import Allocation  # noqa
 from .charity_project import CharityProject  # noqa
 from .donation import Donation  # noqa
+from .donor_balance import DonorBalance  # noqa
+from .fund_balance import FundBalance  # noqa
 from .user import User  # noqa
@@ -1,6 +1,14 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, CheckConstraint, Column, DateTime, Integer
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+)
+from sqlalchemy.orm import declared_attr
 
 from app.core.db import Base
 
@@ -23,3 +31,27 @@ class CashColumnsModel(Base):
     )
     fully_invested = Column(Boolean, default=False)
     invested_amount = Column(Integer, default=0)
+    # Прошёл ли объект распределение средств (в отложенном режиме
+    # новые объекты ждут фонового распределения).
+    allocated = Column(Boolean, default=False)
+
+    @declared_attr
+    def __table_args__(cls):
+        """
+        Индексы для выборки открытых объектов в порядке очереди
+        (WHERE fully_invested IS FALSE ORDER BY create_date),
+        объектов, ожидающих отложенного распределения, а также
+        для курсорной пагинации и фильтров списков.
+        """
+        return (
+            Index(
+                f"ix_{cls.__tablename__}_fully_invested_create_date",
+                "fully_invested",
+                "create_date",
+            ),
+            Index(f"ix_{cls.__tablename__}_allocated", "allocated"),
+            Index(
+                f"ix_{cls.__tablename__}_create_date_id", "create_date", "id"
+            ),
+            Index(f"ix_{cls.__tablename__}_full_amount", "full_amount"),
+        )
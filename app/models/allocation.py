@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.core.db import Base
+
+
+class Allocation(Base):
+    """
+    Модель SQLAlchemy для журнала распределения: сколько средств
+    пожертвования вложено в проект. Записи только добавляются
+    в транзакции распределения.
+    """
+
+    donation_id = Column(Integer, ForeignKey("donation.id"), nullable=False)
+    project_id = Column(
+        Integer, ForeignKey("charityproject.id"), nullable=False
+    )
+    amount = Column(Integer, nullable=False)
+    create_date = Column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_allocation_donation_id_create_date_id",
+            "donation_id",
+            "create_date",
+            "id",
+        ),
+        Index(
+            "ix_allocation_project_id_create_date_id",
+            "project_id",
+            "create_date",
+            "id",
+        ),
+    )
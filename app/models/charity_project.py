@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Integer, String, Text
 
 from app.models.abstract import CashColumnsModel, TimeColumnsModel
 
@@ -8,3 +8,5 @@ class CharityProject(TimeColumnsModel, CashColumnsModel):
 
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
+    # Время сбора средств в секундах, заполняется при закрытии проекта.
+    completion_rate = Column(Integer, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, Text
 
 from app.models.abstract import CashColumnsModel, TimeColumnsModel
 
@@ -8,3 +8,12 @@ class Donation(TimeColumnsModel, CashColumnsModel):
 
     comment = Column(Text, nullable=True)
     user_id = Column(Integer, ForeignKey("user.id"))
+
+
+# Пожертвования пользователя в порядке создания (GET /donation/my).
+Index(
+    "ix_donation_user_id_create_date_id",
+    Donation.user_id,
+    Donation.create_date,
+    Donation.id,
+)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, ForeignKey, Integer
+
+from app.core.db import Base
+
+
+class DonorBalance(Base):
+    """
+    Модель SQLAlchemy для счётчиков пожертвований пользователя: строка
+    на пользователя, которая обновляется в транзакциях создания
+    и распределения его пожертвований.
+    """
+
+    user_id = Column(
+        Integer,
+        ForeignKey("user.id"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    donations_count = Column(Integer, nullable=False, default=0)
+    donations_amount = Column(Integer, nullable=False, default=0)
+    invested_amount = Column(Integer, nullable=False, default=0)
+    open_donations_count = Column(Integer, nullable=False, default=0)
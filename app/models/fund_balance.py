@@ -0,0 +1,31 @@
+from sqlalchemy import DDL, Column, Integer, event
+
+from app.core.db import Base
+
+FUND_BALANCE_ID = 1
+
+
+class FundBalance(Base):
+    """
+    Модель SQLAlchemy для сводки фонда: единственная строка со счётчиками,
+    которые обновляются в транзакциях изменения пожертвований и проектов.
+    invested_amount — сумма, распределённая из пожертвований в проекты
+    (одинакова для обеих сторон).
+    """
+
+    donations_count = Column(Integer, nullable=False, default=0)
+    donations_amount = Column(Integer, nullable=False, default=0)
+    projects_count = Column(Integer, nullable=False, default=0)
+    projects_amount = Column(Integer, nullable=False, default=0)
+    invested_amount = Column(Integer, nullable=False, default=0)
+
+
+event.listen(
+    FundBalance.__table__,
+    "after_create",
+    DDL(
+        f"INSERT INTO {FundBalance.__tablename__} (id, donations_count, "
+        "donations_amount, projects_count, projects_amount, invested_amount) "
+        f"VALUES ({FUND_BALANCE_ID}, 0, 0, 0, 0, 0)"
+    ),
+)
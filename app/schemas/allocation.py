@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class AllocationStatus(BaseModel):
+    """Модель Pydantic для статуса распределения средств объекта."""
+
+    id: int
+    allocated: bool
+    invested_amount: int
+    fully_invested: bool
+
+    class Config:
+        orm_mode = True
+
+
+class AllocationDB(BaseModel):
+    """
+    Модель Pydantic для записи журнала распределения:
+    сумма пожертвования, вложенная в проект.
+    """
+
+    donation_id: int
+    project_id: int
+    amount: int
+    create_date: datetime
+
+    class Config:
+        orm_mode = True
@@ -32,3 +32,14 @@ class CharityProjectDB(CharityProjectCreate, TimeAndCashModel):
 
     class Config:
         orm_mode = True
+
+
+class CharityProjectBatchResult(BaseModel):
+    """
+    Модель Pydantic для результата создания проекта из пачки:
+    созданный проект или причина, по которой он не создан.
+    """
+
+    name: Optional[str]
+    project: Optional[CharityProjectDB]
+    error: Optional[str]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Extra, PositiveInt
 
 from app.schemas.abstract import TimeAndCashModel
 
@@ -27,3 +27,36 @@ class ExtendedDonationtDB(DonationtDB, TimeAndCashModel):
     """Модель Pydantic для получшения всей информации о пожертвовании."""
 
     user_id: int
+
+
+class DonationImport(DonationCreate):
+    """
+    Модель Pydantic для строки массового импорта пожертвований.
+    Без user_id пожертвование записывается на импортирующего.
+    """
+
+    full_amount: PositiveInt
+    user_id: Optional[int]
+
+    class Config:
+        extra = Extra.forbid
+
+
+class DonationImportResult(BaseModel):
+    """Модель Pydantic для итогов массового импорта пожертвований."""
+
+    imported_count: int
+    imported_amount: int
+    invested_amount: int
+
+
+class DonationSummary(BaseModel):
+    """Модель Pydantic для сводки пожертвований пользователя."""
+
+    donations_count: int = 0
+    donations_amount: int = 0
+    invested_amount: int = 0
+    open_donations_count: int = 0
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Формат потоковой выгрузки и массового импорта."""
+
+    ndjson = "ndjson"
+    csv = "csv"
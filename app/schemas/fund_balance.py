@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class FundSummary(BaseModel):
+    """Модель Pydantic для сводки фонда."""
+
+    donations_count: int
+    donations_amount: int
+    projects_count: int
+    projects_amount: int
+    invested_amount: int
+    unallocated_amount: int
+    required_amount: int
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class ListParams(BaseModel):
+    """
+    Модель Pydantic для фильтров и курсорной пагинации списков.
+    after — ключ (create_date, id) последнего объекта предыдущей страницы.
+    """
+
+    limit: Optional[int]
+    after: Optional[Tuple[datetime, int]]
+    fully_invested: Optional[bool]
+    create_date_from: Optional[datetime]
+    create_date_to: Optional[datetime]
+    full_amount_min: Optional[int]
+    full_amount_max: Optional[int]
@@ -0,0 +1,23 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ReportStatus(str, Enum):
+    """Статус задачи формирования отчёта."""
+
+    pending = "pending"
+    done = "done"
+    failed = "failed"
+
+
+class ReportJob(BaseModel):
+    """Модель Pydantic для задачи формирования отчёта."""
+
+    id: str
+    status: ReportStatus = ReportStatus.pending
+    url: Optional[str]
+    error: Optional[str]
+    create_date: datetime
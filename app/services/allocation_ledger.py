@@ -0,0 +1,472 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.crud.allocation import allocation_crud
+from app.crud.fund_balance import fund_balance_crud
+from app.models import CharityProject, Donation
+from app.services.allocation_queue import Work, allocation_queue
+
+logger = logging.getLogger(__name__)
+
+MODELS = (Donation, CharityProject)
+
+
+class LedgerEntry:
+    """Открытый объект в очереди распределения."""
+
+    __slots__ = (
+        "id",
+        "create_date",
+        "full_amount",
+        "invested_amount",
+        "close_date",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        create_date: datetime,
+        full_amount: int,
+        invested_amount: int,
+        close_date: Optional[datetime] = None,
+    ) -> None:
+        self.id = id
+        self.create_date = create_date
+        self.full_amount = full_amount
+        self.invested_amount = invested_amount
+        self.close_date = close_date
+
+    @property
+    def remaining(self) -> int:
+        return self.full_amount - self.invested_amount
+
+    def values(self, model: Union[Donation, CharityProject]) -> Dict[str, Any]:
+        """Значения столбцов объекта для записи в БД."""
+        values = dict(
+            invested_amount=self.invested_amount,
+            fully_invested=self.close_date is not None,
+            close_date=self.close_date,
+        )
+        if model is CharityProject:
+            values["completion_rate"] = self.completion_rate
+        return values
+
+    @property
+    def completion_rate(self) -> Optional[int]:
+        """Время сбора в секундах, доли секунды отбрасываются, как в БД."""
+        if self.close_date is None:
+            return None
+        close_date = self.close_date.replace(microsecond=0)
+        create_date = self.create_date.replace(microsecond=0)
+        return int((close_date - create_date).total_seconds())
+
+
+class AllocationLedger:
+    """
+    Очереди открытых пожертвований и проектов в памяти процесса.
+    Распределение средств нового объекта проходит только по головам
+    очередей в памяти (O(k) для k затронутых объектов) и не зависит
+    от размера таблиц. Изменённые объекты записываются в БД пачками
+    (write-behind) раз в interval секунд или после batch_size объектов.
+    Вместе с объектами записываются пары журнала распределения.
+    Новые объекты до записи хранятся в БД с allocated=False, поэтому
+    после сбоя очереди восстанавливаются по БД: recover распределяет
+    такие объекты заново, затем очереди загружаются из БД.
+    Если запись не удалась, изменения остаются в памяти до следующей
+    записи, а журнал считается неисправным до успешного восстановления
+    по БД: новые объекты тем временем только сохраняются в БД
+    с allocated=False и распределяются при восстановлении.
+    Годится, только если приложение работает в одном процессе.
+    """
+
+    def __init__(self) -> None:
+        self.interval = 0.0
+        self.batch_size = 0
+        self.check_interval = 0
+        self.lock: Optional[asyncio.Lock] = None
+        self.queues: Dict[Any, Deque[LedgerEntry]] = {
+            model: deque() for model in MODELS
+        }
+        self._dirty: Dict[Any, Dict[int, LedgerEntry]] = {
+            model: {} for model in MODELS
+        }
+        self._invested_amount = 0
+        self._allocations: List[Dict[str, Any]] = []
+        self._bind: Optional[AsyncEngine] = None
+        self._recover: Optional[Work] = None
+        self._on_commit: Optional[Callable[[], Awaitable]] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._healthy = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    @property
+    def is_healthy(self) -> bool:
+        """Очереди в памяти совпадают с БД и годятся для распределения."""
+        return self._healthy
+
+    @property
+    def pending_count(self) -> int:
+        """Число изменённых объектов, ещё не записанных в БД."""
+        return sum(len(dirty) for dirty in self._dirty.values())
+
+    async def start(
+        self,
+        bind: AsyncEngine,
+        recover: Work,
+        interval_ms: int,
+        batch_size: int,
+        check_interval: int = 0,
+        on_commit: Optional[Callable[[], Awaitable]] = None,
+    ) -> None:
+        """
+        Восстанавливает очереди по БД и запускает фоновую запись.
+        recover распределяет объекты с allocated=False, не фиксируя
+        транзакцию; on_commit вызывается после каждой записи пачки.
+        Раз в check_interval секунд (0 — никогда) очереди сверяются с БД
+        и при расхождении восстанавливаются.
+        """
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.check_interval = check_interval
+        self.lock = asyncio.Lock()
+        self._bind = bind
+        self._recover = recover
+        self._on_commit = on_commit
+        async with self.lock:
+            await self._rebuild()
+        self._batch_ready = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую задачу, записав накопленные изменения.
+        Незаписанные изменения восстановятся по БД при следующем запуске.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await self.flush()
+        if self.pending_count:
+            logger.error(
+                "Не записаны изменения очередей распределения: %s объектов",
+                self.pending_count,
+            )
+
+    def allocate(
+        self, db_obj: Union[Donation, CharityProject]
+    ) -> Union[Donation, CharityProject]:
+        """
+        Распределяет средства только что сохранённого объекта по
+        открытым объектам другой очереди в порядке создания и переносит
+        результат в db_obj. Вызывается под lock сразу после фиксации
+        объекта, чтобы очереди пополнялись в порядке (create_date, id).
+        """
+        model = type(db_obj)
+        other = CharityProject if model is Donation else Donation
+        entry = LedgerEntry(
+            id=db_obj.id,
+            create_date=db_obj.create_date,
+            full_amount=db_obj.full_amount,
+            invested_amount=db_obj.invested_amount or 0,
+        )
+        invested_amount = entry.invested_amount
+        close_date = datetime.now()
+        queue = self.queues[other]
+        while entry.remaining > 0 and queue:
+            head = queue[0]
+            amount = min(entry.remaining, head.remaining)
+            head.invested_amount += amount
+            entry.invested_amount += amount
+            self._dirty[other][head.id] = head
+            self._allocations.append(
+                dict(
+                    donation_id=entry.id if model is Donation else head.id,
+                    project_id=head.id if model is Donation else entry.id,
+                    amount=amount,
+                    create_date=close_date,
+                )
+            )
+            if head.remaining == 0:
+                head.close_date = close_date
+                queue.popleft()
+        if entry.remaining == 0:
+            entry.close_date = close_date
+        else:
+            self.queues[model].append(entry)
+        self._dirty[model][entry.id] = entry
+        self._invested_amount += entry.invested_amount - invested_amount
+        for field, value in entry.values(model).items():
+            setattr(db_obj, field, value)
+        db_obj.allocated = True
+        if self.pending_count >= self.batch_size:
+            self._batch_ready.set()
+        return db_obj
+
+    async def flush(self) -> None:
+        """
+        Записывает изменённые объекты одной транзакцией. Если запись
+        не удалась или журнал неисправен, очереди восстанавливаются по БД.
+        on_commit вызывается, только если изменения зафиксированы.
+        """
+        async with self.lock:
+            written = await self._flush()
+        if written and self._on_commit is not None:
+            await self._on_commit()
+
+    @asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """
+        Работа с БД в обход очередей в памяти: правка и удаление
+        проектов, массовое создание объектов. Накопленные изменения
+        записываются до неё, очереди перечитываются после, а новые
+        объекты на это время ждут блокировки. Если изменения записать
+        не удалось, работа не выполняется: её результат разошёлся бы
+        с изменениями в памяти.
+        """
+        if not self.is_running:
+            yield
+            return
+        async with self.lock:
+            await self._flush()
+            if self.pending_count:
+                raise RuntimeError(
+                    "Изменения очередей распределения не записаны в БД"
+                )
+            try:
+                yield
+            finally:
+                if self._healthy:
+                    await self._load()
+
+    async def check(self) -> List[str]:
+        """
+        Сверяет очереди в памяти с БД после записи накопленных изменений.
+        Возвращает описания расхождений; пустой список — очереди совпадают.
+        """
+        problems = []
+        async with self.lock:
+            await self._flush()
+            if not self._healthy:
+                return ["очереди в памяти не восстановлены по БД"]
+            async with AsyncSession(bind=self._bind) as session:
+                for model in MODELS:
+                    problems += _compare_queues(
+                        name=model.__tablename__,
+                        memory=list(self.queues[model]),
+                        stored=await self._select_queue(session, model),
+                    )
+        return problems
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_check = loop.time() + self.check_interval
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._batch_ready.wait(), timeout=self.interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            try:
+                await self.flush()
+                if self.check_interval and loop.time() >= next_check:
+                    next_check = loop.time() + self.check_interval
+                    await self._check_and_repair()
+            except Exception:
+                logger.exception("Ошибка записи очередей распределения")
+
+    async def _check_and_repair(self) -> None:
+        problems = await self.check()
+        if not problems:
+            return
+        logger.error(
+            "Очереди распределения расходятся с БД: %s", "; ".join(problems)
+        )
+        async with self.lock:
+            await self._rebuild()
+
+    async def _flush(self) -> bool:
+        """
+        Запись изменений под lock. Незаписанные изменения остаются
+        в памяти и записываются следующей попыткой; неисправный журнал
+        после этого восстанавливается по БД. Возвращает True, если
+        изменения или восстановление зафиксированы в БД.
+        """
+        committed = False
+        if self.pending_count:
+            try:
+                await self._execute(
+                    partial(
+                        self._write,
+                        values={
+                            model: {
+                                entry.id: entry.values(model)
+                                for entry in self._dirty[model].values()
+                            }
+                            for model in MODELS
+                        },
+                        invested_amount=self._invested_amount,
+                        allocations=self._allocations,
+                    )
+                )
+            except Exception:
+                logger.exception("Ошибка записи очередей распределения")
+                self._healthy = False
+            else:
+                self._clear()
+                committed = True
+        if not self._healthy:
+            try:
+                await self._rebuild()
+            except Exception:
+                logger.exception("Ошибка восстановления очередей по БД")
+            else:
+                committed = True
+        return committed
+
+    async def _rebuild(self) -> None:
+        """
+        Восстановление по БД: распределение ожидающих и загрузка очередей.
+        Изменения в памяти отбрасываются только после распределения
+        ожидающих: оно повторяет их по данным БД.
+        """
+        self._healthy = False
+        await self._execute(self._recover)
+        self._clear()
+        await self._load()
+        self._healthy = True
+
+    def _clear(self) -> None:
+        self._dirty = {model: {} for model in MODELS}
+        self._invested_amount = 0
+        self._allocations = []
+
+    async def _load(self) -> None:
+        async with AsyncSession(bind=self._bind) as session:
+            for model in MODELS:
+                self.queues[model] = deque(
+                    await self._select_queue(session, model)
+                )
+
+    @staticmethod
+    async def _select_queue(
+        session: AsyncSession, model: Union[Donation, CharityProject]
+    ) -> List[LedgerEntry]:
+        """Открытые объекты model в порядке очереди."""
+        rows = await session.execute(
+            select(
+                model.id,
+                model.create_date,
+                model.full_amount,
+                model.invested_amount,
+            )
+            .where(model.fully_invested.is_(False))
+            .order_by(model.create_date, model.id)
+        )
+        return [LedgerEntry(*row) for row in rows]
+
+    @staticmethod
+    async def _write(
+        session: AsyncSession,
+        values: Dict[Any, Dict[int, Dict[str, Any]]],
+        invested_amount: int,
+        allocations: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Один executemany-запрос UPDATE на каждую очередь и записи журнала
+        распределения. Имена параметров UPDATE не должны совпадать
+        с именами столбцов, отсюда префикс new_.
+        """
+        for model, model_values in values.items():
+            if not model_values:
+                continue
+            table = model.__table__
+            fields = next(iter(model_values.values()))
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("entry_id"))
+                .values(
+                    allocated=True,
+                    **{field: bindparam(f"new_{field}") for field in fields},
+                ),
+                [
+                    dict(
+                        {
+                            f"new_{field}": value
+                            for field, value in obj_values.items()
+                        },
+                        entry_id=obj_id,
+                    )
+                    for obj_id, obj_values in model_values.items()
+                ],
+            )
+        await allocation_crud.record(allocations=allocations, session=session)
+        fund_balance_crud.add(session, invested_amount=invested_amount)
+
+    async def _execute(self, work: Work) -> Any:
+        """Работа с БД одной транзакцией через очередь или напрямую."""
+        if allocation_queue.is_running:
+            return await allocation_queue.submit(work=work, bind=self._bind)
+        async with AsyncSession(bind=self._bind) as session:
+            result = await work(session)
+            await session.commit()
+        return result
+
+
+def _compare_queues(
+    name: str, memory: List[LedgerEntry], stored: List[LedgerEntry]
+) -> List[str]:
+    """Расхождения очереди в памяти с очередью в БД."""
+    memory_entries = {entry.id: entry for entry in memory}
+    stored_entries = {entry.id: entry for entry in stored}
+    problems = [
+        f"{name} {obj_id}: открыт только в памяти"
+        for obj_id in sorted(memory_entries.keys() - stored_entries.keys())
+    ] + [
+        f"{name} {obj_id}: открыт только в БД"
+        for obj_id in sorted(stored_entries.keys() - memory_entries.keys())
+    ]
+    for obj_id in sorted(memory_entries.keys() & stored_entries.keys()):
+        memory_remaining = memory_entries[obj_id].remaining
+        stored_remaining = stored_entries[obj_id].remaining
+        if memory_remaining != stored_remaining:
+            problems.append(
+                f"{name} {obj_id}: остаток в памяти {memory_remaining}, "
+                f"в БД {stored_remaining}"
+            )
+    if not problems and [entry.id for entry in memory] != [
+        entry.id for entry in stored
+    ]:
+        problems.append(f"{name}: порядок очереди отличается от БД")
+    return problems
+
+
+allocation_ledger = AllocationLedger()
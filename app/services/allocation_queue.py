@@ -0,0 +1,98 @@
+import asyncio
+from itertools import groupby
+from typing import Any, Awaitable, Callable, List, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+ALLOCATION_BATCH_SIZE = 100
+
+Work = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class AllocationRequest(NamedTuple):
+    """Запрос к очереди: работа с БД и движок, на котором её выполнить."""
+
+    work: Work
+    bind: AsyncEngine
+    future: asyncio.Future
+
+
+class AllocationQueue:
+    """
+    Очередь распределения средств с единственным писателем.
+    Нужна для SQLite, где нет блокировок строк: создание объектов
+    и распределение средств выполняет одна фоновая задача, а накопившиеся
+    к её запуску запросы объединяются в одну транзакцию.
+    """
+
+    def __init__(self, batch_size: int = ALLOCATION_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def start(self) -> None:
+        """Запускает фоновую задачу очереди."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и отменяет необработанные запросы."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+        self._worker = None
+        self._queue = None
+
+    async def submit(self, work: Work, bind: AsyncEngine) -> Any:
+        """
+        Ставит работу в очередь и ждёт фиксации транзакции, в которую
+        она попала. Возвращает результат работы.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(
+            AllocationRequest(work=work, bind=bind, future=future)
+        )
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for _, requests in groupby(batch, key=lambda item: item.bind):
+                requests = list(requests)
+                try:
+                    await self._process(requests)
+                except Exception:
+                    # Ошибка одного запроса не должна ронять всю пачку:
+                    # повторяем каждый запрос в отдельной транзакции.
+                    for request in requests:
+                        try:
+                            await self._process([request])
+                        except Exception as error:
+                            if not request.future.done():
+                                request.future.set_exception(error)
+
+    async def _process(self, requests: List[AllocationRequest]) -> None:
+        """Выполняет пачку запросов в одной транзакции."""
+        async with AsyncSession(
+            bind=requests[0].bind, expire_on_commit=False
+        ) as session:
+            results = [await request.work(session) for request in requests]
+            await session.commit()
+        for request, result in zip(requests, results):
+            if not request.future.done():
+                request.future.set_result(result)
+
+
+allocation_queue = AllocationQueue()
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.services.allocation_queue import Work, allocation_queue
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredAllocator:
+    """
+    Фоновое распределение средств для отложенного режима.
+    Эндпоинты только сохраняют объекты и вызывают notify(); распределение
+    всех накопившихся объектов выполняется одной транзакцией раз
+    в interval секунд или сразу, как только накопится batch_size объектов.
+    """
+
+    def __init__(self) -> None:
+        self.interval = 0.0
+        self.batch_size = 0
+        self._work: Optional[Work] = None
+        self._on_commit: Optional[Callable[[], Awaitable]] = None
+        self._binds: Set[AsyncEngine] = set()
+        self._pending_count = 0
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def start(
+        self,
+        work: Work,
+        bind: AsyncEngine,
+        interval_ms: int,
+        batch_size: int,
+        on_commit: Optional[Callable[[], Awaitable]] = None,
+    ) -> None:
+        """
+        Запускает фоновую задачу. Первый проход выполняется сразу,
+        чтобы распределить объекты, сохранённые до перезапуска.
+        on_commit вызывается после фиксации прохода, в котором work
+        вернула истинное значение.
+        """
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self._work = work
+        self._on_commit = on_commit
+        self._binds = {bind}
+        self._batch_ready = asyncio.Event()
+        self._batch_ready.set()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    def notify(self, bind: AsyncEngine, count: int = 1) -> None:
+        """Сообщает о count новых объектах, ожидающих распределения."""
+        self._binds.add(bind)
+        self._pending_count += count
+        if self._pending_count >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._batch_ready.wait(), timeout=self.interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            self._pending_count = 0
+            binds, self._binds = self._binds, set()
+            for bind in binds:
+                try:
+                    if await self._allocate(bind) and self._on_commit:
+                        await self._on_commit()
+                except Exception:
+                    logger.exception("Ошибка отложенного распределения")
+                    self._binds.add(bind)
+
+    async def _allocate(self, bind: AsyncEngine) -> Any:
+        """Распределение одной транзакцией через очередь или напрямую."""
+        if allocation_queue.is_running:
+            return await allocation_queue.submit(work=self._work, bind=bind)
+        async with AsyncSession(bind=bind) as session:
+            result = await self._work(session)
+            await session.commit()
+        return result
+
+
+deferred_allocator = DeferredAllocator()
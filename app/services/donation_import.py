@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import donation_crud
+from app.models import User
+from app.schemas.donation import DonationImport, DonationImportResult
+from app.schemas.export import ExportFormat
+from app.services.investment import bulk_create_and_invest
+
+IMPORT_MAX_ROWS = 100000
+
+
+class DonationImportError(ValueError):
+    """Файл импорта не прошёл проверку; пожертвования не созданы."""
+
+
+def parse_donations(
+    data: bytes, import_format: ExportFormat
+) -> List[DonationImport]:
+    """
+    Разбирает файл импорта: NDJSON (объект на строку) или CSV
+    с заголовком comment,full_amount[,user_id]. Пустые значения CSV
+    считаются отсутствующими. Ошибка в любой строке отклоняет весь файл.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise DonationImportError("Файл импорта должен быть в UTF-8.")
+    if import_format == ExportFormat.csv:
+        rows = _read_csv(text)
+    else:
+        rows = _read_ndjson(text)
+    donations = []
+    for line_number, row in rows:
+        try:
+            donations.append(DonationImport.parse_obj(row))
+        except ValidationError as error:
+            messages = "; ".join(
+                f"{'.'.join(map(str, item['loc']))}: {item['msg']}"
+                for item in error.errors()
+            )
+            raise DonationImportError(f"Строка {line_number}: {messages}")
+        if len(donations) > IMPORT_MAX_ROWS:
+            raise DonationImportError(
+                f"За один импорт можно загрузить не больше "
+                f"{IMPORT_MAX_ROWS} пожертвований."
+            )
+    if not donations:
+        raise DonationImportError("Файл импорта не содержит пожертвований.")
+    return donations
+
+
+async def import_donations(
+    donations: List[DonationImport], user_id: int, session: AsyncSession
+) -> DonationImportResult:
+    """
+    Создаёт пожертвования одной пачкой в порядке файла и распределяет
+    их средства одной транзакцией. Пожертвования без user_id
+    записываются на пользователя user_id.
+    """
+    objs_in_data = [
+        dict(donation.dict(), user_id=donation.user_id or user_id)
+        for donation in donations
+    ]
+    await _check_users_exist(
+        user_ids={obj_in["user_id"] for obj_in in objs_in_data},
+        session=session,
+    )
+    invested_amount = await bulk_create_and_invest(
+        crud=donation_crud, objs_in_data=objs_in_data, session=session
+    )
+    return DonationImportResult(
+        imported_count=len(objs_in_data),
+        imported_amount=sum(obj_in["full_amount"] for obj_in in objs_in_data),
+        invested_amount=invested_amount,
+    )
+
+
+async def _check_users_exist(
+    user_ids: Set[int], session: AsyncSession
+) -> None:
+    found_ids = await session.execute(
+        select(User.id).where(User.id.in_(user_ids))
+    )
+    missing_ids = user_ids - set(found_ids.scalars())
+    if missing_ids:
+        missing_ids = ", ".join(map(str, sorted(missing_ids)))
+        raise DonationImportError(f"Пользователи не найдены: {missing_ids}")
+
+
+def _read_ndjson(text: str) -> Iterator[Tuple[int, Any]]:
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise DonationImportError(
+                f"Строка {line_number}: некорректный JSON."
+            )
+        yield line_number, row
+
+
+def _read_csv(text: str) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        if None in row:
+            raise DonationImportError(
+                f"Строка {reader.line_num}: лишние значения."
+            )
+        yield reader.line_num, _drop_empty(row)
+
+
+def _drop_empty(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Пустые ячейки CSV — отсутствующие значения."""
+    return {
+        key: value for key, value in row.items() if value not in ("", None)
+    }
@@ -0,0 +1,58 @@
+from typing import Dict, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.fund_balance import fund_balance_crud
+from app.models import FundBalance
+from app.schemas.fund_balance import FundSummary
+
+FUND_BALANCE_FIELDS = (
+    "donations_count",
+    "donations_amount",
+    "projects_count",
+    "projects_amount",
+    "invested_amount",
+)
+
+
+async def get_fund_summary(session: AsyncSession) -> FundSummary:
+    """Сводка фонда по счётчикам, без обхода таблиц."""
+    fund_balance = await fund_balance_crud.get(session=session)
+    return _to_summary(fund_balance)
+
+
+async def reconcile_fund_balance(
+    session: AsyncSession, fix: bool = False
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Пересчитывает сводку фонда по таблицам и сравнивает со счётчиками.
+    Возвращает расхождения: поле -> (значение счётчика, пересчитанное).
+    С fix=True перезаписывает счётчики пересчитанными значениями
+    и фиксирует транзакцию.
+    """
+    fund_balance = await fund_balance_crud.get(session=session)
+    values = await fund_balance_crud.calculate(session=session)
+    drift = {
+        field: (getattr(fund_balance, field), values[field])
+        for field in FUND_BALANCE_FIELDS
+        if getattr(fund_balance, field) != values[field]
+    }
+    if fix and drift:
+        await fund_balance_crud.rebuild(session=session, values=values)
+        await session.commit()
+    return drift
+
+
+def _to_summary(fund_balance: FundBalance) -> FundSummary:
+    return FundSummary(
+        **{
+            field: getattr(fund_balance, field)
+            for field in FUND_BALANCE_FIELDS
+        },
+        unallocated_amount=(
+            fund_balance.donations_amount - fund_balance.invested_amount
+        ),
+        required_amount=(
+            fund_balance.projects_amount - fund_balance.invested_amount
+        ),
+    )
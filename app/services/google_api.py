@@ -1,13 +1,26 @@
-import datetime
+import asyncio
+from copy import deepcopy
 from datetime import datetime, timedelta
+from typing import Collection, List
 
 from aiogoogle import Aiogoogle
+from aiogoogle.excs import HTTPError
+from aiogoogle.models import Request
 
 from app.core.config import settings
 
 FORMAT = "%Y/%m/%d %H:%M:%S"
-REPORT_ROW_COUNT = 100
-REPORT_COLUMN_COUNT = 10
+REPORT_DEFAULT_SIZE = 100
+REPORT_MAX_SIZE = 100000
+# Строк в одном запросе values.batchUpdate и число таких запросов,
+# выполняемых одновременно.
+REPORT_UPDATE_CHUNK_SIZE = 5000
+REPORT_UPDATE_CONCURRENCY = 4
+# Ответы API Google, после которых повторяются идемпотентные запросы.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Неидемпотентный запрос повторяется только после 429: запрос отклонён
+# до выполнения. После 5xx документ мог быть уже создан.
+CREATE_RETRY_STATUSES = (429,)
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/%s"
 SPREADSHEET_BODY = {
     "properties": {
@@ -21,26 +34,100 @@ SPREADSHEET_BODY = {
                 "sheetId": 0,
                 "title": "Лист1",
                 "gridProperties": {
-                    "rowCount": REPORT_ROW_COUNT,
-                    "columnCount": REPORT_COLUMN_COUNT,
+                    "rowCount": None,
+                    "columnCount": None,
                 },
             }
         }
     ],
 }
+REPORT_COLUMNS = ["Название проекта", "Время сбора", "Описание"]
 
 
-async def spreadsheets_create(wrapper_services: Aiogoogle) -> str:
+def get_report_header(now_date_time: str) -> List[list]:
+    """Шапка отчёта."""
+    return [
+        ["Отчет от", now_date_time],
+        ["Топ проектов по скорости закрытия"],
+        REPORT_COLUMNS,
+    ]
+
+
+def get_report_row(
+    name: str, description: str, completion_rate: int
+) -> list:
+    """Строка отчёта о проекте."""
+    return [name, str(timedelta(seconds=completion_rate)), description]
+
+
+def get_report_row_count(projects_count: int) -> int:
+    """Число строк отчёта: шапка и по строке на проект."""
+    return len(get_report_header("")) + projects_count
+
+
+def get_spreadsheet_body(now_date_time: str, row_count: int) -> dict:
+    """Тело запроса создания документа с листом под размер отчёта."""
+    spreadsheet_body = deepcopy(SPREADSHEET_BODY)
+    spreadsheet_body["properties"]["title"] %= now_date_time
+    spreadsheet_body["sheets"][0]["properties"]["gridProperties"].update(
+        rowCount=row_count, columnCount=len(REPORT_COLUMNS)
+    )
+    return spreadsheet_body
+
+
+def get_range(first_row: int, last_row: int, column_count: int) -> str:
+    """Диапазон в нотации A1 для строк first_row..last_row (с единицы)."""
+    last_column = chr(ord("A") + column_count - 1)
+    return f"A{first_row}:{last_column}{last_row}"
+
+
+async def call_google_api(
+    wrapper_services: Aiogoogle,
+    request: Request,
+    retry_statuses: Collection[int] = (),
+):
+    """
+    Запрос к API Google от имени сервис-аккаунта с тайм-аутом
+    settings.google_request_timeout. На ответы из retry_statuses запрос
+    повторяется до settings.google_retry_count раз с экспоненциальной
+    задержкой (или задержкой из Retry-After, если она больше).
+    По умолчанию запрос не повторяется.
+    """
+    for attempt in range(settings.google_retry_count + 1):
+        try:
+            return await asyncio.wait_for(
+                wrapper_services.as_service_account(request),
+                timeout=settings.google_request_timeout,
+            )
+        except HTTPError as error:
+            if (
+                error.res is None or
+                error.res.status_code not in retry_statuses or
+                attempt == settings.google_retry_count
+            ):
+                raise
+            delay = settings.google_retry_backoff * 2 ** attempt
+            retry_after = (error.res.headers or {}).get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+
+
+async def spreadsheets_create(
+    wrapper_services: Aiogoogle, row_count: int
+) -> str:
     """
-    Создание чистого документа Google Sheets.
+    Создание чистого документа Google Sheets на row_count строк.
     Возвращает id документа.
     """
     now_date_time = datetime.now().strftime(FORMAT)
-    spreadsheet_body = SPREADSHEET_BODY.copy()
-    spreadsheet_body["properties"]["title"] %= now_date_time
     service = await wrapper_services.discover("sheets", "v4")
-    response = await wrapper_services.as_service_account(
-        service.spreadsheets.create(json=spreadsheet_body)
+    response = await call_google_api(
+        wrapper_services,
+        service.spreadsheets.create(
+            json=get_spreadsheet_body(now_date_time, row_count)
+        ),
+        retry_statuses=CREATE_RETRY_STATUSES,
     )
     spreadsheet_id = response["spreadsheetId"]
     return spreadsheet_id
@@ -56,10 +143,39 @@ async def set_user_permissions(
         "emailAddress": settings.email,
     }
     drive_service = await wrapper_services.discover("drive", "v3")
-    await wrapper_services.as_service_account(
+    await call_google_api(
+        wrapper_services,
         drive_service.permissions.create(
             fileId=spreadsheet_id, json=permissions_body, fields="id"
-        )
+        ),
+        retry_statuses=RETRY_STATUSES,
+    )
+
+
+async def spreadsheets_resize(
+    spreadsheet_id: str, row_count: int, wrapper_services: Aiogoogle
+) -> None:
+    """Изменение числа строк листа документа."""
+    sheets_service = await wrapper_services.discover("sheets", "v4")
+    update_body = {
+        "requests": [
+            {
+                "updateSheetProperties": {
+                    "properties": {
+                        "sheetId": 0,
+                        "gridProperties": {"rowCount": row_count},
+                    },
+                    "fields": "gridProperties.rowCount",
+                }
+            }
+        ]
+    }
+    await call_google_api(
+        wrapper_services,
+        sheets_service.spreadsheets.batchUpdate(
+            spreadsheetId=spreadsheet_id, json=update_body
+        ),
+        retry_statuses=RETRY_STATUSES,
     )
 
 
@@ -67,33 +183,49 @@ async def spreadsheets_update_value(
     spreadsheet_id: str, closed_projects: list, wrapper_services: Aiogoogle
 ) -> str:
     """
-    Наполнение документа Google Sheets отчётными данными.
+    Наполнение документа Google Sheets отчётными данными: строками
+    (name, description, completion_rate) закрытых проектов. Большие
+    отчёты записываются несколькими запросами values.batchUpdate
+    по REPORT_UPDATE_CHUNK_SIZE строк, до REPORT_UPDATE_CONCURRENCY
+    запросов одновременно.
     Возвращает ссылку на документ.
     """
     now_date_time = datetime.now().strftime(FORMAT)
     sheets_service = await wrapper_services.discover("sheets", "v4")
-    table_values = [
-        ["Отчет от", now_date_time],
-        ["Топ проектов по скорости закрытия"],
-        ["Название проекта", "Время сбора", "Описание"],
-    ]
-    for project_and_completion_rate in closed_projects:
-        project, completion_rate = project_and_completion_rate
-        completion_rate = timedelta(seconds=completion_rate)
-        new_row = [
-            project.name,
-            str(completion_rate),
-            project.description,
-        ]
-        table_values.append(new_row)
-
-    update_body = {"majorDimension": "ROWS", "values": table_values}
-    await wrapper_services.as_service_account(
-        sheets_service.spreadsheets.values.update(
-            spreadsheetId=spreadsheet_id,
-            range="A1:E30",
-            valueInputOption="USER_ENTERED",
-            json=update_body,
+    table_values = get_report_header(now_date_time)
+    table_values += [get_report_row(*project) for project in closed_projects]
+
+    semaphore = asyncio.Semaphore(REPORT_UPDATE_CONCURRENCY)
+
+    async def update_chunk(start: int) -> None:
+        chunk = table_values[start:start + REPORT_UPDATE_CHUNK_SIZE]
+        update_body = {
+            "valueInputOption": "USER_ENTERED",
+            "data": [
+                {
+                    "range": get_range(
+                        start + 1, start + len(chunk), len(REPORT_COLUMNS)
+                    ),
+                    "majorDimension": "ROWS",
+                    "values": chunk,
+                }
+            ],
+        }
+        async with semaphore:
+            await call_google_api(
+                wrapper_services,
+                sheets_service.spreadsheets.values.batchUpdate(
+                    spreadsheetId=spreadsheet_id, json=update_body
+                ),
+                retry_statuses=RETRY_STATUSES,
+            )
+
+    await asyncio.gather(
+        *(
+            update_chunk(start)
+            for start in range(
+                0, len(table_values), REPORT_UPDATE_CHUNK_SIZE
+            )
         )
     )
     return SPREADSHEET_URL % spreadsheet_id
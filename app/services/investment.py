@@ -1,10 +1,102 @@
 from datetime import datetime
-from typing import List, Tuple, Union
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, case, func, literal, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio.result import AsyncScalarResult
+from sqlalchemy.sql.expression import CTE, ScalarSelect, Select, Update
 
+from app.core.config import settings
+from app.core.sql import seconds_between
+from app.crud.allocation import allocation_crud
+from app.crud.base import BaseCRUD
+from app.crud.fund_balance import fund_balance_crud
 from app.models import CharityProject, Donation
+from app.schemas.charity_project import CharityProjectCreate
+from app.schemas.donation import DonationCreate
+from app.services.allocation_ledger import allocation_ledger
+from app.services.allocation_queue import Work, allocation_queue
+from app.services.deferred_allocation import deferred_allocator
+from app.services.response_cache import project_list_cache
+
+INVESTABLE_OBJECTS_BATCH_SIZE = 100
+PYTHON_INVESTMENT_ENGINE = "python"
+SQL_INVESTMENT_ENGINE = "sql"
+IMMEDIATE_ALLOCATION_MODE = "immediate"
+DEFERRED_ALLOCATION_MODE = "deferred"
+LEDGER_ALLOCATION_MODE = "ledger"
+PENDING_IDS_CHUNK_SIZE = 500
+
+
+async def create_and_invest(
+    crud: BaseCRUD,
+    obj_in: Union[DonationCreate, CharityProjectCreate],
+    session: AsyncSession,
+    user_id: Optional[int] = None,
+) -> Union[Donation, CharityProject]:
+    """
+    Создаёт пожертвование или проект и инвестирует его средства
+    в одной транзакции: flush для получения id, распределение и один commit
+    без повторного чтения объекта. Если запущена очередь распределения
+    (SQLite), транзакцию выполняет она; иначе — текущая сессия.
+    В отложенном режиме объект только сохраняется, а распределение
+    выполняет фоновая задача; без неё (CLI, скрипты) объект ждёт
+    allocate_pending. В режиме ledger объект сохраняется,
+    средства распределяются по очередям в памяти, а результат
+    записывается в БД позже. Возвращает созданный объект.
+    """
+    if allocation_ledger.is_running:
+        return await _create_and_allocate_in_ledger(
+            crud=crud, obj_in=obj_in, session=session, user_id=user_id
+        )
+    deferred = settings.allocation_mode == DEFERRED_ALLOCATION_MODE
+    db_obj = await _execute(
+        work=partial(
+            _create_and_allocate,
+            crud=crud,
+            obj_in=obj_in,
+            user_id=user_id,
+            deferred=deferred,
+        ),
+        session=session,
+    )
+    if deferred and deferred_allocator.is_running:
+        deferred_allocator.notify(bind=session.bind)
+    await invalidate_project_list(db_obj=db_obj)
+    return db_obj
+
+
+async def bulk_create_and_invest(
+    crud: BaseCRUD,
+    objs_in_data: List[Dict[str, Any]],
+    session: AsyncSession,
+) -> int:
+    """
+    Создаёт пачку пожертвований или проектов и распределяет средства
+    одной транзакцией. Объекты встают в очередь в порядке objs_in_data,
+    и очереди сводятся одним проходом, поэтому результат совпадает
+    с созданием объектов по одному. В отложенном режиме объекты только
+    сохраняются. Очереди в памяти режима ledger перечитываются из БД.
+    Возвращает распределённую сумму.
+    """
+    deferred = settings.allocation_mode == DEFERRED_ALLOCATION_MODE
+    async with allocation_ledger.exclusive():
+        invested_amount = await _execute(
+            work=partial(
+                _bulk_create_and_settle,
+                crud=crud,
+                objs_in_data=objs_in_data,
+                deferred=deferred,
+            ),
+            session=session,
+        )
+    if deferred and deferred_allocator.is_running:
+        deferred_allocator.notify(bind=session.bind, count=len(objs_in_data))
+    if invested_amount or crud.model is CharityProject:
+        await invalidate_project_list()
+    return invested_amount
 
 
 async def invest_open_donations_in_project(
@@ -14,12 +106,221 @@ async def invest_open_donations_in_project(
     Инвестирует открытые пожертвования в переданный проект.
     Возвращает обновлённый объект переданного проекта.
     """
-    donations = await _get_investable_objects_from_db(
+    project = await _invest_and_commit(db_obj=project, session=session)
+    return project
+
+
+async def invest_donation_in_open_projects(
+    donation: Donation, session: AsyncSession
+) -> Donation:
+    """
+    Инвестирует средства переданного пожертвования в открытые проекты.
+    Возвращает объект переданного пожертвования.
+    """
+    donation = await _invest_and_commit(db_obj=donation, session=session)
+    return donation
+
+
+async def allocate(
+    db_obj: Union[Donation, CharityProject], session: AsyncSession
+) -> Union[Donation, CharityProject]:
+    """
+    Распределяет средства пожертвования по открытым проектам или открытые
+    пожертвования в проект, не фиксируя транзакцию.
+    """
+    invested_amount = db_obj.invested_amount
+    if settings.investment_engine == SQL_INVESTMENT_ENGINE:
+        db_obj = await _invest_in_open_objects_set_based(
+            db_obj=db_obj,
+            model=(
+                CharityProject if isinstance(db_obj, Donation) else Donation
+            ),
+            session=session,
+        )
+    elif isinstance(db_obj, Donation):
+        db_obj = await _invest_donation_row_by_row(
+            donation=db_obj, session=session
+        )
+    else:
+        db_obj = await _invest_open_donations_row_by_row(
+            project=db_obj, session=session
+        )
+    db_obj.allocated = True
+    session.add(db_obj)
+    fund_balance_crud.add(
+        session, invested_amount=db_obj.invested_amount - invested_amount
+    )
+    return db_obj
+
+
+async def allocate_pending(session: AsyncSession) -> bool:
+    """
+    Отложенное распределение: распределяет все открытые пожертвования
+    по всем открытым проектам в порядке создания и отмечает ожидавшие
+    объекты распределёнными. Транзакцию не фиксирует.
+    Возвращает False, если распределять было нечего.
+    """
+    pending_ids = {}
+    for model in (Donation, CharityProject):
+        db_objs = await session.execute(
+            select(model.id).where(model.allocated.is_(False))
+        )
+        pending_ids[model] = db_objs.scalars().all()
+    if not any(pending_ids.values()):
+        return False
+    await _settle_open_objects(session=session)
+    for model, ids in pending_ids.items():
+        for start in range(0, len(ids), PENDING_IDS_CHUNK_SIZE):
+            await session.execute(
+                update(model)
+                .where(model.id.in_(ids[start:start + PENDING_IDS_CHUNK_SIZE]))
+                .values(allocated=True)
+                .execution_options(synchronize_session=False)
+            )
+    return True
+
+
+async def invalidate_project_list(
+    db_obj: Optional[Union[Donation, CharityProject]] = None,
+) -> None:
+    """
+    Сбрасывает кэш списка проектов после фиксации изменений. Без db_obj
+    сбрасывает всегда; пожертвование меняет проекты, только если
+    его средства были вложены.
+    """
+    if isinstance(db_obj, Donation) and db_obj.invested_amount == 0:
+        return
+    await project_list_cache.invalidate()
+
+
+async def _execute(work: Work, session: AsyncSession) -> Any:
+    """
+    Выполняет работу одной транзакцией: через очередь распределения,
+    если она запущена (SQLite), иначе в текущей сессии.
+    """
+    if allocation_queue.is_running:
+        return await allocation_queue.submit(work=work, bind=session.bind)
+    result = await work(session)
+    await session.commit()
+    return result
+
+
+async def _create_and_allocate_in_ledger(
+    crud: BaseCRUD,
+    obj_in: Union[DonationCreate, CharityProjectCreate],
+    session: AsyncSession,
+    user_id: Optional[int],
+) -> Union[Donation, CharityProject]:
+    """
+    Сохраняет объект с allocated=False и распределяет его средства
+    по очередям в памяти. Под блокировкой журнала объекты попадают
+    в очереди в том же порядке, что и в БД. Пока журнал неисправен,
+    объект только сохраняется: его распределит восстановление по БД.
+    """
+    async with allocation_ledger.lock:
+        db_obj = await _execute(
+            work=partial(
+                _create_and_allocate,
+                crud=crud,
+                obj_in=obj_in,
+                user_id=user_id,
+                deferred=True,
+            ),
+            session=session,
+        )
+        if db_obj in session:
+            # Результат распределения запишет журнал, а не эта сессия.
+            session.expunge(db_obj)
+        if allocation_ledger.is_healthy:
+            db_obj = allocation_ledger.allocate(db_obj)
+    await invalidate_project_list(db_obj=db_obj)
+    return db_obj
+
+
+async def _invest_and_commit(
+    db_obj: Union[Donation, CharityProject], session: AsyncSession
+) -> Union[Donation, CharityProject]:
+    """
+    Распределяет средства уже сохранённого объекта и фиксирует результат.
+    Вне очереди строка самого объекта блокируется, чтобы параллельное
+    распределение не перезаписало её.
+    """
+    if allocation_queue.is_running:
+        await allocation_queue.submit(
+            work=partial(
+                _load_and_allocate, model=type(db_obj), obj_id=db_obj.id
+            ),
+            bind=session.bind,
+        )
+    else:
+        await session.refresh(db_obj, with_for_update=True)
+        db_obj = await allocate(db_obj=db_obj, session=session)
+        await session.commit()
+    await session.refresh(db_obj)
+    await invalidate_project_list(db_obj=db_obj)
+    return db_obj
+
+
+async def _create_and_allocate(
+    session: AsyncSession,
+    crud: BaseCRUD,
+    obj_in: Union[DonationCreate, CharityProjectCreate],
+    user_id: Optional[int],
+    deferred: bool,
+) -> Union[Donation, CharityProject]:
+    db_obj = await crud.create(
+        obj_in=obj_in, session=session, user_id=user_id, commit=False
+    )
+    if not deferred:
+        db_obj = await allocate(db_obj=db_obj, session=session)
+    return db_obj
+
+
+async def _bulk_create_and_settle(
+    session: AsyncSession,
+    crud: BaseCRUD,
+    objs_in_data: List[Dict[str, Any]],
+    deferred: bool,
+) -> int:
+    await crud.create_many(
+        objs_in_data=[
+            dict(obj_in, allocated=not deferred) for obj_in in objs_in_data
+        ],
+        session=session,
+    )
+    if deferred:
+        return 0
+    return await _settle_open_objects(session=session)
+
+
+async def _load_and_allocate(
+    session: AsyncSession,
+    model: Union[Donation, CharityProject],
+    obj_id: int,
+) -> Union[Donation, CharityProject]:
+    db_obj = await session.get(model, obj_id, populate_existing=True)
+    db_obj = await allocate(db_obj=db_obj, session=session)
+    return db_obj
+
+
+async def _invest_open_donations_row_by_row(
+    project: CharityProject, session: AsyncSession
+) -> CharityProject:
+    """Построчно распределяет открытые пожертвования в проект."""
+    donations = await _stream_investable_objects_from_db(
         model=Donation, session=session
     )
     remaining_amount = _get_remaining_amount(db_obj=project)
-    for oldest_open_donation in donations:
+    allocations = []
+    async for oldest_open_donation in donations:
         unallocated_amount = _get_remaining_amount(db_obj=oldest_open_donation)
+        allocations.append(
+            dict(
+                donation_id=oldest_open_donation.id,
+                project_id=project.id,
+                amount=min(remaining_amount, unallocated_amount),
+            )
+        )
         (
             remaining_amount,
             unallocated_amount,
@@ -35,25 +336,29 @@ async def invest_open_donations_in_project(
         project = check_and_close_fully_invested_object(db_obj=project)
         if remaining_amount == 0:
             break
-    session.add(project)
-    await session.commit()
-    await session.refresh(project)
+    await donations.close()
+    await allocation_crud.record(allocations=allocations, session=session)
     return project
 
 
-async def invest_donation_in_open_projects(
+async def _invest_donation_row_by_row(
     donation: Donation, session: AsyncSession
 ) -> Donation:
-    """
-    Инвестирует средства переданного пожертвования в открытые проекты.
-    Возвращает объект переданного пожертвования.
-    """
-    projects = await _get_investable_objects_from_db(
+    """Построчно распределяет пожертвование по открытым проектам."""
+    projects = await _stream_investable_objects_from_db(
         model=CharityProject, session=session
     )
     unallocated_amount = _get_remaining_amount(db_obj=donation)
-    for oldest_open_project in projects:
+    allocations = []
+    async for oldest_open_project in projects:
         remaining_amount = _get_remaining_amount(db_obj=oldest_open_project)
+        allocations.append(
+            dict(
+                donation_id=donation.id,
+                project_id=oldest_open_project.id,
+                amount=min(remaining_amount, unallocated_amount),
+            )
+        )
         (
             remaining_amount,
             unallocated_amount,
@@ -68,39 +373,337 @@ async def invest_donation_in_open_projects(
         session.add(oldest_open_project)
         if unallocated_amount == 0:
             break
+    await projects.close()
+    await allocation_crud.record(allocations=allocations, session=session)
     donation = check_and_close_fully_invested_object(db_obj=donation)
-    session.add(donation)
-    await session.commit()
-    await session.refresh(donation)
     return donation
 
 
+async def _invest_in_open_objects_set_based(
+    db_obj: Union[Donation, CharityProject],
+    model: Union[Donation, CharityProject],
+    session: AsyncSession,
+) -> Union[Donation, CharityProject]:
+    """
+    Распределяет средства переданного объекта по открытым объектам model
+    множественными запросами: план распределения считается оконной
+    функцией в CTE, затем все затронутые объекты обновляются одним UPDATE.
+    Если СУБД поддерживает RETURNING, суммы по объектам возвращает
+    сам UPDATE, иначе план читается отдельным запросом. Суммы
+    записываются в журнал распределения.
+    """
+    plan = _get_investment_plan(
+        model=model, amount=_get_remaining_amount(db_obj=db_obj)
+    )
+    bulk_invest_stmt = _get_bulk_invest_stmt(model=model, plan=plan)
+    if session.bind.dialect.full_returning:
+        planned_amounts = await session.execute(
+            bulk_invest_stmt.returning(
+                model.id, _get_planned_amount(model=model, plan=plan)
+            )
+        )
+        planned_amounts = planned_amounts.all()
+    else:
+        planned_amounts = await session.execute(
+            select(plan.c.id, plan.c.amount)
+        )
+        planned_amounts = planned_amounts.all()
+        if planned_amounts:
+            await session.execute(bulk_invest_stmt)
+    await allocation_crud.record(
+        allocations=_get_allocations(
+            db_obj=db_obj, planned_amounts=planned_amounts
+        ),
+        session=session,
+    )
+    db_obj.invested_amount += sum(amount for _, amount in planned_amounts)
+    db_obj = check_and_close_fully_invested_object(db_obj=db_obj)
+    return db_obj
+
+
+async def _settle_open_objects(session: AsyncSession) -> int:
+    """
+    Сводит очереди открытых пожертвований и проектов выбранным
+    движком и учитывает распределённую сумму в сводке фонда.
+    """
+    if settings.investment_engine == SQL_INVESTMENT_ENGINE:
+        invested_amount = await _settle_open_objects_set_based(session=session)
+    else:
+        invested_amount = await _settle_open_objects_row_by_row(
+            session=session
+        )
+    fund_balance_crud.add(session, invested_amount=invested_amount)
+    return invested_amount
+
+
+async def _settle_open_objects_row_by_row(session: AsyncSession) -> int:
+    """
+    Построчное распределение по двум очередям: открытые пожертвования
+    по порядку закрывают открытые проекты, пока одна из очередей
+    не закончится. Возвращает распределённую сумму.
+    """
+    invested_amount = 0
+    allocations = []
+    donations = await _stream_investable_objects_from_db(
+        model=Donation, session=session
+    )
+    projects = await _stream_investable_objects_from_db(
+        model=CharityProject, session=session
+    )
+    donation = await _get_next_or_none(donations)
+    project = await _get_next_or_none(projects)
+    while donation is not None and project is not None:
+        amount = min(
+            _get_remaining_amount(db_obj=project),
+            _get_remaining_amount(db_obj=donation),
+        )
+        invested_amount += amount
+        allocations.append(
+            dict(donation_id=donation.id, project_id=project.id, amount=amount)
+        )
+        (
+            remaining_amount,
+            unallocated_amount,
+            project,
+            donation,
+        ) = _allocate_amounts(
+            _get_remaining_amount(db_obj=project),
+            _get_remaining_amount(db_obj=donation),
+            project,
+            donation,
+        )
+        for db_obj in (donation, project):
+            session.add(check_and_close_fully_invested_object(db_obj=db_obj))
+        if unallocated_amount == 0:
+            donation = await _get_next_or_none(donations)
+        if remaining_amount == 0:
+            project = await _get_next_or_none(projects)
+    await donations.close()
+    await projects.close()
+    await allocation_crud.record(allocations=allocations, session=session)
+    return invested_amount
+
+
+async def _settle_open_objects_set_based(session: AsyncSession) -> int:
+    """
+    Множественное распределение по двум очередям. Из обеих очередей
+    распределяется меньшая из сумм остатков, и каждая очередь
+    обновляется одним UPDATE по своему плану распределения. Пары
+    пожертвование — проект для журнала распределения получаются
+    сопоставлением прочитанных планов. Возвращает распределённую сумму.
+    """
+    totals = []
+    for model in (Donation, CharityProject):
+        open_objects = _select_open_objects(model=model).subquery()
+        total = await session.execute(
+            select(func.coalesce(func.sum(open_objects.c.remaining), 0))
+        )
+        totals.append(total.scalar_one())
+    amount = min(totals)
+    if amount == 0:
+        return amount
+    plans = []
+    for model in (Donation, CharityProject):
+        plan = _get_investment_plan(model=model, amount=amount)
+        planned_amounts = await session.execute(
+            select(plan.c.id, plan.c.preceding, plan.c.amount).order_by(
+                plan.c.preceding
+            )
+        )
+        plans.append(planned_amounts.all())
+        await session.execute(_get_bulk_invest_stmt(model=model, plan=plan))
+    await allocation_crud.record(
+        allocations=_match_plans(*plans), session=session
+    )
+    return amount
+
+
 def check_and_close_fully_invested_object(
-    db_obj: Union[Donation, CharityProject]
+    db_obj: Union[Donation, CharityProject],
 ) -> Union[Donation, CharityProject]:
     """
     Проверяет, что объект полностью инвестирован.
-    Если утверждение верно, то закрывает его.
+    Если утверждение верно, то закрывает его; у проекта
+    запоминается время сбора средств.
     """
     if db_obj.invested_amount == db_obj.full_amount:
         db_obj.fully_invested = True
         db_obj.close_date = datetime.now()
+        if isinstance(db_obj, CharityProject):
+            db_obj.completion_rate = _get_completion_rate(project=db_obj)
     return db_obj
 
 
-async def _get_investable_objects_from_db(
+def _get_completion_rate(project: CharityProject) -> int:
+    """
+    Время сбора средств проекта в секундах. Доли секунды отбрасываются
+    у обеих дат, как в seconds_between на SQLite.
+    """
+    close_date = project.close_date.replace(microsecond=0)
+    create_date = project.create_date.replace(microsecond=0)
+    return int((close_date - create_date).total_seconds())
+
+
+async def _stream_investable_objects_from_db(
     model: Union[Donation, CharityProject], session: AsyncSession
-) -> List[Union[Donation, CharityProject]]:
-    """Получение открытых к инвестированию объектов из БД."""
-    db_objs = await session.execute(
+) -> AsyncScalarResult:
+    """
+    Потоковое получение открытых к инвестированию объектов из БД.
+    Объекты подгружаются порциями, поэтому при досрочном выходе из цикла
+    остаток очереди из БД не читается. После обхода результат нужно закрыть.
+    Строки блокируются до конца транзакции; строки, уже заблокированные
+    параллельными транзакциями, пропускаются (SKIP LOCKED).
+    """
+    db_objs = await session.stream_scalars(
         select(model)
         .where(model.fully_invested.is_(False))
-        .order_by(model.create_date.asc())
+        .order_by(model.create_date.asc(), model.id.asc())
+        .with_for_update(skip_locked=True)
+        .execution_options(
+            yield_per=INVESTABLE_OBJECTS_BATCH_SIZE, populate_existing=True
+        )
     )
-    db_objs = db_objs.scalars().all()
     return db_objs
 
 
+def _get_investment_plan(
+    model: Union[Donation, CharityProject], amount: int
+) -> CTE:
+    """
+    План распределения суммы amount по открытым объектам model.
+    Для каждого объекта очереди вычисляется нарастающий итог остатков
+    предыдущих объектов (preceding); в план попадают только затрагиваемые
+    объекты.
+    """
+    open_objects = _select_open_objects(model=model).cte("open_objects")
+    running_total = func.sum(open_objects.c.remaining).over(
+        order_by=(open_objects.c.create_date, open_objects.c.id),
+        rows=(None, 0),
+    )
+    queue = select(
+        open_objects.c.id,
+        open_objects.c.remaining,
+        (running_total - open_objects.c.remaining).label("preceding"),
+    ).cte("queue")
+    unallocated = amount - queue.c.preceding
+    return (
+        select(
+            queue.c.id,
+            queue.c.preceding,
+            case(
+                (queue.c.remaining < unallocated, queue.c.remaining),
+                else_=unallocated,
+            ).label("amount"),
+        )
+        .where(queue.c.preceding < amount)
+        .cte("plan")
+    )
+
+
+def _select_open_objects(model: Union[Donation, CharityProject]) -> Select:
+    """
+    Открытые объекты model с остатками. Вся открытая очередь блокируется
+    (FOR UPDATE без SKIP LOCKED): множественное распределение по частично
+    заблокированной очереди нарушило бы FIFO.
+    """
+    return (
+        select(
+            model.id,
+            model.create_date,
+            (model.full_amount - model.invested_amount).label("remaining"),
+        )
+        .where(model.fully_invested.is_(False))
+        .with_for_update()
+    )
+
+
+def _get_planned_amount(
+    model: Union[Donation, CharityProject], plan: CTE
+) -> ScalarSelect:
+    """Сумма, которую план распределения отводит строке model."""
+    return select(plan.c.amount).where(plan.c.id == model.id).scalar_subquery()
+
+
+def _get_allocations(
+    db_obj: Union[Donation, CharityProject], planned_amounts: List[Row]
+) -> List[Dict[str, int]]:
+    """
+    Записи журнала распределения для сумм (id, amount), вложенных
+    между db_obj и объектами другой очереди.
+    """
+    if isinstance(db_obj, Donation):
+        return [
+            dict(donation_id=db_obj.id, project_id=obj_id, amount=amount)
+            for obj_id, amount in planned_amounts
+        ]
+    return [
+        dict(donation_id=obj_id, project_id=db_obj.id, amount=amount)
+        for obj_id, amount in planned_amounts
+    ]
+
+
+def _match_plans(
+    donation_plan: List[Row], project_plan: List[Row]
+) -> List[Dict[str, int]]:
+    """
+    Пары пожертвование — проект для двух планов распределения одной
+    суммы. Каждый объект плана занимает отрезок [preceding,
+    preceding + amount) этой суммы; паре достаётся пересечение
+    отрезков, как при сведении очередей по одному объекту.
+    """
+    allocations = []
+    donations, projects = iter(donation_plan), iter(project_plan)
+    donation, project = next(donations, None), next(projects, None)
+    while donation is not None and project is not None:
+        donation_end = donation.preceding + donation.amount
+        project_end = project.preceding + project.amount
+        start = max(donation.preceding, project.preceding)
+        allocations.append(
+            dict(
+                donation_id=donation.id,
+                project_id=project.id,
+                amount=min(donation_end, project_end) - start,
+            )
+        )
+        if donation_end <= project_end:
+            donation = next(donations, None)
+        if project_end <= donation_end:
+            project = next(projects, None)
+    return allocations
+
+
+def _get_bulk_invest_stmt(
+    model: Union[Donation, CharityProject], plan: CTE
+) -> Update:
+    """Один UPDATE для всех объектов из плана распределения."""
+    invested_amount = model.invested_amount + _get_planned_amount(
+        model=model, plan=plan
+    )
+    fully_invested = invested_amount == model.full_amount
+    close_date = datetime.now()
+    values = dict(
+        invested_amount=invested_amount,
+        fully_invested=fully_invested,
+        close_date=case((fully_invested, close_date), else_=model.close_date),
+    )
+    if model is CharityProject:
+        values["completion_rate"] = case(
+            (
+                fully_invested,
+                seconds_between(
+                    model.create_date, literal(close_date, DateTime)
+                ),
+            ),
+            else_=model.completion_rate,
+        )
+    return (
+        update(model)
+        .where(model.id.in_(select(plan.c.id)))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
 def _allocate_amounts(
     remaining_amount: int,
     unallocated_amount: int,
@@ -121,6 +724,16 @@ def _allocate_amounts(
     return remaining_amount, unallocated_amount, project, donation
 
 
+async def _get_next_or_none(
+    db_objs: AsyncScalarResult,
+) -> Optional[Union[Donation, CharityProject]]:
+    """Следующий объект из потока или None, если поток исчерпан."""
+    try:
+        return await db_objs.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
 def _get_remaining_amount(db_obj: Union[Donation, CharityProject]) -> int:
     """Возвращает разницу между полными и инвестированными средствами"""
     result = db_obj.full_amount - db_obj.invested_amount
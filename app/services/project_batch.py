@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import charity_project_crud
+from app.schemas.charity_project import (
+    CharityProjectBatchResult,
+    CharityProjectCreate,
+    CharityProjectDB,
+)
+from app.services.investment import bulk_create_and_invest
+
+PROJECT_BATCH_MAX_SIZE = 1000
+NAME_EXISTS_MSG = "Проект с таким именем уже существует!"
+NAME_REPEATED_MSG = "Имя проекта повторяется в пачке!"
+INVALID_ITEM_MSG = "Некорректные данные проекта: %s"
+
+
+async def create_projects_batch(
+    items: List[Any], session: AsyncSession
+) -> List[CharityProjectBatchResult]:
+    """
+    Создаёт пачку проектов. Каждый элемент проверяется отдельно:
+    некорректные элементы и проекты с занятыми или повторяющимися
+    в пачке именами не создаются, остальные создаются в порядке пачки,
+    и открытые пожертвования распределяются по ним одним проходом.
+    Занятые имена проверяются одним IN-запросом; если имя заняли
+    параллельно и вставка нарушила уникальность, имена проверяются
+    заново, и пачка создаётся без них. Возвращает результат
+    для каждого элемента пачки в её порядке.
+    """
+    objs_in: Dict[int, CharityProjectCreate] = {}
+    invalid: Dict[int, str] = {}
+    for number, item in enumerate(items):
+        try:
+            objs_in[number] = CharityProjectCreate.parse_obj(item)
+        except ValidationError as error:
+            invalid[number] = INVALID_ITEM_MSG % "; ".join(
+                f"{'.'.join(map(str, loc_error['loc']))}: {loc_error['msg']}"
+                for loc_error in error.errors()
+            )
+    existing_names = await charity_project_crud.get_existing_names(
+        names=[obj_in.name for obj_in in objs_in.values()], session=session
+    )
+    while True:
+        errors, new_names = _check_names(objs_in, existing_names)
+        if not new_names:
+            break
+        try:
+            await bulk_create_and_invest(
+                crud=charity_project_crud,
+                objs_in_data=[
+                    obj_in.dict()
+                    for number, obj_in in objs_in.items()
+                    if number not in errors
+                ],
+                session=session,
+            )
+            break
+        except IntegrityError:
+            await session.rollback()
+            taken_names = await charity_project_crud.get_existing_names(
+                names=new_names, session=session
+            )
+            if not taken_names:
+                raise
+            existing_names |= taken_names
+    projects = {}
+    if new_names:
+        projects = {
+            project.name: project
+            for project in await charity_project_crud.get_by_names(
+                names=new_names, session=session
+            )
+        }
+    errors.update(invalid)
+    return [
+        (
+            CharityProjectBatchResult(
+                name=_get_item_name(item), error=errors[number]
+            )
+            if number in errors
+            else CharityProjectBatchResult(
+                name=objs_in[number].name,
+                project=CharityProjectDB.from_orm(
+                    projects[objs_in[number].name]
+                ),
+            )
+        )
+        for number, item in enumerate(items)
+    ]
+
+
+def _check_names(
+    objs_in: Dict[int, CharityProjectCreate], existing_names: Set[str]
+) -> Tuple[Dict[int, str], Set[str]]:
+    """Ошибки занятых и повторяющихся имён и имена новых проектов."""
+    errors = {}
+    new_names = set()
+    for number, obj_in in objs_in.items():
+        if obj_in.name in existing_names:
+            errors[number] = NAME_EXISTS_MSG
+        elif obj_in.name in new_names:
+            errors[number] = NAME_REPEATED_MSG
+        else:
+            new_names.add(obj_in.name)
+    return errors, new_names
+
+
+def _get_item_name(item: Any) -> Optional[str]:
+    """Имя проекта из элемента пачки, если оно там есть."""
+    if isinstance(item, dict) and isinstance(item.get("name"), str):
+        return item["name"]
+    return None
@@ -0,0 +1,260 @@
+import asyncio
+import csv
+import os
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from datetime import datetime
+from functools import partial
+from typing import AsyncIterator, List
+
+from aiogoogle import Aiogoogle
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import charity_project_crud
+from app.services.google_api import (
+    FORMAT,
+    get_report_header,
+    get_report_row,
+    get_report_row_count,
+    set_user_permissions,
+    spreadsheets_create,
+    spreadsheets_resize,
+    spreadsheets_update_value,
+)
+
+GOOGLE_REPORT_BACKEND = "google"
+LOCAL_REPORT_BACKEND = "local"
+REPORT_BATCH_SIZE = 1000
+REPORT_FILES_URL = "/google/files/%s"
+
+Batches = AsyncIterator[List[Row]]
+
+
+class ReportSink(ABC):
+    """Получатель отчёта о скорости закрытия проектов."""
+
+    @abstractmethod
+    async def write(self, batches: Batches, limit: int) -> str:
+        """
+        Записывает отчёт из порций строк (name, description,
+        completion_rate), не больше limit строк. Возвращает ссылку.
+        """
+
+
+class GoogleSheetsSink(ReportSink):
+    """
+    Отчёт в Google Sheets. Независимые шаги выполняются одновременно:
+    чтение проектов — вместе с созданием документа на limit строк,
+    а выдача прав, запись данных и, если проектов меньше limit,
+    уменьшение листа — после него.
+    """
+
+    def __init__(self, wrapper_services: Aiogoogle) -> None:
+        self.wrapper_services = wrapper_services
+
+    async def write(self, batches: Batches, limit: int) -> str:
+        closed_projects, spreadsheet_id = await asyncio.gather(
+            _collect(batches),
+            spreadsheets_create(
+                self.wrapper_services, row_count=get_report_row_count(limit)
+            ),
+        )
+        steps = [
+            spreadsheets_update_value(
+                spreadsheet_id, closed_projects, self.wrapper_services
+            ),
+            set_user_permissions(spreadsheet_id, self.wrapper_services),
+        ]
+        if len(closed_projects) < limit:
+            steps.append(
+                spreadsheets_resize(
+                    spreadsheet_id,
+                    get_report_row_count(len(closed_projects)),
+                    self.wrapper_services,
+                )
+            )
+        report_spreadsheet_url, *_ = await asyncio.gather(*steps)
+        return report_spreadsheet_url
+
+
+class ReportFileWriter(ABC):
+    """Потоковая запись отчёта в файл."""
+
+    extension = ""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @abstractmethod
+    def write_rows(self, rows: List[Row]) -> None:
+        """Дописывает порцию строк."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Завершает файл."""
+
+
+class CsvReportWriter(ReportFileWriter):
+    extension = "csv"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerows(
+            get_report_header(datetime.now().strftime(FORMAT))
+        )
+
+    def write_rows(self, rows: List[Row]) -> None:
+        self._writer.writerows(get_report_row(*row) for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XlsxReportWriter(ReportFileWriter):
+    """Книга openpyxl в режиме write_only: строки не копятся в памяти."""
+
+    extension = "xlsx"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        from openpyxl import Workbook
+
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        for row in get_report_header(datetime.now().strftime(FORMAT)):
+            self._sheet.append(row)
+
+    def write_rows(self, rows: List[Row]) -> None:
+        for row in rows:
+            self._sheet.append(get_report_row(*row))
+
+    def close(self) -> None:
+        self._workbook.save(self.path)
+
+
+class ParquetReportWriter(ReportFileWriter):
+    """Таблица Parquet с типизированными столбцами, без шапки отчёта."""
+
+    extension = "parquet"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError(
+                "Для отчётов в Parquet установите пакет pyarrow."
+            )
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                ("name", pyarrow.string()),
+                ("description", pyarrow.string()),
+                ("completion_rate", pyarrow.int64()),
+            ]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write_rows(self, rows: List[Row]) -> None:
+        self._writer.write_table(
+            self._pyarrow.Table.from_pylist(
+                [dict(row._mapping) for row in rows], schema=self._schema
+            )
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+REPORT_FILE_WRITERS = {
+    writer.extension: writer
+    for writer in (CsvReportWriter, XlsxReportWriter, ParquetReportWriter)
+}
+
+
+class LocalFileSink(ReportSink):
+    """
+    Отчёт в локальном файле в формате report_format (csv, xlsx,
+    parquet). Порции строк записываются по мере чтения из БД
+    в отдельном потоке, поэтому память не зависит от размера отчёта.
+    """
+
+    def __init__(self, directory: str, report_format: str) -> None:
+        self.directory = directory
+        self.writer_class = REPORT_FILE_WRITERS[report_format]
+
+    async def write(self, batches: Batches, limit: int) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = (
+            f"report_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}."
+            f"{self.writer_class.extension}"
+        )
+        path = os.path.join(self.directory, file_name)
+        tmp_path = f"{path}.tmp"
+        loop = asyncio.get_running_loop()
+        try:
+            writer = await loop.run_in_executor(
+                None, partial(self.writer_class, tmp_path)
+            )
+            try:
+                async for batch in batches:
+                    await loop.run_in_executor(
+                        None, partial(writer.write_rows, batch)
+                    )
+            finally:
+                await loop.run_in_executor(None, writer.close)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Недописанный отчёт не должен оставаться в каталоге.
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        return REPORT_FILES_URL % file_name
+
+
+def create_report_sink(wrapper_services: Aiogoogle) -> ReportSink:
+    """Получатель отчёта по настройке report_backend."""
+    if settings.report_backend == LOCAL_REPORT_BACKEND:
+        return LocalFileSink(
+            directory=settings.report_dir,
+            report_format=settings.report_format,
+        )
+    return GoogleSheetsSink(wrapper_services=wrapper_services)
+
+
+def get_report_file_path(file_name: str) -> str:
+    """
+    Путь к готовому файлу отчёта или пустая строка, если такого файла
+    нет. Допускаются только имена файлов внутри report_dir.
+    """
+    if os.path.basename(file_name) != file_name or file_name.endswith(
+        ".tmp"
+    ):
+        return ""
+    path = os.path.join(settings.report_dir, file_name)
+    return path if os.path.isfile(path) else ""
+
+
+async def create_report(
+    session: AsyncSession, report_sink: ReportSink, limit: int
+) -> str:
+    """
+    Формирует отчёт: limit самых быстро закрытых проектов.
+    Возвращает ссылку на отчёт.
+    """
+    return await report_sink.write(
+        charity_project_crud.stream_projects_by_completion_rate(
+            session=session, limit=limit, batch_size=REPORT_BATCH_SIZE
+        ),
+        limit=limit,
+    )
+
+
+async def _collect(batches: Batches) -> List[Row]:
+    return [row async for batch in batches for row in batch]
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.schemas.report import ReportJob, ReportStatus
+
+REPORT_JOBS_MAX_COUNT = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class ReportJobs:
+    """
+    Фоновое формирование отчётов. start() запускает задачу и сразу
+    возвращает её описание; статус и ссылку на отчёт можно получить
+    по id. Одинаковые запросы (с одним ключом) в течение window секунд
+    получают уже запущенную или завершённую задачу вместо новой;
+    неудачные задачи не переиспользуются. Задачи хранятся в памяти
+    процесса, старые вытесняются сверх max_count.
+    """
+
+    def __init__(self, max_count: int = REPORT_JOBS_MAX_COUNT) -> None:
+        self.max_count = max_count
+        self._jobs: Dict[str, ReportJob] = OrderedDict()
+        self._by_key: Dict[Hashable, Tuple[str, float]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        return self._jobs.get(job_id)
+
+    def start(
+        self,
+        key: Hashable,
+        work: Callable[[], Awaitable[str]],
+        window: float,
+    ) -> ReportJob:
+        """
+        Запускает work() — формирование отчёта, возвращающее ссылку,
+        если за последние window секунд не было задачи с тем же ключом.
+        """
+        job_id, started = self._by_key.get(key, (None, 0))
+        job = self._jobs.get(job_id)
+        if (
+            job is not None and
+            job.status != ReportStatus.failed and
+            time.monotonic() - started < window
+        ):
+            return job
+        job = ReportJob(id=uuid.uuid4().hex, create_date=datetime.now())
+        self._jobs[job.id] = job
+        self._by_key[key] = (job.id, time.monotonic())
+        self._tasks[job.id] = asyncio.create_task(self._run(job, work))
+        self._evict()
+        return job
+
+    async def stop(self) -> None:
+        """Отменяет незавершённые задачи и забывает все задачи."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+        self._by_key.clear()
+
+    async def _run(
+        self, job: ReportJob, work: Callable[[], Awaitable[str]]
+    ) -> None:
+        try:
+            job.url = await work()
+            job.status = ReportStatus.done
+        except asyncio.CancelledError:
+            job.status = ReportStatus.failed
+            job.error = "Формирование отчёта прервано."
+            raise
+        except Exception as error:
+            logger.exception("Ошибка формирования отчёта")
+            job.status = ReportStatus.failed
+            job.error = str(error) or type(error).__name__
+        finally:
+            self._tasks.pop(job.id, None)
+
+    def _evict(self) -> None:
+        """Вытесняет самые старые завершённые задачи сверх max_count."""
+        if len(self._jobs) <= self.max_count:
+            return
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_count:
+                break
+            if job_id not in self._tasks:
+                del self._jobs[job_id]
+        self._by_key = {
+            key: value
+            for key, value in self._by_key.items()
+            if value[0] in self._jobs
+        }
+
+
+report_jobs = ReportJobs()
@@ -0,0 +1,77 @@
+import json
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.core.cache import CacheBackend, cache_backend
+from app.core.config import settings
+
+
+class CachedResponse(NamedTuple):
+    """Сериализованный ответ: тело и заголовки."""
+
+    body: bytes
+    headers: Dict[str, str]
+
+    def dumps(self) -> bytes:
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        headers, body = data.split(b"\n", 1)
+        return cls(body=body, headers=json.loads(headers))
+
+
+class ResponseCache:
+    """
+    Кэш сериализованных ответов эндпоинта. Ключи содержат номер версии
+    пространства имён: invalidate() увеличивает версию, и все прежние
+    ответы перестают находиться (а затем вытесняются по TTL или LRU)
+    сразу во всех процессах, использующих общее хранилище.
+    """
+
+    def __init__(
+        self, namespace: str, ttl_setting: str, backend: CacheBackend
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_setting = ttl_setting
+        self.backend = backend
+
+    @property
+    def ttl(self) -> int:
+        return getattr(settings, self.ttl_setting)
+
+    async def get(self, key: str) -> Tuple[str, Optional[CachedResponse]]:
+        """
+        Ключ с текущей версией и ответ из кэша (или None). Ответ нужно
+        сохранять под этим ключом: если во время запроса к БД кэш
+        инвалидируют, устаревший ответ попадёт в старую версию.
+        """
+        if not self.ttl:
+            return key, None
+        version = await self.backend.get(self._version_key)
+        versioned_key = f"{self.namespace}:{int(version or 0)}:{key}"
+        data = await self.backend.get(versioned_key)
+        if data is None:
+            return versioned_key, None
+        return versioned_key, CachedResponse.loads(data)
+
+    async def set(self, versioned_key: str, response: CachedResponse) -> None:
+        if self.ttl:
+            await self.backend.set(
+                versioned_key, response.dumps(), ttl=self.ttl
+            )
+
+    async def invalidate(self) -> None:
+        """Сбрасывает все ответы пространства имён."""
+        if self.ttl:
+            await self.backend.incr(self._version_key)
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+
+project_list_cache = ResponseCache(
+    namespace="charity_projects",
+    ttl_setting="project_list_cache_ttl",
+    backend=cache_backend,
+)
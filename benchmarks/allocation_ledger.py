@@ -0,0 +1,134 @@
+"""
+Бенчмарк задержки распределения средств в зависимости от размера таблиц.
+
+Заполняет временную БД SQLite закрытыми пожертвованиями и проектами
+и открытыми проектами, затем измеряет среднюю задержку create_and_invest
+для новых пожертвований:
+    python — распределение в запросе, построчно;
+    sql    — распределение в запросе, множественными запросами;
+    ledger — по очередям в памяти с записью в БД пачками.
+
+Запуск из корня проекта:
+    python -m benchmarks.allocation_ledger --rows 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.base import Base
+from app.core.config import settings
+from app.crud import donation_crud
+from app.models import CharityProject, Donation
+from app.schemas.donation import DonationCreate
+from app.services.allocation_ledger import allocation_ledger
+from app.services.investment import allocate_pending, create_and_invest
+
+INSERT_BATCH_SIZE = 50000
+OPEN_PROJECTS_COUNT = 100
+DONATIONS_COUNT = 500
+MODES = ("python", "sql", "ledger")
+
+
+def fill_tables(path: Path, rows: int) -> None:
+    """Закрытые пожертвования и проекты по rows штук и открытые проекты."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as connection:
+        for model in (Donation, CharityProject):
+            for offset in range(0, rows, INSERT_BATCH_SIZE):
+                connection.execute(
+                    model.__table__.insert(),
+                    [
+                        {
+                            "name": f"closed_{number}",
+                            "description": "Closed project",
+                            "comment": "Closed donation",
+                            "full_amount": 100,
+                            "invested_amount": 100,
+                            "fully_invested": True,
+                            "allocated": True,
+                            "create_date": start + timedelta(seconds=number),
+                            "close_date": start + timedelta(seconds=number),
+                        }
+                        for number in range(
+                            offset, min(offset + INSERT_BATCH_SIZE, rows)
+                        )
+                    ],
+                )
+        connection.execute(
+            CharityProject.__table__.insert(),
+            [
+                {
+                    "name": f"open_{number}",
+                    "description": "Open project",
+                    "full_amount": 10**6,
+                    "invested_amount": 0,
+                    "fully_invested": False,
+                    "allocated": True,
+                    "create_date": start + timedelta(seconds=rows + number),
+                }
+                for number in range(OPEN_PROJECTS_COUNT)
+            ],
+        )
+        connection.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+
+async def measure(path: Path, mode: str) -> float:
+    """Средняя задержка создания пожертвования в миллисекундах."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    if mode == "ledger":
+        await allocation_ledger.start(
+            bind=engine,
+            recover=allocate_pending,
+            interval_ms=settings.allocation_interval_ms,
+            batch_size=settings.allocation_batch_size,
+        )
+    else:
+        settings.investment_engine = mode
+    rnd = random.Random(0)
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        started = time.perf_counter()
+        for _ in range(DONATIONS_COUNT):
+            await create_and_invest(
+                crud=donation_crud,
+                obj_in=DonationCreate(full_amount=rnd.randint(1, 5000)),
+                session=session,
+            )
+        elapsed = time.perf_counter() - started
+    await allocation_ledger.stop()
+    await engine.dispose()
+    return elapsed / DONATIONS_COUNT * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--modes", nargs="+", default=list(MODES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.rows:
+            template = Path(tmp_dir) / f"template_{rows}.db"
+            fill_tables(template, rows)
+            print(f"Закрытых пожертвований и проектов: по {rows}")
+            for mode in args.modes:
+                path = Path(tmp_dir) / f"{mode}.db"
+                shutil.copy(template, path)
+                latency = asyncio.run(measure(path, mode))
+                print(f"    {mode}: {latency:.2f} мс на пожертвование")
+
+
+if __name__ == "__main__":
+    main()
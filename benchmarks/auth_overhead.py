@@ -0,0 +1,85 @@
+"""
+Бенчмарк накладных расходов аутентификации.
+
+Создаёт во временной БД SQLite пользователя, выпускает JWT и выполняет
+серию запросов GET /users/me (эндпоинт, который почти ничего не делает,
+кроме аутентификации) с выключенным и включённым кэшем пользователей.
+Печатает среднее время запроса и число SQL-запросов на запрос.
+
+Запуск из корня проекта:
+    python -m benchmarks.auth_overhead --requests 2000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.base import Base
+from app.core.config import settings
+from app.core.db import get_async_session
+from app.core.user import get_jwt_strategy
+from app.core.user_cache import user_cache
+from app.main import app
+from app.models import User
+
+
+async def run(path: Path, requests: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_maker = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_maker() as session:
+        user = User(email="bench@example.com", hashed_password="-")
+        session.add(user)
+        await session.commit()
+    token = await get_jwt_strategy().write_token(user)
+
+    async def override_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for name, ttl in (("Без кэша", 0), ("С кэшем", 30)):
+            settings.user_cache_ttl = ttl
+            user_cache.invalidate(user_id=user.id)
+            await client.get("/users/me", headers=headers)
+            statements.clear()
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/users/me", headers=headers)
+                response.raise_for_status()
+            elapsed = (time.perf_counter() - started) / requests
+            print(
+                f"{name}: {elapsed * 1000:.2f} мс на запрос, "
+                f"{len(statements) / requests:.1f} SQL-запросов на запрос"
+            )
+    app.dependency_overrides = {}
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(Path(tmp_dir) / "bench.db", args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Бенчмарк массового импорта пожертвований.
+
+Заполняет временную БД SQLite открытыми проектами и сравнивает
+пропускную способность (пожертвований в секунду):
+    single — create_and_invest для каждого пожертвования, как при
+             POST /donation/;
+    bulk   — разбор NDJSON и import_donations, как при
+             POST /donation/import.
+Каждый режим работает с новой копией БД; итоговое состояние проектов
+в обоих режимах сверяется.
+
+Запуск из корня проекта:
+    python -m benchmarks.donation_import --donations 5000 --engine sql
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.base import Base
+from app.core.config import settings
+from app.crud import donation_crud
+from app.models import CharityProject, User
+from app.schemas.donation import DonationCreate
+from app.schemas.export import ExportFormat
+from app.services.donation_import import import_donations, parse_donations
+from app.services.investment import create_and_invest
+
+PROJECTS_COUNT = 500
+USER_ID = 1
+
+
+def fill_projects(path: Path) -> None:
+    """Создаёт пользователя и открытые проекты."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = datetime(2020, 1, 1)
+    rnd = random.Random(0)
+    with engine.begin() as connection:
+        connection.execute(
+            User.__table__.insert(),
+            {
+                "id": USER_ID,
+                "email": "admin@example.com",
+                "hashed_password": "",
+                "is_active": True,
+                "is_superuser": True,
+                "is_verified": True,
+            },
+        )
+        connection.execute(
+            CharityProject.__table__.insert(),
+            [
+                {
+                    "name": f"project_{number}",
+                    "description": "Benchmark project",
+                    "full_amount": rnd.randint(1000, 50000),
+                    "invested_amount": 0,
+                    "fully_invested": False,
+                    "allocated": True,
+                    "create_date": start + timedelta(seconds=number),
+                }
+                for number in range(PROJECTS_COUNT)
+            ],
+        )
+    engine.dispose()
+
+
+def generate_ndjson(donations: int) -> bytes:
+    rnd = random.Random(1)
+    return "\n".join(
+        json.dumps(
+            {
+                "comment": f"Перевод {number}",
+                "full_amount": rnd.randint(1, 500),
+            }
+        )
+        for number in range(donations)
+    ).encode()
+
+
+async def run(path: Path, mode: str, data: bytes) -> list:
+    """Импортирует пожертвования и возвращает состояние проектов."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        donations = parse_donations(
+            data=data, import_format=ExportFormat.ndjson
+        )
+        started = time.perf_counter()
+        if mode == "single":
+            for donation in donations:
+                await create_and_invest(
+                    crud=donation_crud,
+                    obj_in=DonationCreate(
+                        **donation.dict(exclude={"user_id"})
+                    ),
+                    session=session,
+                    user_id=USER_ID,
+                )
+        else:
+            await import_donations(
+                donations=donations, user_id=USER_ID, session=session
+            )
+        elapsed = time.perf_counter() - started
+        projects = await session.execute(
+            select(
+                CharityProject.id,
+                CharityProject.invested_amount,
+                CharityProject.fully_invested,
+            ).order_by(CharityProject.id)
+        )
+        projects = projects.all()
+    await engine.dispose()
+    print(
+        f"{mode}: {elapsed:.2f} с, "
+        f"{len(donations) / elapsed:.0f} пожертвований в секунду"
+    )
+    return projects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--donations", type=int, default=5000)
+    parser.add_argument("--engine", choices=["python", "sql"], default="sql")
+    args = parser.parse_args()
+    settings.investment_engine = args.engine
+    data = generate_ndjson(args.donations)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template = Path(tmp_dir) / "template.db"
+        fill_projects(template)
+        print(
+            f"Проектов: {PROJECTS_COUNT}, пожертвований: {args.donations}, "
+            f"движок распределения: {args.engine}"
+        )
+        results = []
+        for mode in ("single", "bulk"):
+            path = Path(tmp_dir) / f"{mode}.db"
+            shutil.copy(template, path)
+            results.append(asyncio.run(run(path, mode, data)))
+        assert results[0] == results[1], "Состояние проектов различается"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Бенчмарк потоковой выгрузки пожертвований.
+
+Заполняет временную БД SQLite пожертвованиями и для каждого режима
+в отдельном процессе измеряет время до первого байта ответа, полное
+время и пиковое потребление памяти (RSS):
+    export-ndjson — GET /donation/export?format=ndjson,
+    export-csv    — GET /donation/export?format=csv,
+    list          — GET /donation/ (весь список в одном JSON-массиве).
+
+Запуск из корня проекта:
+    python -m benchmarks.export_stream --rows 1000000
+"""
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.core.base import Base
+from app.models import Donation
+
+INSERT_BATCH_SIZE = 50000
+URLS = {
+    "export-ndjson": "/donation/export?format=ndjson",
+    "export-csv": "/donation/export?format=csv",
+    "list": "/donation/",
+}
+
+
+def fill_donations(path: Path, rows: int) -> None:
+    """Заполняет таблицу пожертвований тестовыми данными."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = datetime(2020, 1, 1)
+    with engine.begin() as connection:
+        for offset in range(0, rows, INSERT_BATCH_SIZE):
+            connection.execute(
+                Donation.__table__.insert(),
+                [
+                    {
+                        "comment": f"Donation {number}",
+                        "full_amount": 100,
+                        "invested_amount": 100,
+                        "fully_invested": True,
+                        "create_date": start + timedelta(seconds=number),
+                        "close_date": start + timedelta(seconds=number),
+                        "user_id": 1,
+                    }
+                    for number in range(
+                        offset, min(offset + INSERT_BATCH_SIZE, rows)
+                    )
+                ],
+            )
+    engine.dispose()
+
+
+async def request(path: Path, url: str) -> None:
+    """Выполняет запрос к приложению напрямую через ASGI."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db import get_async_session
+    from app.core.user import current_superuser
+    from app.main import app
+    from app.models import User
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = sessionmaker(engine, class_=AsyncSession)
+
+    async def override_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    app.dependency_overrides[current_superuser] = lambda: User(
+        id=1, is_active=True, is_verified=True, is_superuser=True
+    )
+    url_path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url_path,
+        "raw_path": url_path.encode(),
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("test", 80),
+    }
+    first_byte = None
+    size = 0
+    request_sent = False
+    finished = asyncio.Event()
+
+    async def receive():
+        # После тела запроса клиент ждёт ответ, не отключаясь.
+        nonlocal request_sent
+        if request_sent:
+            await finished.wait()
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal first_byte, size
+        if message["type"] == "http.response.body" and message.get("body"):
+            if first_byte is None:
+                first_byte = time.perf_counter()
+            size += len(message["body"])
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - started
+    finished.set()
+    await engine.dispose()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"    до первого байта {(first_byte - started) * 1000:.0f} мс, "
+        f"всего {elapsed:.1f} с, "
+        f"{size / 2 ** 20:.0f} МБ, пиковый RSS {peak_rss:.0f} МБ"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--modes", nargs="+", default=list(URLS))
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        asyncio.run(request(Path(args.db), URLS[args.run]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "bench.db"
+        fill_donations(path, args.rows)
+        print(f"Строк в таблице donation: {args.rows}")
+        for mode in args.modes:
+            print(f"{mode}:")
+            # Отдельный процесс на режим, чтобы пиковый RSS
+            # не переходил от одного замера к другому.
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.export_stream",
+                    "--db", str(path), "--run", mode,
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Бенчмарк выборки открытых объектов для инвестирования.
+
+Заполняет временную БД SQLite большим количеством закрытых пожертвований
+и небольшим количеством открытых, затем сравнивает план запроса
+и время выполнения без индекса (fully_invested, create_date) и с ним.
+
+Запуск из корня проекта:
+    python -m benchmarks.investment_scan --rows 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+
+from app.core.base import Base
+from app.models import Donation
+
+INDEX_NAME = "ix_donation_fully_invested_create_date"
+OPEN_SHARE = 0.001
+REPEATS = 20
+
+
+def fill_donations(engine, rows: int) -> None:
+    """Заполняет таблицу пожертвований тестовыми данными."""
+    start = datetime(2020, 1, 1)
+    values = []
+    for number in range(rows):
+        is_open = random.random() < OPEN_SHARE
+        full_amount = random.randint(1, 10000)
+        values.append(
+            {
+                "create_date": start + timedelta(seconds=number),
+                "full_amount": full_amount,
+                "invested_amount": 0 if is_open else full_amount,
+                "fully_invested": not is_open,
+            }
+        )
+    with engine.begin() as connection:
+        connection.execute(Donation.__table__.insert(), values)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def measure(engine, stmt) -> None:
+    """Печатает план запроса и среднее время его выполнения."""
+    compiled = stmt.compile(
+        engine, compile_kwargs={"literal_binds": True}
+    )
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}"
+        ).all()
+        for row in plan:
+            print("   ", row[-1])
+        started = time.perf_counter()
+        for _ in range(REPEATS):
+            connection.execute(stmt).all()
+        elapsed = (time.perf_counter() - started) / REPEATS
+    print(f"    среднее время: {elapsed * 1000:.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{Path(tmp_dir) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        fill_donations(engine, args.rows)
+        stmt = (
+            select(Donation)
+            .where(Donation.fully_invested.is_(False))
+            .order_by(Donation.create_date.asc())
+        )
+        print(f"Строк в таблице donation: {args.rows}")
+
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP INDEX {INDEX_NAME}")
+        print("Без индекса:")
+        measure(engine, stmt)
+
+        with engine.begin() as connection:
+            index = next(
+                index
+                for index in Donation.__table__.indexes
+                if index.name == INDEX_NAME
+            )
+            index.create(connection)
+            connection.exec_driver_sql("ANALYZE")
+        print("С индексом:")
+        measure(engine, stmt)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
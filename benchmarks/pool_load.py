@@ -0,0 +1,135 @@
+"""
+Нагрузочный бенчмарк настроек движка БД.
+
+Запускает одновременно писателей (POST /donation/) и читателей
+(GET /charity_project/) против временной БД SQLite и сравнивает
+движок по умолчанию (NullPool, журнал отката) с настроенным
+(пул соединений, WAL, synchronous=NORMAL, busy_timeout, cache_size,
+mmap_size) из app.core.db.make_engine.
+
+Запуск из корня проекта:
+    python -m benchmarks.pool_load --seconds 10 --writers 4 --readers 4
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.base import Base
+from app.core.db import get_async_session, make_engine
+from app.core.user import current_user
+from app.main import app
+from app.models import CharityProject, User
+from app.services.allocation_queue import allocation_queue
+
+PROJECTS_COUNT = 100
+
+
+async def prepare(engine) -> None:
+    """Создаёт таблицы и открытые проекты."""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            CharityProject.__table__.insert(),
+            [
+                {
+                    "name": f"project_{number}",
+                    "description": "Benchmark project",
+                    "full_amount": 10 ** 9,
+                    "invested_amount": 0,
+                    "fully_invested": False,
+                    "allocated": True,
+                }
+                for number in range(PROJECTS_COUNT)
+            ],
+        )
+
+
+async def worker(client, method, url, deadline, latencies, errors, **kwargs):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+        except Exception:
+            errors.append(url)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(engine, args) -> None:
+    await prepare(engine)
+    session_maker = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    app.dependency_overrides[current_user] = lambda: User(
+        id=1, is_active=True, is_verified=True, is_superuser=True
+    )
+    # Как и при запуске приложения: запись в SQLite идёт через очередь.
+    allocation_queue.start()
+    reads, writes, errors = [], [], []
+    deadline = time.perf_counter() + args.seconds
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await asyncio.gather(
+            *[
+                worker(
+                    client, "POST", "/donation/", deadline, writes, errors,
+                    json={"full_amount": 100},
+                )
+                for _ in range(args.writers)
+            ],
+            *[
+                worker(
+                    client, "GET", "/charity_project/", deadline, reads, errors
+                )
+                for _ in range(args.readers)
+            ],
+        )
+    await allocation_queue.stop()
+    app.dependency_overrides = {}
+    await engine.dispose()
+    for name, latencies in (("чтение", reads), ("запись", writes)):
+        if not latencies:
+            print(f"    {name}: нет успешных запросов")
+            continue
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(
+            f"    {name}: {len(latencies) / args.seconds:.0f} запросов/с, "
+            f"медиана {statistics.median(latencies) * 1000:.1f} мс, "
+            f"p95 {p95 * 1000:.1f} мс"
+        )
+    print(f"    ошибок: {len(errors)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for name, factory in (
+        ("По умолчанию", create_async_engine),
+        ("С настройками", make_engine),
+    ):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+            print(f"{name}:")
+            asyncio.run(run(factory(url), args))
+
+
+if __name__ == "__main__":
+    main()
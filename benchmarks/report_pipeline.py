@@ -0,0 +1,130 @@
+"""
+Бенчмарк формирования отчёта в Google Sheets.
+
+Запускает локальный поддельный API Google (tests/fake_google.py)
+с задержкой ответа каждого метода, создаёт во временной БД SQLite
+закрытые проекты и формирует отчёт последовательно (создание таблицы,
+права, запись данных — как раньше) и по новому конвейеру, где
+независимые шаги выполняются одновременно. Печатает среднее время
+отчёта.
+
+Запуск из корня проекта:
+    python -m benchmarks.report_pipeline --latency 0.2 --reports 10
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.base import Base
+from app.core.config import settings
+from app.core.google_client import create_google_client
+from app.models import CharityProject
+from app.services.google_api import (
+    get_report_row_count,
+    set_user_permissions,
+    spreadsheets_create,
+    spreadsheets_update_value,
+)
+from app.services.report import GoogleSheetsSink, create_report
+from tests.fake_google import FakeGoogleServer, generate_private_key
+
+
+async def create_report_sequentially(session, wrapper_services, limit):
+    """Прежний порядок: все шаги один за другим."""
+    closed_projects = await session.execute(
+        select(
+            CharityProject.name,
+            CharityProject.description,
+            CharityProject.completion_rate,
+        )
+        .where(CharityProject.completion_rate.is_not(None))
+        .order_by(CharityProject.completion_rate, CharityProject.id)
+        .limit(limit)
+    )
+    closed_projects = closed_projects.all()
+    spreadsheet_id = await spreadsheets_create(
+        wrapper_services, row_count=get_report_row_count(len(closed_projects))
+    )
+    await set_user_permissions(spreadsheet_id, wrapper_services)
+    return await spreadsheets_update_value(
+        spreadsheet_id, closed_projects, wrapper_services
+    )
+
+
+async def run(
+    path: Path, server: FakeGoogleServer, projects: int, reports: int
+) -> None:
+    settings.type = "service_account"
+    settings.private_key = generate_private_key()
+    settings.client_email = "bench@fake.iam.gserviceaccount.com"
+    settings.token_uri = server.token_uri
+    settings.google_discovery_url = server.discovery_url
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    create_date = datetime(2020, 1, 1)
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            CharityProject(
+                name=f"project_{number}",
+                description="Closed project",
+                full_amount=100,
+                invested_amount=100,
+                fully_invested=True,
+                create_date=create_date,
+                close_date=create_date + timedelta(hours=number),
+                completion_rate=number * 3600,
+            )
+            for number in range(projects)
+        )
+        await session.commit()
+    google_client = create_google_client()
+    await google_client.start()
+
+    async def create_report_concurrently(session, wrapper_services, limit):
+        return await create_report(
+            session, GoogleSheetsSink(wrapper_services), limit
+        )
+
+    for name, pipeline in (
+        ("Последовательно", create_report_sequentially),
+        ("Одновременно", create_report_concurrently),
+    ):
+        async with AsyncSession(engine) as session:
+            # Прогрев: документы Discovery API и токен.
+            await pipeline(session, google_client, projects)
+            started = time.perf_counter()
+            for _ in range(reports):
+                await pipeline(session, google_client, projects)
+        elapsed = (time.perf_counter() - started) / reports
+        print(f"{name}: {elapsed * 1000:.0f} мс на отчёт")
+    await google_client.stop()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--reports", type=int, default=10)
+    args = parser.parse_args()
+    with FakeGoogleServer(latency=args.latency) as server:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            asyncio.run(
+                run(
+                    Path(tmp_dir) / "bench.db",
+                    server,
+                    args.projects,
+                    args.reports,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
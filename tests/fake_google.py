@@ -0,0 +1,229 @@
+"""
+Локальный сервер, изображающий API Google для тестов и бенчмарков
+без сети: документы Discovery API, выдачу токенов сервис-аккаунта
+и методы Sheets и Drive, которые использует отчёт. Сервер работает
+в отдельном потоке со своим циклом событий, поэтому доступен и из
+TestClient, и из приложения под нагрузкой.
+"""
+import asyncio
+import threading
+from collections import Counter
+from typing import List, Optional
+
+from aiohttp import web
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+TOKEN_EXPIRES_IN = 3600
+
+
+def generate_private_key() -> str:
+    """Ключ сервис-аккаунта в PEM: токен подписывается, но не проверяется."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def get_discovery_document(root_url: str, api: str) -> dict:
+    """Минимальные документы Discovery API для sheets v4 и drive v3."""
+    if api == 'sheets':
+        resources = {
+            'spreadsheets': {
+                'methods': {
+                    'create': {
+                        'httpMethod': 'POST',
+                        'path': 'v4/spreadsheets',
+                        'parameters': {},
+                        'request': {'$ref': 'Spreadsheet'},
+                    },
+                    'batchUpdate': {
+                        'httpMethod': 'POST',
+                        'path': 'v4/spreadsheets/{spreadsheetId}:batchUpdate',
+                        'parameters': {
+                            'spreadsheetId': {
+                                'type': 'string',
+                                'location': 'path',
+                                'required': True,
+                            },
+                        },
+                        'parameterOrder': ['spreadsheetId'],
+                        'request': {'$ref': 'BatchUpdateSpreadsheetRequest'},
+                    },
+                },
+                'resources': {
+                    'values': {
+                        'methods': {
+                            'batchUpdate': {
+                                'httpMethod': 'POST',
+                                'path': (
+                                    'v4/spreadsheets/{spreadsheetId}'
+                                    '/values:batchUpdate'
+                                ),
+                                'parameters': {
+                                    'spreadsheetId': {
+                                        'type': 'string',
+                                        'location': 'path',
+                                        'required': True,
+                                    },
+                                },
+                                'parameterOrder': ['spreadsheetId'],
+                                'request': {
+                                    '$ref': 'BatchUpdateValuesRequest'
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        }
+        service_path = ''
+    else:
+        resources = {
+            'permissions': {
+                'methods': {
+                    'create': {
+                        'httpMethod': 'POST',
+                        'path': 'files/{fileId}/permissions',
+                        'parameters': {
+                            'fileId': {
+                                'type': 'string',
+                                'location': 'path',
+                                'required': True,
+                            },
+                            'fields': {'type': 'string', 'location': 'query'},
+                        },
+                        'parameterOrder': ['fileId'],
+                        'request': {'$ref': 'Permission'},
+                    },
+                },
+            },
+        }
+        service_path = 'drive/v3/'
+    return {
+        'kind': 'discovery#restDescription',
+        'name': api,
+        'rootUrl': root_url,
+        'servicePath': service_path,
+        'batchPath': 'batch',
+        'parameters': {},
+        'schemas': {},
+        'resources': resources,
+    }
+
+
+class FakeGoogleServer:
+    """
+    Поддельный API Google. counts считает обращения к документам
+    Discovery API, выдаче токенов и методам API; requests хранит
+    тела запросов к методам API. latency — задержка ответа методов
+    API в секундах; statuses — коды ответов, которые будут отданы
+    следующим запросам к методам API (для проверки повторов), 200 —
+    обычный ответ.
+    """
+
+    def __init__(self, latency: float = 0) -> None:
+        self.latency = latency
+        self.statuses: List[int] = []
+        self.counts = Counter()
+        self.requests = []
+        self.url: Optional[str] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever)
+        self._runner: Optional[web.AppRunner] = None
+        self._spreadsheets_count = 0
+
+    @property
+    def discovery_url(self) -> str:
+        return self.url + 'discovery/{api}/{version}/rest'
+
+    @property
+    def token_uri(self) -> str:
+        return self.url + 'token'
+
+    def start(self) -> 'FakeGoogleServer':
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(
+            self._start(), self._loop
+        ).result()
+        return self
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(
+            self._runner.cleanup(), self._loop
+        ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> 'FakeGoogleServer':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_get('/discovery/{api}/{version}/rest', self._discovery)
+        app.router.add_post('/token', self._token)
+        app.router.add_post('/v4/spreadsheets', self._create_spreadsheet)
+        app.router.add_post(
+            '/v4/spreadsheets/{spreadsheet_id}/values:batchUpdate',
+            self._api_method,
+        )
+        app.router.add_post(
+            '/v4/spreadsheets/{spreadsheet_id}:batchUpdate', self._api_method
+        )
+        app.router.add_post(
+            '/drive/v3/files/{file_id}/permissions', self._api_method
+        )
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/'
+
+    async def _discovery(self, request: web.Request) -> web.Response:
+        self.counts['discovery'] += 1
+        return web.json_response(
+            get_discovery_document(self.url, request.match_info['api'])
+        )
+
+    async def _token(self, request: web.Request) -> web.Response:
+        self.counts['token'] += 1
+        return web.json_response({
+            'access_token': f'token_{self.counts["token"]}',
+            'expires_in': TOKEN_EXPIRES_IN,
+            'token_type': 'Bearer',
+        })
+
+    async def _handle(self, request: web.Request) -> Optional[web.Response]:
+        """Общая часть методов API: задержка, авторизация, сбои."""
+        self.counts['api'] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not request.headers.get('Authorization', '').startswith('Bearer '):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return web.json_response({'error': 'fake error'}, status=status)
+        self.requests.append((request.path, await request.json()))
+        return None
+
+    async def _create_spreadsheet(self, request: web.Request) -> web.Response:
+        error = await self._handle(request)
+        if error is not None:
+            return error
+        self._spreadsheets_count += 1
+        return web.json_response(
+            {'spreadsheetId': f'spreadsheet_{self._spreadsheets_count}'}
+        )
+
+    async def _api_method(self, request: web.Request) -> web.Response:
+        error = await self._handle(request)
+        if error is not None:
+            return error
+        return web.json_response({})
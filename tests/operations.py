@@ -0,0 +1,146 @@
+"""
+Общая часть тестов распределения средств: случайная последовательность
+созданий пожертвований и проектов, её выполнение разными путями
+и снимок состояния БД для сравнения движков и режимов распределения.
+Операция — кортеж (модель, сумма, id пользователя или None).
+"""
+import random
+
+from conftest import Base, TestingSessionLocal, engine
+from sqlalchemy import select
+
+from app.crud import charity_project_crud, donation_crud
+from app.models import Allocation, CharityProject, Donation
+from app.schemas.charity_project import CharityProjectCreate
+from app.schemas.donation import DonationCreate
+from app.services.investment import (
+    allocate_pending,
+    create_and_invest,
+    invest_donation_in_open_projects,
+    invest_open_donations_in_project,
+)
+
+OPERATIONS_COUNT = 40
+DEFERRED_BATCH_SIZE = 7
+
+
+def generate_operations(seed, count=OPERATIONS_COUNT, user_ids=()):
+    """
+    Случайные операции: около 60% пожертвований, остальное — проекты.
+    Автор пожертвования выбирается из user_ids, если они заданы.
+    """
+    rnd = random.Random(seed)
+    operations = []
+    for _ in range(count):
+        if rnd.random() < 0.6:
+            amount = rnd.randint(1, 1000)
+            user_id = rnd.choice(user_ids) if user_ids else None
+            operations.append((Donation, amount, user_id))
+        else:
+            operations.append((CharityProject, rnd.randint(1, 3000), None))
+    return operations
+
+
+async def reset_db(db_engine=engine):
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def get_project_create(number, amount):
+    return CharityProjectCreate(
+        name=f'project_{number}',
+        description='Random project',
+        full_amount=amount,
+    )
+
+
+async def run_operations(
+    operations, deferred=False, session_maker=TestingSessionLocal,
+):
+    """
+    Создаёт объекты через CRUD и распределяет средства функциями
+    invest_*. В отложенном режиме средства распределяет allocate_pending
+    каждые DEFERRED_BATCH_SIZE операций и в конце.
+    """
+    async with session_maker() as session:
+        for number, (model, amount, user_id) in enumerate(operations):
+            if model is Donation:
+                donation = await donation_crud.create(
+                    obj_in=DonationCreate(full_amount=amount),
+                    session=session,
+                    user_id=user_id,
+                )
+                if not deferred:
+                    await invest_donation_in_open_projects(donation, session)
+            else:
+                project = await charity_project_crud.create(
+                    obj_in=get_project_create(number, amount),
+                    session=session,
+                )
+                if not deferred:
+                    await invest_open_donations_in_project(project, session)
+            if deferred and (number + 1) % DEFERRED_BATCH_SIZE == 0:
+                await allocate_pending(session)
+                await session.commit()
+        if deferred:
+            await allocate_pending(session)
+            await session.commit()
+
+
+async def create_operations(
+    operations, session_maker=TestingSessionLocal, start=0,
+):
+    """
+    Создаёт объекты через create_and_invest, как эндпоинты.
+    start — номер первой операции в именах проектов.
+    Возвращает созданные объекты.
+    """
+    db_objs = []
+    async with session_maker() as session:
+        for number, (model, amount, user_id) in enumerate(
+            operations, start=start
+        ):
+            if model is Donation:
+                db_obj = await create_and_invest(
+                    crud=donation_crud,
+                    obj_in=DonationCreate(full_amount=amount),
+                    session=session,
+                    user_id=user_id,
+                )
+            else:
+                db_obj = await create_and_invest(
+                    crud=charity_project_crud,
+                    obj_in=get_project_create(number, amount),
+                    session=session,
+                )
+            db_objs.append(db_obj)
+    return db_objs
+
+
+async def take_snapshot(session_maker=TestingSessionLocal):
+    """Состояние пожертвований, проектов и журнала распределения."""
+    async with session_maker() as session:
+        snapshot = []
+        for model in (Donation, CharityProject):
+            db_objs = await session.execute(select(model).order_by(model.id))
+            snapshot += [
+                (
+                    model.__name__,
+                    db_obj.id,
+                    db_obj.invested_amount,
+                    db_obj.fully_invested,
+                    db_obj.close_date is not None,
+                    db_obj.allocated,
+                )
+                for db_obj in db_objs.scalars()
+            ]
+        journal = await session.execute(
+            select(
+                Allocation.donation_id,
+                Allocation.project_id,
+                Allocation.amount,
+            ).order_by(Allocation.donation_id, Allocation.project_id)
+        )
+        snapshot += [('Allocation', *row) for row in journal]
+    return snapshot
@@ -0,0 +1,157 @@
+import pytest
+from conftest import TestingSessionLocal
+from operations import generate_operations, reset_db, run_operations
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.crud import donation_crud
+from app.models import Allocation, CharityProject, Donation
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+    bulk_create_and_invest,
+)
+
+INVESTMENT_ENGINES = [PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE]
+
+
+async def run_and_get_journal(operations, deferred=False):
+    await reset_db()
+    await run_operations(operations, deferred=deferred)
+    return await get_journal()
+
+
+async def get_journal():
+    """Записи журнала; суммы по объектам сверяются с invested_amount."""
+    async with TestingSessionLocal() as session:
+        for model, column in (
+            (Donation, Allocation.donation_id),
+            (CharityProject, Allocation.project_id),
+        ):
+            allocated = (
+                select(func.coalesce(func.sum(Allocation.amount), 0))
+                .where(column == model.id)
+                .scalar_subquery()
+            )
+            mismatched = await session.execute(
+                select(model.id).where(model.invested_amount != allocated)
+            )
+            assert mismatched.scalars().all() == [], (
+                'Сумма записей журнала по объекту должна совпадать '
+                'с вложенными средствами объекта.'
+            )
+        journal = await session.execute(
+            select(
+                Allocation.donation_id,
+                Allocation.project_id,
+                Allocation.amount,
+            ).order_by(Allocation.donation_id, Allocation.project_id)
+        )
+        return journal.all()
+
+
+@pytest.mark.parametrize('deferred', [False, True])
+@pytest.mark.parametrize('investment_engine', INVESTMENT_ENGINES)
+@pytest.mark.parametrize('seed', range(3))
+async def test_journal_is_identical_for_all_engines(
+    seed, investment_engine, deferred, monkeypatch,
+):
+    operations = generate_operations(seed)
+    monkeypatch.setattr(settings, 'investment_engine', PYTHON_INVESTMENT_ENGINE)
+    expected = await run_and_get_journal(operations)
+    assert expected and all(amount > 0 for _, _, amount in expected), (
+        'Журнал должен содержать ненулевые суммы распределения.'
+    )
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    journal = await run_and_get_journal(operations, deferred=deferred)
+    assert journal == expected, (
+        'Журнал распределения не должен зависеть от движка и режима '
+        'распределения.'
+    )
+
+
+@pytest.mark.parametrize('investment_engine', INVESTMENT_ENGINES)
+async def test_bulk_create_writes_journal(investment_engine, monkeypatch):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    await reset_db()
+    await run_operations(
+        [(CharityProject, 500, None), (CharityProject, 300, None)]
+    )
+    async with TestingSessionLocal() as session:
+        await bulk_create_and_invest(
+            crud=donation_crud,
+            objs_in_data=[
+                {'comment': None, 'full_amount': amount}
+                for amount in (200, 400, 100)
+            ],
+            session=session,
+        )
+    expected = [(1, 1, 200), (2, 1, 300), (2, 2, 100), (3, 2, 100)]
+    assert await get_journal() == expected, (
+        'Массовое создание должно записывать пары пожертвование — проект '
+        'в порядке очереди.'
+    )
+
+
+def test_get_donation_allocations(user_client, charity_project):
+    response = user_client.post('/donation/', json={'full_amount': 100})
+    donation_id = response.json()['id']
+    response = user_client.get(f'/donation/{donation_id}/allocations')
+    assert response.status_code == 200, (
+        'GET-запрос автора к `/donation/{donation_id}/allocations` должен '
+        'вернуть статус-код 200.'
+    )
+    data = response.json()
+    assert [
+        {key: value for key, value in item.items() if key != 'create_date'}
+        for item in data
+    ] == [{
+        'donation_id': donation_id,
+        'project_id': charity_project.id,
+        'amount': 100,
+    }], 'Ответ должен содержать проект и вложенную в него сумму.'
+    assert 'create_date' in data[0]
+
+
+def test_get_donation_allocations_of_another_user(
+    user_client, another_donation,
+):
+    response = user_client.get(f'/donation/{another_donation.id}/allocations')
+    assert response.status_code == 403, (
+        'Нельзя смотреть распределение чужого пожертвования.'
+    )
+    response = user_client.get('/donation/100/allocations')
+    assert response.status_code == 404
+
+
+def test_get_charity_project_allocations(superuser_client, donation):
+    response = superuser_client.post('/charity_project/', json={
+        'name': 'Funded project',
+        'description': 'Who funded it',
+        'full_amount': 50,
+    })
+    project_id = response.json()['id']
+    response = superuser_client.get(f'/charity_project/{project_id}/allocations')
+    assert response.status_code == 200, (
+        'GET-запрос суперюзера к `/charity_project/{project_id}/allocations` '
+        'должен вернуть статус-код 200.'
+    )
+    assert [
+        (item['donation_id'], item['project_id'], item['amount'])
+        for item in response.json()
+    ] == [(donation.id, project_id, 50)], (
+        'Ответ должен содержать пожертвования, вложенные в проект.'
+    )
+    response = superuser_client.get('/charity_project/100/allocations')
+    assert response.status_code == 404
+
+
+def test_get_charity_project_allocations_requires_superuser(
+    user_client, charity_project,
+):
+    response = user_client.get(
+        f'/charity_project/{charity_project.id}/allocations'
+    )
+    assert response.status_code == 401, (
+        'Журнал распределения проекта доступен только суперюзерам.'
+    )
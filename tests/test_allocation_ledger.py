@@ -0,0 +1,260 @@
+import pytest
+from conftest import (
+    TEST_DB, TestingSessionLocal, app, current_superuser, current_user,
+    engine, get_async_session, override_db,
+)
+from fastapi.testclient import TestClient
+from fixtures.user import superuser, user
+from operations import (
+    create_operations, generate_operations, reset_db, take_snapshot,
+)
+from sqlalchemy import create_engine, select, update
+
+from app.core.config import settings
+from app.crud import donation_crud
+from app.models import CharityProject, Donation
+from app.services.allocation_ledger import AllocationLedger
+from app.services.fund_balance import reconcile_fund_balance
+from app.services.investment import (
+    LEDGER_ALLOCATION_MODE,
+    allocate_pending,
+    bulk_create_and_invest,
+)
+
+OPERATIONS_COUNT = 60
+
+
+async def start_ledger(monkeypatch, batch_size=7):
+    """Журнал на тестовой БД; фоновая запись — только по размеру пачки."""
+    ledger = AllocationLedger()
+    monkeypatch.setattr('app.services.investment.allocation_ledger', ledger)
+    await ledger.start(
+        bind=engine,
+        recover=allocate_pending,
+        interval_ms=60000,
+        batch_size=batch_size,
+    )
+    return ledger
+
+
+def crash(ledger):
+    """Останавливает журнал без записи накопленных изменений, как при сбое."""
+    ledger._worker.cancel()
+    ledger._worker = None
+
+
+async def fail_db(session, **kwargs):
+    raise OSError('БД недоступна')
+
+
+def break_db(ledger):
+    """Запись пачки и восстановление очередей падают, как при отказе БД."""
+    ledger._write = fail_db
+    ledger._recover = fail_db
+
+
+def repair_db(ledger):
+    del ledger._write
+    ledger._recover = allocate_pending
+
+
+async def run_operations(operations, start=0):
+    db_objs = await create_operations(operations, start=start)
+    assert all(db_obj.allocated for db_obj in db_objs), (
+        'Средства объекта должны распределяться сразу при создании.'
+    )
+
+
+async def check_snapshot():
+    snapshot = await take_snapshot()
+    async with TestingSessionLocal() as session:
+        drift = await reconcile_fund_balance(session=session)
+    assert drift == {}, 'Журнал должен учитывать вложенное в сводке фонда.'
+    return snapshot
+
+
+async def get_expected(operations):
+    await reset_db()
+    await run_operations(operations)
+    return await check_snapshot()
+
+
+@pytest.mark.parametrize('seed', range(5))
+async def test_ledger_gives_identical_results(seed, monkeypatch):
+    operations = generate_operations(seed, OPERATIONS_COUNT)
+    expected = await get_expected(operations)
+    await reset_db()
+    ledger = await start_ledger(monkeypatch)
+    await run_operations(operations)
+    assert await ledger.check() == [], (
+        'Очереди в памяти должны совпадать с БД после записи.'
+    )
+    await ledger.stop()
+    assert await check_snapshot() == expected, (
+        'Распределение по очередям в памяти должно приводить к тому же '
+        'состоянию БД, что и распределение в запросе.'
+    )
+
+
+async def test_ledger_recovers_after_crash(monkeypatch):
+    operations = generate_operations(0, OPERATIONS_COUNT)
+    expected = await get_expected(operations)
+    await reset_db()
+    ledger = await start_ledger(monkeypatch, batch_size=10 ** 6)
+    await run_operations(operations[:40])
+    crash(ledger)
+    async with TestingSessionLocal() as session:
+        pending = await session.execute(
+            select(Donation.id).where(Donation.allocated.is_(False))
+        )
+        assert pending.scalars().all(), (
+            'До записи журнала новые объекты хранятся с allocated=False.'
+        )
+    ledger = await start_ledger(monkeypatch)
+    assert await ledger.check() == [], (
+        'После сбоя очереди должны восстанавливаться по БД.'
+    )
+    await run_operations(operations[40:], start=40)
+    await ledger.stop()
+    assert await check_snapshot() == expected, (
+        'После восстановления результат должен совпадать с распределением '
+        'без сбоя.'
+    )
+
+
+async def test_ledger_keeps_batch_while_db_fails(monkeypatch):
+    operations = generate_operations(1, OPERATIONS_COUNT)
+    expected = await get_expected(operations)
+    await reset_db()
+    ledger = await start_ledger(monkeypatch, batch_size=10 ** 6)
+    commits = []
+
+    async def on_commit():
+        commits.append(True)
+
+    ledger._on_commit = on_commit
+    await run_operations(operations[:30])
+    pending_count = ledger.pending_count
+    break_db(ledger)
+    await ledger.flush()
+    assert not ledger.is_healthy, (
+        'После неудачной записи и восстановления журнал неисправен.'
+    )
+    assert ledger.pending_count == pending_count, (
+        'Незаписанная пачка должна оставаться в памяти.'
+    )
+    assert commits == [], 'Неудачная запись не должна считаться фиксацией.'
+    with pytest.raises(RuntimeError):
+        async with ledger.exclusive():
+            pass
+    db_objs = await create_operations(operations[30:], start=30)
+    assert not any(db_obj.allocated for db_obj in db_objs), (
+        'Пока журнал неисправен, новые объекты только сохраняются в БД.'
+    )
+    repair_db(ledger)
+    await ledger.flush()
+    assert ledger.is_healthy and ledger.pending_count == 0
+    assert commits == [True]
+    assert await ledger.check() == []
+    await ledger.stop()
+    assert await check_snapshot() == expected, (
+        'Сохранённая пачка и восстановление по БД не должны приводить '
+        'к повторному распределению.'
+    )
+
+
+async def test_ledger_stop_logs_unwritten_batch(monkeypatch, caplog):
+    operations = generate_operations(2, OPERATIONS_COUNT)
+    expected = await get_expected(operations)
+    await reset_db()
+    ledger = await start_ledger(monkeypatch, batch_size=10 ** 6)
+    await run_operations(operations)
+    break_db(ledger)
+    await ledger.stop()
+    assert 'Не записаны изменения очередей распределения' in caplog.text, (
+        'Остановка журнала с незаписанными изменениями должна '
+        'попадать в лог.'
+    )
+    ledger = await start_ledger(monkeypatch)
+    await ledger.stop()
+    assert await check_snapshot() == expected, (
+        'Незаписанные изменения должны восстанавливаться по БД '
+        'при следующем запуске.'
+    )
+
+
+async def test_ledger_bulk_create_reloads_queues(monkeypatch):
+    ledger = await start_ledger(monkeypatch)
+    operations = [(CharityProject, 500, None), (Donation, 100, None)]
+    await run_operations(operations)
+    async with TestingSessionLocal() as session:
+        invested_amount = await bulk_create_and_invest(
+            crud=donation_crud,
+            objs_in_data=[{'comment': None, 'full_amount': 300}] * 2,
+            session=session,
+        )
+    assert invested_amount == 400
+    assert await ledger.check() == [], (
+        'После массового создания очереди должны перечитываться из БД.'
+    )
+    assert [entry.remaining for entry in ledger.queues[Donation]] == [200]
+    await ledger.stop()
+
+
+async def test_ledger_check_detects_drift(monkeypatch):
+    ledger = await start_ledger(monkeypatch)
+    await run_operations([(CharityProject, 500, None), (Donation, 100, None)])
+    await ledger.flush()
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(CharityProject).values(invested_amount=50)
+        )
+        await session.commit()
+    assert await ledger.check() == [
+        'charityproject 1: остаток в памяти 400, в БД 450',
+    ], 'Проверка должна находить расхождения очередей с БД.'
+    await ledger.stop()
+
+
+@pytest.fixture
+def ledger_app(monkeypatch):
+    monkeypatch.setattr(settings, 'allocation_mode', LEDGER_ALLOCATION_MODE)
+    monkeypatch.setattr('app.main.engine', engine)
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_user] = lambda: user
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    return app
+
+
+def test_ledger_endpoints(ledger_app):
+    with TestClient(ledger_app) as client:
+        response = client.post('/charity_project/', json={
+            'name': 'Ledger project',
+            'description': 'Ledger allocation',
+            'full_amount': 100,
+        })
+        assert response.status_code == 200
+        response = client.post('/donation/', json={'full_amount': 60})
+        assert response.status_code == 200
+        response = client.patch('/charity_project/1', json={'full_amount': 70})
+        assert response.json()['invested_amount'] == 60, (
+            'Перед правкой проекта журнал должен записать распределение в БД.'
+        )
+        response = client.post('/donation/', json={'full_amount': 40})
+        assert response.status_code == 200
+    sync_engine = create_engine(f'sqlite:///{str(TEST_DB)}')
+    with sync_engine.connect() as connection:
+        donations = connection.execute(
+            select(Donation.invested_amount, Donation.allocated)
+            .order_by(Donation.id)
+        ).all()
+        project = connection.execute(
+            select(CharityProject.invested_amount, CharityProject.fully_invested)
+        ).one()
+    sync_engine.dispose()
+    assert donations == [(60, True), (10, True)], (
+        'После правки проекта очереди в памяти должны учитывать новую сумму, '
+        'а при остановке приложения журнал должен записать изменения в БД.'
+    )
+    assert tuple(project) == (70, True)
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+from conftest import TestingSessionLocal
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.crud import charity_project_crud, donation_crud
+from app.schemas.donation import DonationCreate
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE, create_and_invest,
+)
+
+DAY = 24 * 60 * 60
+
+
+@pytest.mark.parametrize(
+    'investment_engine', [PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE]
+)
+async def test_completion_rate_set_on_close(
+    freezer, mixer, monkeypatch, investment_engine
+):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    freezer.move_to('2020-01-01')
+    for name in ('slow', 'fast', 'open'):
+        mixer.blend(
+            'app.models.charity_project.CharityProject',
+            name=name,
+            description=name,
+            full_amount=100,
+            invested_amount=0,
+            fully_invested=False,
+            allocated=True,
+            create_date=datetime.now(),
+        )
+    async with TestingSessionLocal() as session:
+        freezer.move_to('2020-01-03')
+        await create_and_invest(
+            crud=donation_crud,
+            obj_in=DonationCreate(full_amount=150),
+            session=session,
+        )
+        freezer.move_to('2020-01-06')
+        await create_and_invest(
+            crud=donation_crud,
+            obj_in=DonationCreate(full_amount=50),
+            session=session,
+        )
+        closed_projects = await charity_project_crud.get_projects_by_completion_rate(
+            session=session
+        )
+        closed_projects = [
+            (project.name, completion_rate)
+            for project, completion_rate in closed_projects
+        ]
+        assert closed_projects == [('slow', 2 * DAY), ('fast', 5 * DAY)], (
+            'Время сбора средств должно сохраняться при закрытии проекта; '
+            'незакрытые проекты в отчёт не попадают.'
+        )
+        closed_projects = await charity_project_crud.get_projects_by_completion_rate(
+            session=session, limit=1
+        )
+        assert [project.name for project, _ in closed_projects] == ['slow'], (
+            'Отчёт должен ограничиваться переданным количеством проектов.'
+        )
+
+
+async def test_completion_rate_report_uses_index():
+    async with TestingSessionLocal() as session:
+        plan = await session.execute(
+            text(
+                'EXPLAIN QUERY PLAN SELECT id FROM charityproject '
+                'WHERE completion_rate IS NOT NULL '
+                'ORDER BY completion_rate, id LIMIT 10'
+            )
+        )
+        plan = ' '.join(row[-1] for row in plan)
+    assert 'ix_charityproject_completion_rate' in plan, (
+        'Отчёт по скорости закрытия должен читать проекты по индексу.'
+    )
+    assert 'TEMP B-TREE' not in plan.split('USING')[0], (
+        'Отчёт не должен сортировать проекты во временной таблице.'
+    )
@@ -0,0 +1,91 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import (
+    TEST_DB, app, current_superuser, current_user, get_async_session,
+    override_db,
+)
+from fastapi.testclient import TestClient
+from fixtures.user import superuser
+from sqlalchemy import create_engine, func, select
+
+from app.models import CharityProject, Donation, FundBalance
+
+DONATIONS_COUNT = 2000
+PROJECTS_COUNT = 40
+WORKERS_COUNT = 64
+
+
+def post(client, url, json):
+    response = client.post(url, json=json)
+    assert response.status_code == 200, (
+        'При параллельных запросах создание объекта должно завершаться успешно.'
+    )
+
+
+def test_concurrent_donations_keep_invariants():
+    """Тысячи одновременных пожертвований не должны переполнять проекты."""
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_user] = lambda: superuser
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    rnd = random.Random(0)
+    requests = [
+        ('/donation/', {'full_amount': rnd.randint(1, 500)})
+        for _ in range(DONATIONS_COUNT)
+    ] + [
+        ('/charity_project/', {
+            'name': f'project_{number}',
+            'description': 'Concurrent project',
+            'full_amount': rnd.randint(1000, 20000),
+        })
+        for number in range(PROJECTS_COUNT)
+    ]
+    rnd.shuffle(requests)
+    with TestClient(app) as client:
+        with ThreadPoolExecutor(max_workers=WORKERS_COUNT) as executor:
+            list(executor.map(lambda request: post(client, *request), requests))
+
+    engine = create_engine(f'sqlite:///{str(TEST_DB)}')
+    with engine.connect() as connection:
+        for model in (Donation, CharityProject):
+            overfunded = connection.execute(
+                select(func.count()).where(
+                    model.invested_amount > model.full_amount
+                )
+            ).scalar_one()
+            assert overfunded == 0, test_concurrent_donations_keep_invariants.__doc__
+            wrong_status = connection.execute(
+                select(func.count()).where(
+                    model.fully_invested.is_(True)
+                    != (model.invested_amount == model.full_amount)
+                )
+            ).scalar_one()
+            assert wrong_status == 0, (
+                'Объект закрыт тогда и только тогда, когда полностью инвестирован.'
+            )
+        invested_in_projects = connection.execute(
+            select(func.sum(CharityProject.invested_amount))
+        ).scalar_one()
+        invested_from_donations = connection.execute(
+            select(func.sum(Donation.invested_amount))
+        ).scalar_one()
+        open_donations = connection.execute(
+            select(func.count()).where(Donation.fully_invested.is_(False))
+        ).scalar_one()
+        open_projects = connection.execute(
+            select(func.count()).where(CharityProject.fully_invested.is_(False))
+        ).scalar_one()
+        fund_balance = connection.execute(select(FundBalance)).one()
+    engine.dispose()
+    assert fund_balance.invested_amount == invested_from_donations, (
+        'Сводка фонда должна совпадать с таблицами при параллельных запросах.'
+    )
+    assert invested_in_projects == invested_from_donations, (
+        'Сумма, вложенная в проекты, должна совпадать с суммой, '
+        'распределённой из пожертвований.'
+    )
+    assert not (open_donations and open_projects), (
+        'Не должно одновременно оставаться открытых пожертвований '
+        'и открытых проектов.'
+    )
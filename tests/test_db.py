@@ -1,4 +1,14 @@
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
 from conftest import BASE_DIR
+from pydantic import ValidationError
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import make_engine
 
 
 try:
@@ -50,3 +60,59 @@ def test_check_db_url():
             assert 'sqlite+aiosqlite' in attr_value['default'], (
                 'Укажите значение по умолчанию для подключения базы данных sqlite '
             )
+
+
+@pytest.mark.parametrize('field, value', [
+    ('investment_engine', 'fast'),
+    ('allocation_mode', 'lazy'),
+    ('report_backend', 'excel'),
+    ('report_format', 'txt'),
+])
+def test_settings_reject_unknown_choices(field, value):
+    with pytest.raises(ValidationError):
+        Settings(_env_file=None, **{field: value})
+
+
+async def test_sqlite_connection_pragmas(tmp_path):
+    engine = make_engine(f'sqlite+aiosqlite:///{tmp_path / "pragmas.db"}')
+    try:
+        async with engine.connect() as connection:
+            pragmas = {
+                pragma: (
+                    await connection.execute(text(f'PRAGMA {pragma}'))
+                ).scalar()
+                for pragma in ('journal_mode', 'busy_timeout', 'synchronous')
+            }
+    finally:
+        await engine.dispose()
+    assert pragmas == {
+        'journal_mode': settings.sqlite_journal_mode.lower(),
+        'busy_timeout': settings.sqlite_busy_timeout_ms,
+        'synchronous': 1,
+    }, (
+        'Соединения движка SQLite должны настраиваться PRAGMA из настроек: '
+        'WAL, busy_timeout и synchronous = NORMAL.'
+    )
+
+
+def test_migrated_allocated_has_no_server_default(tmp_path, monkeypatch):
+    database = tmp_path / 'migrated.db'
+    monkeypatch.chdir(BASE_DIR)
+    monkeypatch.setenv('DATABASE_URL', f'sqlite+aiosqlite:///{database}')
+    command.upgrade(Config(str(BASE_DIR / 'alembic.ini')), 'head')
+    connection = sqlite3.connect(database)
+    try:
+        defaults = [
+            connection.execute(
+                'SELECT dflt_value FROM pragma_table_info(?) '
+                'WHERE name = \'allocated\'',
+                (table_name,),
+            ).fetchone()
+            for table_name in ('charityproject', 'donation')
+        ]
+    finally:
+        connection.close()
+    assert defaults == [(None,), (None,)], (
+        'После миграции у столбца allocated не должно быть значения '
+        'по умолчанию в БД: в модели по умолчанию False.'
+    )
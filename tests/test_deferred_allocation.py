@@ -0,0 +1,125 @@
+import time
+
+import pytest
+from conftest import (
+    TestingSessionLocal, app, current_superuser, current_user, engine,
+    get_async_session, override_db,
+)
+from fastapi.testclient import TestClient
+from fixtures.user import superuser, user
+
+from app.core.config import settings
+from app.crud import donation_crud
+from app.schemas.donation import DonationCreate
+from app.services.deferred_allocation import DeferredAllocator
+from app.services.investment import (
+    DEFERRED_ALLOCATION_MODE,
+    allocate_pending,
+    create_and_invest,
+)
+
+POLL_TIMEOUT = 5
+
+
+@pytest.fixture
+def deferred_client(monkeypatch):
+    monkeypatch.setattr(settings, 'allocation_mode', DEFERRED_ALLOCATION_MODE)
+    monkeypatch.setattr(settings, 'allocation_interval_ms', 20)
+    # Фоновая задача должна работать с тестовой БД с первого прохода.
+    monkeypatch.setattr('app.main.engine', engine)
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_user] = lambda: user
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for_allocation(client, url):
+    deadline = time.monotonic() + POLL_TIMEOUT
+    while time.monotonic() < deadline:
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'GET-запрос к эндпоинту `{url}` должен вернуть статус-код 200.'
+        )
+        if response.json()['allocated']:
+            return response.json()
+        time.sleep(0.01)
+    raise AssertionError(
+        'Фоновая задача должна распределить средства объекта.'
+    )
+
+
+def test_deferred_allocation(deferred_client):
+    response = deferred_client.post('/charity_project/', json={
+        'name': 'Deferred project',
+        'description': 'Deferred allocation',
+        'full_amount': 100,
+    })
+    assert response.status_code == 200, (
+        'В отложенном режиме проект должен создаваться.'
+    )
+    assert response.json()['invested_amount'] == 0, (
+        'В отложенном режиме средства не распределяются при создании.'
+    )
+    for full_amount in (60, 40):
+        response = deferred_client.post(
+            '/donation/', json={'full_amount': full_amount}
+        )
+        assert response.status_code == 200, (
+            'В отложенном режиме пожертвование должно создаваться.'
+        )
+    donation = wait_for_allocation(
+        deferred_client, f'/donation/{response.json()["id"]}/status'
+    )
+    assert donation == {
+        'id': 2,
+        'allocated': True,
+        'invested_amount': 40,
+        'fully_invested': True,
+    }, 'Фоновая задача должна распределить пожертвования в порядке очереди.'
+    project = wait_for_allocation(deferred_client, '/charity_project/1/status')
+    assert project == {
+        'id': 1,
+        'allocated': True,
+        'invested_amount': 100,
+        'fully_invested': True,
+    }, 'Фоновая задача должна закрыть полностью профинансированный проект.'
+    summary = deferred_client.get('/fund/summary').json()
+    assert summary['invested_amount'] == 100, (
+        'Фоновая задача должна учитывать вложенные средства в сводке фонда.'
+    )
+
+
+def test_donation_status_forbidden_for_other_user(user_client, another_donation):
+    response = user_client.get(f'/donation/{another_donation.id}/status')
+    assert response.status_code == 403, (
+        'Статус чужого пожертвования должен быть недоступен пользователю.'
+    )
+
+
+async def test_deferred_create_without_background_task(monkeypatch, mixer):
+    monkeypatch.setattr(settings, 'allocation_mode', DEFERRED_ALLOCATION_MODE)
+    monkeypatch.setattr(
+        'app.services.investment.deferred_allocator', DeferredAllocator()
+    )
+    mixer.blend(
+        'app.models.charity_project.CharityProject',
+        name='Open project', description='Open', full_amount=500,
+        invested_amount=0, fully_invested=False, allocated=True,
+    )
+    async with TestingSessionLocal() as session:
+        donation = await create_and_invest(
+            crud=donation_crud,
+            obj_in=DonationCreate(full_amount=100),
+            session=session,
+        )
+        assert not donation.allocated, (
+            'Без фоновой задачи пожертвование должно ждать распределения.'
+        )
+        assert await allocate_pending(session)
+        await session.commit()
+        await session.refresh(donation)
+    assert donation.allocated and donation.invested_amount == 100, (
+        'allocate_pending должен распределить ожидающее пожертвование.'
+    )
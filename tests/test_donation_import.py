@@ -0,0 +1,188 @@
+import json
+import random
+
+import pytest
+from conftest import TestingSessionLocal
+from operations import get_project_create, reset_db, take_snapshot
+
+from app.cli import import_donations_file, reconcile
+from app.core.config import settings
+from app.crud import charity_project_crud, donation_crud
+from app.schemas.donation import DonationCreate
+from app.schemas.export import ExportFormat
+from app.services.investment import (
+    LEDGER_ALLOCATION_MODE,
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+    bulk_create_and_invest,
+    invest_donation_in_open_projects,
+    invest_open_donations_in_project,
+)
+
+STEPS_COUNT = 12
+
+
+def generate_steps(seed):
+    """Проекты по одному вперемешку с пачками пожертвований."""
+    rnd = random.Random(seed)
+    return [
+        ('projects', rnd.randint(1, 3000))
+        if rnd.random() < 0.4
+        else ('donations', [
+            rnd.randint(1, 1000) for _ in range(rnd.randint(1, 15))
+        ])
+        for _ in range(STEPS_COUNT)
+    ]
+
+
+async def run_steps(steps, bulk):
+    await reset_db()
+    async with TestingSessionLocal() as session:
+        for number, (kind, amount) in enumerate(steps):
+            if kind == 'projects':
+                project = await charity_project_crud.create(
+                    obj_in=get_project_create(number, amount),
+                    session=session,
+                )
+                await invest_open_donations_in_project(project, session)
+            elif bulk:
+                await bulk_create_and_invest(
+                    crud=donation_crud,
+                    objs_in_data=[
+                        {'comment': None, 'full_amount': full_amount}
+                        for full_amount in amount
+                    ],
+                    session=session,
+                )
+            else:
+                for full_amount in amount:
+                    donation = await donation_crud.create(
+                        obj_in=DonationCreate(full_amount=full_amount),
+                        session=session,
+                    )
+                    await invest_donation_in_open_projects(donation, session)
+    return await take_snapshot()
+
+
+@pytest.mark.parametrize('investment_engine', [
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+])
+@pytest.mark.parametrize('seed', range(5))
+async def test_bulk_import_matches_one_by_one(
+    seed, investment_engine, monkeypatch,
+):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    steps = generate_steps(seed)
+    expected = await run_steps(steps, bulk=False)
+    result = await run_steps(steps, bulk=True)
+    assert result == expected, (
+        'Массовый импорт пожертвований должен приводить к тому же '
+        'состоянию БД, что и создание пожертвований по одному.'
+    )
+
+
+@pytest.fixture
+def db_users(mixer):
+    return [
+        mixer.blend('app.models.user.User', id=user_id, email=f'{user_id}@x.ru')
+        for user_id in (1, 2)
+    ]
+
+
+def test_import_donations_ndjson(
+    superuser_client, db_users, charity_project, small_fully_charity_project,
+):
+    body = '\n'.join(
+        json.dumps(row) for row in (
+            {'full_amount': 600000, 'comment': 'Банковский перевод'},
+            {'full_amount': 500000, 'user_id': 2},
+            {'full_amount': 100},
+        )
+    )
+    response = superuser_client.post('/donation/import', data=body.encode())
+    assert response.status_code == 200, (
+        'POST-запрос к эндпоинту `/donation/import` должен вернуть '
+        'статус-код 200.'
+    )
+    assert response.json() == {
+        'imported_count': 3,
+        'imported_amount': 1100100,
+        'invested_amount': 1000000,
+    }, 'Импорт должен вернуть итоги: количество, сумму и распределённое.'
+    donations = superuser_client.get('/donation/').json()
+    assert [
+        (donation['user_id'], donation['invested_amount'])
+        for donation in donations
+    ] == [(1, 600000), (2, 400000), (1, 0)], (
+        'Пожертвования должны распределяться по проектам в порядке файла.'
+    )
+    summary = superuser_client.get('/fund/summary').json()
+    assert summary['donations_count'] == 3
+    assert summary['invested_amount'] == 1000000, (
+        'Импорт должен учитываться в сводке фонда.'
+    )
+
+
+def test_import_donations_csv(superuser_client, db_users, charity_project):
+    body = 'full_amount,comment,user_id\n100,,2\n200,"Перевод, ч. 1",\n'
+    response = superuser_client.post(
+        '/donation/import', params={'format': 'csv'}, data=body.encode(),
+    )
+    assert response.status_code == 200
+    donations = superuser_client.get('/donation/').json()
+    assert [
+        (donation.get('comment'), donation['full_amount'], donation['user_id'])
+        for donation in donations
+    ] == [(None, 100, 2), ('Перевод, ч. 1', 200, 1)], (
+        'Пустые ячейки CSV должны считаться отсутствующими значениями.'
+    )
+
+
+@pytest.mark.parametrize('body, import_format, message', [
+    ('{"full_amount": 100}\n{"full_amount": 0}', 'ndjson', 'Строка 2'),
+    ('{"full_amount": 100}\nnot json', 'ndjson', 'Строка 2'),
+    ('{"full_amount": 100, "extra": 1}', 'ndjson', 'Строка 1'),
+    ('{"full_amount": 100, "user_id": 99}', 'ndjson', '99'),
+    ('full_amount\n100\n-5\n', 'csv', 'Строка 3'),
+    ('', 'ndjson', 'не содержит'),
+])
+def test_import_donations_rejects_whole_file(
+    superuser_client, db_users, body, import_format, message,
+):
+    response = superuser_client.post(
+        '/donation/import', params={'format': import_format},
+        data=body.encode(),
+    )
+    assert response.status_code == 422, (
+        'Некорректный файл импорта должен отклоняться со статус-кодом 422.'
+    )
+    assert message in response.json()['detail'], (
+        'Ошибка импорта должна указывать строку файла.'
+    )
+    assert superuser_client.get('/donation/').json() == [], (
+        'Ошибка в одной строке должна отклонять весь файл.'
+    )
+
+
+def test_import_donations_requires_superuser(user_client):
+    response = user_client.post(
+        '/donation/import', data=b'{"full_amount": 100}'
+    )
+    assert response.status_code == 401, (
+        'Массовый импорт должен быть доступен только суперюзерам.'
+    )
+
+
+async def test_cli_writers_refused_in_ledger_mode(
+    monkeypatch, tmp_path, capsys,
+):
+    monkeypatch.setattr(settings, 'allocation_mode', LEDGER_ALLOCATION_MODE)
+    path = tmp_path / 'donations.ndjson'
+    path.write_text(json.dumps({'full_amount': 100}))
+    assert await import_donations_file(
+        path=path, import_format=ExportFormat.ndjson, user_id=1,
+    ) == 1, 'В режиме ledger импорт из командной строки запрещён.'
+    assert await reconcile(fix=True) == 1, (
+        'В режиме ledger исправление сводки из командной строки запрещено.'
+    )
+    assert 'ALLOCATION_MODE=ledger' in capsys.readouterr().err
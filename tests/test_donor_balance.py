@@ -0,0 +1,162 @@
+import pytest
+from conftest import TestingSessionLocal, engine
+from operations import (
+    create_operations, generate_operations, reset_db, run_operations,
+)
+from sqlalchemy import case, func, select, text
+
+from app.core.config import settings
+from app.crud import donation_crud
+from app.models import CharityProject, Donation, DonorBalance
+from app.services.allocation_ledger import AllocationLedger
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+    allocate_pending,
+    bulk_create_and_invest,
+)
+
+USER_IDS = (1, 2, 3)
+
+
+async def check_donor_balances():
+    """Счётчики пользователей совпадают с пересчётом по пожертвованиям."""
+    async with TestingSessionLocal() as session:
+        expected = await session.execute(
+            select(
+                Donation.user_id,
+                func.count(Donation.id),
+                func.sum(Donation.full_amount),
+                func.sum(Donation.invested_amount),
+                func.sum(case((Donation.fully_invested, 0), else_=1)),
+            )
+            .where(Donation.user_id.is_not(None))
+            .group_by(Donation.user_id)
+            .order_by(Donation.user_id)
+        )
+        balances = await session.execute(
+            select(
+                DonorBalance.user_id,
+                DonorBalance.donations_count,
+                DonorBalance.donations_amount,
+                DonorBalance.invested_amount,
+                DonorBalance.open_donations_count,
+            ).order_by(DonorBalance.user_id)
+        )
+        expected = [tuple(row) for row in expected]
+        assert [tuple(row) for row in balances] == expected, (
+            'Счётчики пользователей должны совпадать с пересчётом '
+            'по таблице пожертвований.'
+        )
+    return expected
+
+
+@pytest.mark.parametrize('deferred', [False, True])
+@pytest.mark.parametrize('investment_engine', [
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+])
+@pytest.mark.parametrize('seed', range(2))
+async def test_donor_balances_match_donations(
+    seed, investment_engine, deferred, monkeypatch,
+):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    await reset_db()
+    await run_operations(
+        generate_operations(seed, user_ids=USER_IDS), deferred=deferred
+    )
+    expected = await check_donor_balances()
+    assert {user_id for user_id, *_ in expected} == set(USER_IDS)
+    assert any(invested for *_, invested, _ in expected), (
+        'Средства пожертвований должны распределяться по проектам.'
+    )
+
+
+async def test_donor_balances_in_ledger_mode(monkeypatch):
+    await reset_db()
+    ledger = AllocationLedger()
+    monkeypatch.setattr('app.services.investment.allocation_ledger', ledger)
+    await ledger.start(
+        bind=engine,
+        recover=allocate_pending,
+        interval_ms=60000,
+        batch_size=7,
+    )
+    await create_operations(generate_operations(0, user_ids=USER_IDS))
+    await ledger.stop()
+    await check_donor_balances()
+
+
+@pytest.mark.parametrize('investment_engine', [
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+])
+async def test_donor_balances_after_bulk_create(investment_engine, monkeypatch):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    await reset_db()
+    await run_operations([(CharityProject, 700, None)])
+    async with TestingSessionLocal() as session:
+        await bulk_create_and_invest(
+            crud=donation_crud,
+            objs_in_data=[
+                {'comment': None, 'full_amount': amount, 'user_id': user_id}
+                for amount, user_id in ((200, 1), (400, 2), (300, 1))
+            ],
+            session=session,
+        )
+    expected = [(1, 2, 500, 300, 1), (2, 1, 400, 400, 0)]
+    assert await check_donor_balances() == expected, (
+        'Массовое создание должно учитываться в счётчиках каждого автора.'
+    )
+
+
+def test_get_user_donations_summary(user_client, charity_project):
+    response = user_client.get('/donation/my/summary')
+    assert response.status_code == 200, (
+        'GET-запрос к `/donation/my/summary` должен вернуть статус-код 200.'
+    )
+    assert response.json() == {
+        'donations_count': 0,
+        'donations_amount': 0,
+        'invested_amount': 0,
+        'open_donations_count': 0,
+    }, 'Сводка пользователя без пожертвований должна быть нулевой.'
+    for full_amount in (100, 250):
+        user_client.post('/donation/', json={'full_amount': full_amount})
+    response = user_client.get('/donation/my/summary')
+    assert response.json() == {
+        'donations_count': 2,
+        'donations_amount': 350,
+        'invested_amount': 350,
+        'open_donations_count': 0,
+    }, (
+        'Сводка должна учитывать количество, сумму и вложенные средства '
+        'пожертвований пользователя.'
+    )
+
+
+def test_get_user_donations_summary_without_projects(user_client):
+    user_client.post('/donation/', json={'full_amount': 100})
+    response = user_client.get('/donation/my/summary')
+    assert response.json() == {
+        'donations_count': 1,
+        'donations_amount': 100,
+        'invested_amount': 0,
+        'open_donations_count': 1,
+    }, 'Нераспределённое пожертвование должно считаться открытым.'
+
+
+async def test_user_donations_use_index():
+    async with TestingSessionLocal() as session:
+        plan = await session.execute(
+            text(
+                'EXPLAIN QUERY PLAN SELECT id FROM donation '
+                'WHERE user_id = 1 ORDER BY create_date, id'
+            )
+        )
+        plan = ' '.join(row[-1] for row in plan)
+    assert 'ix_donation_user_id_create_date_id' in plan, (
+        'Пожертвования пользователя должны читаться по индексу.'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        'Пожертвования пользователя не должны сортироваться '
+        'во временной таблице.'
+    )
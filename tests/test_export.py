@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+
+def test_export_donations_ndjson(superuser_client, donation, another_donation):
+    response = superuser_client.get('/donation/export')
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/donation/export` должен вернуть '
+        'статус-код 200.'
+    )
+    assert response.headers['content-type'] == 'application/x-ndjson', (
+        'По умолчанию выгрузка должна быть в формате NDJSON.'
+    )
+    rows = [
+        {key: value for key, value in json.loads(line).items()
+         if value is not None}
+        for line in response.text.splitlines()
+    ]
+    assert rows == superuser_client.get('/donation/').json(), (
+        'Выгрузка должна содержать те же данные, что и список пожертвований.'
+    )
+
+
+def test_export_charity_projects_csv(
+    superuser_client, charity_project, small_fully_charity_project,
+):
+    response = superuser_client.get(
+        '/charity_project/export', params={'format': 'csv'}
+    )
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/charity_project/export` должен вернуть '
+        'статус-код 200.'
+    )
+    assert response.headers['content-type'].startswith('text/csv'), (
+        'Выгрузка в формате csv должна иметь тип text/csv.'
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row['id'] for row in rows] == ['1', '2'], (
+        'Выгрузка должна содержать все проекты в порядке id.'
+    )
+    assert rows[1]['close_date'] == '2010-10-11T00:00:00', (
+        'Даты в выгрузке должны быть в том же формате, что и в ответах API.'
+    )
+    assert rows[0]['close_date'] == '', (
+        'Пустые значения в CSV выгружаются пустыми строками.'
+    )
+
+
+def test_export_unknown_format(superuser_client):
+    response = superuser_client.get(
+        '/donation/export', params={'format': 'xml'}
+    )
+    assert response.status_code == 422, (
+        'Неизвестный формат выгрузки должен возвращать статус-код 422.'
+    )
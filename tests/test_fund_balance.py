@@ -0,0 +1,106 @@
+import pytest
+from conftest import (
+    TestingSessionLocal, app, current_superuser, current_user,
+    get_async_session, override_db,
+)
+from fastapi.testclient import TestClient
+from fixtures.user import superuser
+
+from app.core.config import settings
+from app.services.fund_balance import reconcile_fund_balance
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+)
+
+
+@pytest.fixture
+def fund_client():
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_user] = lambda: superuser
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    with TestClient(app) as client:
+        yield client
+
+
+def get_summary(client):
+    response = client.get('/fund/summary')
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/fund/summary` должен вернуть статус-код 200.'
+    )
+    return response.json()
+
+
+async def reconcile(fix=False):
+    async with TestingSessionLocal() as session:
+        return await reconcile_fund_balance(session=session, fix=fix)
+
+
+def test_summary_requires_superuser(user_client):
+    response = user_client.get('/fund/summary')
+    assert response.status_code == 401, (
+        'Сводка фонда должна быть доступна только суперюзерам.'
+    )
+
+
+@pytest.mark.parametrize(
+    'investment_engine', [PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE]
+)
+async def test_summary_follows_changes(
+    fund_client, monkeypatch, investment_engine
+):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    assert get_summary(fund_client) == {
+        'donations_count': 0,
+        'donations_amount': 0,
+        'projects_count': 0,
+        'projects_amount': 0,
+        'invested_amount': 0,
+        'unallocated_amount': 0,
+        'required_amount': 0,
+    }, 'Сводка пустого фонда должна быть нулевой.'
+    for name, full_amount in (('first', 100), ('second', 300)):
+        fund_client.post('/charity_project/', json={
+            'name': name,
+            'description': 'Fund balance project',
+            'full_amount': full_amount,
+        })
+    for full_amount in (150, 100):
+        fund_client.post('/donation/', json={'full_amount': full_amount})
+    fund_client.patch('/charity_project/2', json={'full_amount': 400})
+    fund_client.post('/charity_project/', json={
+        'name': 'third',
+        'description': 'Fund balance project',
+        'full_amount': 50,
+    })
+    fund_client.delete('/charity_project/3')
+    assert get_summary(fund_client) == {
+        'donations_count': 2,
+        'donations_amount': 250,
+        'projects_count': 2,
+        'projects_amount': 500,
+        'invested_amount': 250,
+        'unallocated_amount': 0,
+        'required_amount': 250,
+    }, 'Сводка фонда должна обновляться вместе с объектами.'
+    assert await reconcile() == {}, (
+        'Счётчики сводки должны совпадать с пересчётом по таблицам.'
+    )
+
+
+async def test_reconcile_fixes_drift(fund_client, donation):
+    drift = await reconcile()
+    assert drift == {
+        'donations_count': (0, 1),
+        'donations_amount': (0, 100),
+    }, 'Сверка должна находить объекты, созданные в обход CRUD.'
+    assert await reconcile(fix=True) == drift, (
+        'Сверка с исправлением должна вернуть найденные расхождения.'
+    )
+    assert await reconcile() == {}, (
+        'После исправления сводка должна совпадать с таблицами.'
+    )
+    summary = get_summary(fund_client)
+    assert summary['donations_amount'] == 100, (
+        'Эндпоинт должен возвращать пересчитанную сводку.'
+    )
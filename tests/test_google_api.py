@@ -0,0 +1,301 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import app, current_superuser, get_async_session, override_db
+from fastapi.testclient import TestClient
+from fake_google import FakeGoogleServer, generate_private_key
+from fixtures.user import superuser
+
+from app.core.config import settings
+from app.core.google_client import get_service
+from app.services import google_api
+
+PROJECTS_COUNT = 12
+
+
+class RecordingMethod:
+    """Метод API Google: вызов возвращает описание запроса."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, name):
+        return RecordingMethod(f'{self.name}.{name}')
+
+    def __call__(self, **kwargs):
+        return self.name, kwargs
+
+
+class RecordingServices:
+    """Замена Aiogoogle, запоминающая выполненные запросы."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def discover(self, api_name, api_version):
+        return RecordingMethod(api_name)
+
+    async def as_service_account(self, request):
+        self.requests.append(request)
+        return {'spreadsheetId': 'spreadsheet_id'}
+
+
+@pytest.fixture
+def google_services():
+    services = RecordingServices()
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[current_superuser] = lambda: superuser
+    app.dependency_overrides[get_service] = lambda: services
+    return services
+
+
+@pytest.fixture
+def closed_projects(mixer):
+    # Без freezer: замороженное время останавливает таймеры цикла событий.
+    create_date = datetime(2020, 1, 1)
+    for number in range(PROJECTS_COUNT):
+        mixer.blend(
+            'app.models.charity_project.CharityProject',
+            name=f'project_{number}',
+            description='Closed project',
+            full_amount=100,
+            invested_amount=100,
+            fully_invested=True,
+            create_date=create_date,
+            close_date=create_date + timedelta(days=number + 1),
+            completion_rate=timedelta(days=number + 1).total_seconds(),
+        )
+
+
+def test_report_size_and_chunks(google_services, closed_projects, monkeypatch):
+    monkeypatch.setattr(google_api, 'REPORT_UPDATE_CHUNK_SIZE', 4)
+    with TestClient(app) as client:
+        response = client.get('/google/', params={'limit': 7})
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/google/` должен вернуть статус-код 200.'
+    )
+    assert response.json() == google_api.SPREADSHEET_URL % 'spreadsheet_id'
+    (create, create_kwargs), *requests = google_services.requests
+    assert create == 'sheets.spreadsheets.create'
+    grid = create_kwargs['json']['sheets'][0]['properties']['gridProperties']
+    assert grid == {'rowCount': 10, 'columnCount': 3}, (
+        'Размер листа должен соответствовать числу строк отчёта.'
+    )
+    assert sorted(set(name for name, _ in requests)) == [
+        'drive.permissions.create', 'sheets.spreadsheets.values.batchUpdate',
+    ], 'Если проектов не меньше limit, лист не должен уменьшаться.'
+    ranges = []
+    values = []
+    updates = [
+        kwargs for name, kwargs in requests
+        if name == 'sheets.spreadsheets.values.batchUpdate'
+    ]
+    for kwargs in sorted(
+        updates, key=lambda kwargs: int(kwargs['json']['data'][0]['range'][1:].split(':')[0])
+    ):
+        for value_range in kwargs['json']['data']:
+            ranges.append(value_range['range'])
+            values += value_range['values']
+    assert ranges == ['A1:C4', 'A5:C8', 'A9:C10'], (
+        'Отчёт должен записываться частями с диапазонами по числу строк.'
+    )
+    assert [row[0] for row in values[3:]] == [
+        f'project_{number}' for number in range(7)
+    ], 'В отчёт должны попадать limit самых быстро закрытых проектов.'
+
+
+def test_report_sheet_shrunk_to_projects(google_services, closed_projects):
+    with TestClient(app) as client:
+        response = client.get('/google/', params={'limit': 50})
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/google/` должен вернуть статус-код 200.'
+    )
+    resize_requests = [
+        kwargs['json'] for name, kwargs in google_services.requests
+        if name == 'sheets.spreadsheets.batchUpdate'
+    ]
+    assert len(resize_requests) == 1, (
+        'Если проектов меньше limit, лист должен уменьшаться до размера отчёта.'
+    )
+    properties = resize_requests[0]['requests'][0]['updateSheetProperties']
+    assert properties['properties']['gridProperties'] == {
+        'rowCount': PROJECTS_COUNT + 3
+    }
+
+
+def test_report_limit_validated(google_services):
+    with TestClient(app) as client:
+        response = client.get(
+            '/google/', params={'limit': google_api.REPORT_MAX_SIZE + 1}
+        )
+    assert response.status_code == 422, (
+        'Размер отчёта должен быть ограничен.'
+    )
+
+
+@pytest.fixture(scope='module')
+def private_key():
+    return generate_private_key()
+
+
+@pytest.fixture
+def fake_google(monkeypatch, tmp_path, private_key):
+    with FakeGoogleServer() as server:
+        for name, value in (
+            ('type', 'service_account'),
+            ('private_key', private_key),
+            ('client_email', 'robot@fake.iam.gserviceaccount.com'),
+            ('token_uri', server.token_uri),
+            ('google_discovery_url', server.discovery_url),
+            ('google_discovery_cache_dir', str(tmp_path)),
+        ):
+            monkeypatch.setattr(settings, name, value)
+        app.dependency_overrides = {}
+        app.dependency_overrides[get_async_session] = override_db
+        app.dependency_overrides[current_superuser] = lambda: superuser
+        yield server
+
+
+def test_google_client_reused(fake_google, closed_projects):
+    with TestClient(app) as client:
+        for number in (1, 2):
+            response = client.get('/google/')
+            assert response.status_code == 200, (
+                'GET-запрос к эндпоинту `/google/` должен вернуть '
+                'статус-код 200.'
+            )
+            assert response.json() == (
+                google_api.SPREADSHEET_URL % f'spreadsheet_{number}'
+            )
+    assert fake_google.counts['discovery'] == 2, (
+        'Документы Discovery API должны запрашиваться один раз '
+        'на каждый API, а не при каждом отчёте.'
+    )
+    assert fake_google.counts['token'] == 1, (
+        'Токен сервис-аккаунта должен переиспользоваться до истечения срока.'
+    )
+    assert fake_google.counts['api'] == 8, (
+        'Каждый отчёт должен выполнять только запросы к таблице и правам.'
+    )
+    with TestClient(app) as client:
+        response = client.get('/google/')
+    assert response.status_code == 200
+    assert fake_google.counts['discovery'] == 2, (
+        'После перезапуска документы Discovery API должны читаться с диска.'
+    )
+
+
+def wait_for_report(client, job_id):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        response = client.get(f'/google/reports/{job_id}')
+        assert response.status_code == 200, (
+            'GET-запрос к эндпоинту `/google/reports/{job_id}` должен '
+            'вернуть статус-код 200.'
+        )
+        if response.json()['status'] != 'pending':
+            return response.json()
+        time.sleep(0.01)
+    raise AssertionError('Фоновая задача должна сформировать отчёт.')
+
+
+def test_report_job(fake_google, closed_projects):
+    with TestClient(app) as client:
+        response = client.post('/google/reports', params={'limit': 5})
+        assert response.status_code == 202, (
+            'POST-запрос к эндпоинту `/google/reports` должен вернуть '
+            'статус-код 202.'
+        )
+        job = response.json()
+        assert job['status'] == 'pending', (
+            'Задача формирования отчёта должна запускаться в фоне.'
+        )
+        response = client.post('/google/reports', params={'limit': 5})
+        assert response.json()['id'] == job['id'], (
+            'Одинаковые запросы в пределах окна должны получать одну задачу.'
+        )
+        job = wait_for_report(client, job['id'])
+        assert job['status'] == 'done'
+        assert job['url'] == google_api.SPREADSHEET_URL % 'spreadsheet_1', (
+            'Готовая задача должна содержать ссылку на отчёт.'
+        )
+        response = client.post('/google/reports', params={'limit': 5})
+        assert response.json()['id'] == job['id'], (
+            'Готовый отчёт должен переиспользоваться в пределах окна.'
+        )
+        response = client.post('/google/reports', params={'limit': 6})
+        assert response.json()['id'] != job['id'], (
+            'Запросы с разными параметрами должны получать разные задачи.'
+        )
+        wait_for_report(client, response.json()['id'])
+    create_requests = [
+        path for path, _ in fake_google.requests
+        if path == '/v4/spreadsheets'
+    ]
+    assert len(create_requests) == 2, (
+        'Каждая задача должна создавать одну таблицу.'
+    )
+
+
+def test_failed_report_job_not_reused(fake_google, closed_projects):
+    fake_google.statuses = [403]
+    with TestClient(app) as client:
+        job_id = client.post('/google/reports').json()['id']
+        job = wait_for_report(client, job_id)
+        assert job['status'] == 'failed', (
+            'Ошибка API Google должна переводить задачу в статус failed.'
+        )
+        assert job['error'], 'Неудачная задача должна содержать ошибку.'
+        response = client.post('/google/reports')
+        assert response.json()['id'] != job_id, (
+            'Неудачная задача не должна переиспользоваться.'
+        )
+        assert wait_for_report(client, response.json()['id'])['status'] == 'done'
+
+
+def test_report_job_not_found(superuser_client):
+    response = superuser_client.get('/google/reports/unknown')
+    assert response.status_code == 404, (
+        'Запрос несуществующей задачи должен вернуть статус-код 404.'
+    )
+
+
+def test_google_api_retried(fake_google, closed_projects, monkeypatch):
+    monkeypatch.setattr(settings, 'google_retry_backoff', 0.01)
+    fake_google.statuses = [429, 200, 503]
+    with TestClient(app) as client:
+        response = client.get('/google/')
+    assert response.status_code == 200, (
+        'На ответы 429 и 5xx запросы к API Google должны повторяться.'
+    )
+    assert fake_google.counts['api'] == 6, (
+        'Каждый неудачный запрос должен повторяться один раз.'
+    )
+
+
+def test_spreadsheet_create_not_retried_on_server_error(
+    fake_google, closed_projects, monkeypatch,
+):
+    monkeypatch.setattr(settings, 'google_retry_backoff', 0.01)
+    fake_google.statuses = [503]
+    with TestClient(app) as client:
+        job_id = client.post('/google/reports').json()['id']
+        job = wait_for_report(client, job_id)
+    assert job['status'] == 'failed', (
+        'После ответа 5xx документ мог быть уже создан: создание '
+        'документа не должно повторяться.'
+    )
+    assert fake_google.counts['api'] == 1
+
+
+def test_google_api_timeout(fake_google, closed_projects, monkeypatch):
+    monkeypatch.setattr(settings, 'google_request_timeout', 0.05)
+    fake_google.latency = 0.5
+    with TestClient(app) as client:
+        job_id = client.post('/google/reports').json()['id']
+        job = wait_for_report(client, job_id)
+    assert job['status'] == 'failed', (
+        'Запрос к API Google должен прерываться по тайм-ауту.'
+    )
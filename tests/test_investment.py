@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 import pytest
 
 
@@ -45,3 +47,22 @@ def test_donation_to_little_invest_project(user_client, charity_project_little_i
     assert charity_project_little_invested.invested_amount == 1000, test_donation_to_little_invest_project.__doc__
     assert not charity_project_nunchaku.fully_invested, test_donation_to_little_invest_project.__doc__
     assert charity_project_nunchaku.invested_amount == 0, test_donation_to_little_invest_project.__doc__
+
+
+def test_donation_invested_in_projects_beyond_first_batch(user_client, mixer):
+    """Создано 150 проектов по 10. Пожертвование на 1500 должно закрыть все проекты, даже если они читаются из БД порциями."""
+    projects = [
+        mixer.blend(
+            'app.models.charity_project.CharityProject',
+            name=f'project_{number}',
+            description='Small project',
+            full_amount=10,
+            create_date=datetime(2010, 10, 10) + timedelta(seconds=number),
+        )
+        for number in range(150)
+    ]
+    user_client.post('/donation/', json={
+        'full_amount': 1500,
+    })
+    assert all(project.fully_invested for project in projects), test_donation_invested_in_projects_beyond_first_batch.__doc__
+    assert all(project.invested_amount == 10 for project in projects), test_donation_invested_in_projects_beyond_first_batch.__doc__
@@ -0,0 +1,60 @@
+import pytest
+from operations import (
+    generate_operations, reset_db, run_operations, take_snapshot,
+)
+
+from app.core.config import settings
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+)
+
+OPERATIONS_COUNT = 30
+
+
+async def get_snapshot(operations, deferred=False):
+    await reset_db()
+    await run_operations(operations, deferred=deferred)
+    return await take_snapshot()
+
+
+@pytest.mark.parametrize('seed', range(10))
+async def test_investment_engines_give_identical_results(seed, monkeypatch):
+    operations = generate_operations(seed, OPERATIONS_COUNT)
+    monkeypatch.setattr(settings, 'investment_engine', PYTHON_INVESTMENT_ENGINE)
+    expected = await get_snapshot(operations)
+    monkeypatch.setattr(settings, 'investment_engine', SQL_INVESTMENT_ENGINE)
+    result = await get_snapshot(operations)
+    assert result == expected, (
+        'Построчная и множественная реализации распределения средств '
+        'должны приводить к одинаковому состоянию БД.'
+    )
+    invested_in_donations = sum(
+        invested for name, _, invested, *_ in result if name == 'Donation'
+    )
+    invested_in_projects = sum(
+        invested for name, _, invested, *_ in result
+        if name == 'CharityProject'
+    )
+    assert invested_in_donations == invested_in_projects, (
+        'Сумма, вложенная в проекты, должна совпадать с суммой, '
+        'распределённой из пожертвований.'
+    )
+
+
+@pytest.mark.parametrize('investment_engine', [
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+])
+@pytest.mark.parametrize('seed', range(5))
+async def test_deferred_allocation_gives_identical_results(
+    seed, investment_engine, monkeypatch,
+):
+    operations = generate_operations(seed, OPERATIONS_COUNT)
+    monkeypatch.setattr(settings, 'investment_engine', PYTHON_INVESTMENT_ENGINE)
+    expected = await get_snapshot(operations)
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    result = await get_snapshot(operations, deferred=True)
+    assert result == expected, (
+        'Отложенное распределение пачками должно приводить к тому же '
+        'состоянию БД, что и распределение при создании каждого объекта.'
+    )
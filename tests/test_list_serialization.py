@@ -0,0 +1,86 @@
+from datetime import datetime
+from typing import List
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import parse_obj_as
+
+from app.schemas.charity_project import CharityProjectDB
+from app.schemas.donation import DonationtDB, ExtendedDonationtDB
+
+
+@pytest.fixture
+def various_donations(mixer):
+    return [
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=2,
+            comment=comment,
+            full_amount=full_amount,
+            create_date=create_date,
+        )
+        for comment, full_amount, create_date in (
+            (None, 100, datetime(2011, 11, 11)),
+            ('На корм котикам 🐈', 200, datetime(2011, 11, 11, 1, 2, 3, 4567)),
+            ('"quoted" \\ comment', 300, datetime(2011, 11, 12, 0, 0, 0, 1)),
+        )
+    ]
+
+
+def encode_as_pydantic(data, schema, exclude_none):
+    """Тело ответа так, как его строит FastAPI через response_model."""
+    objs = parse_obj_as(List[schema], data)
+    return JSONResponse(jsonable_encoder(objs, exclude_none=exclude_none)).body
+
+
+def check_matches_pydantic(response, schema, exclude_none):
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.content == encode_as_pydantic(
+        response.json(), schema, exclude_none
+    ), (
+        'Список должен совпадать байт в байт с сериализацией '
+        'через схему Pydantic.'
+    )
+
+
+def test_donation_list_matches_pydantic(superuser_client, various_donations):
+    response = superuser_client.get('/donation/')
+    assert len(response.json()) == 3
+    check_matches_pydantic(response, ExtendedDonationtDB, exclude_none=True)
+
+
+def test_user_donation_list_matches_pydantic(user_client, various_donations):
+    response = user_client.get('/donation/my')
+    assert len(response.json()) == 3
+    check_matches_pydantic(response, DonationtDB, exclude_none=False)
+
+
+def test_donation_my_keeps_null_comment(user_client, various_donations):
+    response = user_client.get('/donation/my')
+    assert response.json()[0] == {
+        'comment': None,
+        'full_amount': 100,
+        'id': 1,
+        'create_date': '2011-11-11T00:00:00',
+    }, 'Список пожертвований пользователя выводит comment даже без значения.'
+
+
+def test_charity_project_list_matches_pydantic(
+    user_client, charity_project, small_fully_charity_project,
+):
+    response = user_client.get('/charity_project/')
+    assert 'close_date' not in response.json()[0], (
+        'Пустые поля не должны выводиться в списке проектов.'
+    )
+    check_matches_pydantic(response, CharityProjectDB, exclude_none=True)
+
+
+def test_paginated_rows_keep_cursor_header(superuser_client, various_donations):
+    response = superuser_client.get('/donation/', params={'limit': 2})
+    assert len(response.json()) == 2
+    assert 'X-Next-Cursor' in response.headers, (
+        'Курсор следующей страницы должен передаваться и при сериализации '
+        'строк БД без Pydantic.'
+    )
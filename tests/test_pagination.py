@@ -0,0 +1,78 @@
+def get_all_pages(client, url, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        response = client.get(url, params=query)
+        assert response.status_code == 200, (
+            f'GET-запрос к эндпоинту `{url}` с пагинацией должен вернуть '
+            'статус-код 200.'
+        )
+        pages.append([obj['id'] for obj in response.json()])
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return pages
+
+
+def test_charity_project_pagination(
+    user_client, charity_project, charity_project_nunchaku,
+    small_fully_charity_project,
+):
+    pages = get_all_pages(user_client, '/charity_project/', limit=2)
+    assert pages == [[1, 2], [3]], (
+        'Проекты должны возвращаться страницами по limit объектов '
+        'в порядке (create_date, id), курсор следующей страницы — '
+        'в заголовке X-Next-Cursor.'
+    )
+
+
+def test_charity_project_filters(
+    user_client, charity_project, charity_project_nunchaku,
+    small_fully_charity_project,
+):
+    response = user_client.get(
+        '/charity_project/', params={'fully_invested': False}
+    )
+    assert [obj['id'] for obj in response.json()] == [1, 2], (
+        'Фильтр fully_invested должен оставлять только подходящие проекты.'
+    )
+    response = user_client.get(
+        '/charity_project/',
+        params={'full_amount_min': 1000, 'full_amount_max': 1000000},
+    )
+    assert [obj['id'] for obj in response.json()] == [1], (
+        'Фильтр по сумме должен учитывать обе границы диапазона.'
+    )
+
+
+def test_donation_pagination_and_date_filter(
+    superuser_client, donation, another_donation,
+):
+    pages = get_all_pages(superuser_client, '/donation/', limit=1)
+    assert pages == [[1], [2]], (
+        'Пожертвования должны возвращаться страницами по limit объектов.'
+    )
+    response = superuser_client.get(
+        '/donation/', params={'create_date_from': '2012-01-01T00:00:00'}
+    )
+    assert [obj['id'] for obj in response.json()] == [2], (
+        'Фильтр по дате создания должен оставлять только подходящие '
+        'пожертвования.'
+    )
+
+
+def test_user_donations_pagination(user_client, donation, another_donation):
+    pages = get_all_pages(user_client, '/donation/my', limit=1)
+    assert pages == [[1]], (
+        'Пагинация списка пожертвований пользователя должна учитывать '
+        'только его пожертвования.'
+    )
+
+
+def test_invalid_cursor(user_client):
+    response = user_client.get(
+        '/charity_project/', params={'cursor': 'not-a-cursor'}
+    )
+    assert response.status_code == 422, (
+        'Некорректный курсор пагинации должен возвращать статус-код 422.'
+    )
@@ -0,0 +1,207 @@
+"""
+Тесты на PostgreSQL. Используется сервер из переменной окружения
+TEST_POSTGRESQL_URL (postgresql+asyncpg://...) или временный кластер,
+запущенный через initdb/pg_ctl. Если ни того, ни другого нет, тесты
+пропускаются.
+"""
+import os
+import shutil
+import socket
+import subprocess
+from datetime import datetime, timedelta
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from conftest import BASE_DIR, Base, engine
+from operations import (
+    create_operations, generate_operations, reset_db, take_snapshot,
+)
+from sqlalchemy import DateTime, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.sql import seconds_between
+from app.crud import charity_project_crud, donation_crud
+from app.models import CharityProject, DonorBalance, User
+from app.schemas.charity_project import CharityProjectCreate
+from app.schemas.donation import DonationCreate
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+    create_and_invest,
+)
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def postgresql_url(tmp_path_factory):
+    url = os.environ.get('TEST_POSTGRESQL_URL')
+    if url:
+        yield url
+        return
+    pg_ctl = shutil.which('pg_ctl')
+    if pg_ctl is None:
+        pytest.skip('PostgreSQL не найден: нет pg_ctl и TEST_POSTGRESQL_URL.')
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        pytest.skip('initdb нельзя запускать от root, задайте TEST_POSTGRESQL_URL.')
+    bin_dir = os.path.dirname(pg_ctl)
+    data_dir = tmp_path_factory.mktemp('pgdata')
+    port = get_free_port()
+    subprocess.run(
+        [os.path.join(bin_dir, 'initdb'), '-D', str(data_dir),
+         '-U', 'postgres', '-A', 'trust'],
+        check=True, capture_output=True,
+    )
+    subprocess.run(
+        [pg_ctl, '-D', str(data_dir), '-w', '-l', str(data_dir / 'log'),
+         '-o', f'-p {port} -k {data_dir} -c listen_addresses=127.0.0.1',
+         'start'],
+        check=True, capture_output=True,
+    )
+    yield f'postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres'
+    subprocess.run(
+        [pg_ctl, '-D', str(data_dir), '-m', 'fast', 'stop'],
+        check=True, capture_output=True,
+    )
+
+
+@pytest.fixture
+async def pg_engine(postgresql_url):
+    engine = create_async_engine(postgresql_url)
+    await reset_db(engine)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def test_migrations(postgresql_url, monkeypatch):
+    monkeypatch.chdir(BASE_DIR)
+    monkeypatch.setenv('DATABASE_URL', postgresql_url)
+    config = Config(str(BASE_DIR / 'alembic.ini'))
+    command.upgrade(config, 'head')
+    command.downgrade(config, 'base')
+
+
+async def run_operations(pg_engine, seed):
+    await reset_db(pg_engine)
+    session_maker = sessionmaker(
+        pg_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    await create_operations(generate_operations(seed), session_maker)
+    return await take_snapshot(session_maker)
+
+
+@pytest.mark.parametrize('seed', range(3))
+async def test_investment_engines_on_postgresql(pg_engine, seed, monkeypatch):
+    monkeypatch.setattr(settings, 'investment_engine', PYTHON_INVESTMENT_ENGINE)
+    expected = await run_operations(pg_engine, seed)
+    monkeypatch.setattr(settings, 'investment_engine', SQL_INVESTMENT_ENGINE)
+    result = await run_operations(pg_engine, seed)
+    assert result == expected, (
+        'На PostgreSQL построчная и множественная (UPDATE ... RETURNING) '
+        'реализации распределения должны давать одинаковый результат.'
+    )
+
+
+async def test_projects_by_completion_rate_on_postgresql(pg_engine):
+    start = datetime(2020, 1, 1)
+    session_maker = sessionmaker(pg_engine, class_=AsyncSession)
+    async with session_maker() as session:
+        for name, days in (('slow', 10), ('fast', 1), ('open', None)):
+            session.add(CharityProject(
+                name=name,
+                description=name,
+                full_amount=100,
+                invested_amount=100 if days else 0,
+                fully_invested=days is not None,
+                create_date=start,
+                close_date=start + timedelta(days=days) if days else None,
+                completion_rate=(
+                    timedelta(days=days).total_seconds() if days else None
+                ),
+            ))
+        await session.commit()
+        closed_projects = await charity_project_crud.get_projects_by_completion_rate(
+            session=session
+        )
+        closed_projects = [
+            (project.name, completion_rate)
+            for project, completion_rate in closed_projects
+        ]
+    assert closed_projects == [
+        ('fast', timedelta(days=1).total_seconds()),
+        ('slow', timedelta(days=10).total_seconds()),
+    ], (
+        'Закрытые проекты должны сортироваться по времени сбора средств, '
+        'время сбора возвращается в секундах.'
+    )
+
+
+@pytest.mark.parametrize('start, end', [
+    ('00:00:00.900000', '00:00:02.100000'),
+    ('00:00:00.100000', '00:00:01.900000'),
+    ('00:00:00.400000', '00:00:01.600000'),
+    ('00:00:05', '00:01:05'),
+])
+async def test_seconds_between_matches_sqlite(pg_engine, start, end):
+    start, end = (
+        literal(datetime.fromisoformat(f'2020-01-01T{time}'), DateTime)
+        for time in (start, end)
+    )
+    results = []
+    for db_engine in (engine, pg_engine):
+        async with db_engine.connect() as connection:
+            results.append(
+                await connection.scalar(select(seconds_between(start, end)))
+            )
+    assert results[0] == results[1], (
+        'Время сбора в секундах на PostgreSQL должно совпадать с SQLite, '
+        'в том числе для дат с дробными секундами.'
+    )
+
+
+async def test_donor_balance_on_postgresql(pg_engine):
+    session_maker = sessionmaker(
+        pg_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with session_maker() as session:
+        session.add(User(
+            id=1, email='donor@example.com', hashed_password='',
+            is_active=True, is_superuser=False, is_verified=True,
+        ))
+        await session.commit()
+        for full_amount in (100, 300):
+            await create_and_invest(
+                crud=donation_crud,
+                obj_in=DonationCreate(full_amount=full_amount),
+                session=session,
+                user_id=1,
+            )
+        await create_and_invest(
+            crud=charity_project_crud,
+            obj_in=CharityProjectCreate(
+                name='project', description='project', full_amount=200,
+            ),
+            session=session,
+        )
+        donor_balance = await session.execute(
+            select(DonorBalance).where(DonorBalance.user_id == 1)
+        )
+        donor_balance = donor_balance.scalar_one()
+    assert (
+        donor_balance.donations_count,
+        donor_balance.donations_amount,
+        donor_balance.invested_amount,
+        donor_balance.open_donations_count,
+    ) == (2, 400, 200, 1), (
+        'На PostgreSQL счётчики пользователя должны обновляться '
+        'через INSERT ... ON CONFLICT DO UPDATE.'
+    )
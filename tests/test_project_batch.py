@@ -0,0 +1,141 @@
+import pytest
+
+from app.core.config import settings
+from app.crud import charity_project_crud
+from app.services.investment import (
+    PYTHON_INVESTMENT_ENGINE,
+    SQL_INVESTMENT_ENGINE,
+)
+from app.services.project_batch import PROJECT_BATCH_MAX_SIZE
+
+
+def project(name, full_amount):
+    return {
+        'name': name,
+        'description': 'Seasonal campaign',
+        'full_amount': full_amount,
+    }
+
+
+@pytest.mark.parametrize('investment_engine', [
+    PYTHON_INVESTMENT_ENGINE, SQL_INVESTMENT_ENGINE,
+])
+def test_create_projects_batch(
+    superuser_client, closed_charity_project, donation, another_donation,
+    investment_engine, monkeypatch,
+):
+    monkeypatch.setattr(settings, 'investment_engine', investment_engine)
+    superuser_client.get('/charity_project/')
+    response = superuser_client.post('/charity_project/batch', json=[
+        project('winter', 150),
+        project('chimichangas4life', 100),
+        project('spring', 5000),
+        project('winter', 300),
+    ])
+    assert response.status_code == 200, (
+        'POST-запрос к эндпоинту `/charity_project/batch` должен вернуть '
+        'статус-код 200.'
+    )
+    results = response.json()
+    assert [result['name'] for result in results] == [
+        'winter', 'chimichangas4life', 'spring', 'winter',
+    ], 'Результаты должны идти в порядке пачки.'
+    assert 'error' not in results[0] and 'error' not in results[2]
+    assert results[1] == {
+        'name': 'chimichangas4life',
+        'error': 'Проект с таким именем уже существует!',
+    }, 'Занятое имя должно возвращать ошибку только для своего элемента.'
+    assert results[3] == {
+        'name': 'winter', 'error': 'Имя проекта повторяется в пачке!',
+    }, 'Повтор имени в пачке должен возвращать ошибку для повтора.'
+    winter, spring = results[0]['project'], results[2]['project']
+    assert (winter['invested_amount'], winter['fully_invested']) == (
+        150, True,
+    ), 'Открытые пожертвования должны распределяться в порядке пачки.'
+    assert spring['invested_amount'] == 1950, (
+        'Следующий проект пачки получает остаток открытых пожертвований.'
+    )
+    assert winter['id'] < spring['id']
+    summary = superuser_client.get('/fund/summary').json()
+    assert (
+        summary['projects_count'],
+        summary['projects_amount'],
+        summary['invested_amount'],
+    ) == (2, 5150, 2100), 'Пачка проектов должна учитываться в сводке фонда.'
+    names = [obj['name'] for obj in superuser_client.get(
+        '/charity_project/'
+    ).json()]
+    assert names == ['chimichangas4life', 'winter', 'spring'], (
+        'Кэш списка проектов должен сбрасываться после создания пачки.'
+    )
+
+
+@pytest.mark.parametrize('size', [0, PROJECT_BATCH_MAX_SIZE + 1])
+def test_create_projects_batch_size(superuser_client, size):
+    response = superuser_client.post('/charity_project/batch', json=[
+        project(f'project_{number}', 100) for number in range(size)
+    ])
+    assert response.status_code == 422, (
+        f'Пачка должна содержать от 1 до {PROJECT_BATCH_MAX_SIZE} проектов.'
+    )
+
+
+def test_create_projects_batch_validates_items(superuser_client):
+    response = superuser_client.post('/charity_project/batch', json=[
+        project('first', 100), project('', 100), 'second',
+        project('third', 100),
+    ])
+    assert response.status_code == 200, (
+        'Некорректный элемент не должен отклонять всю пачку.'
+    )
+    results = response.json()
+    assert [result.get('name') for result in results] == [
+        'first', '', None, 'third',
+    ]
+    assert 'project' in results[0] and 'project' in results[3], (
+        'Корректные элементы пачки должны создаваться.'
+    )
+    assert results[1]['error'].startswith(
+        'Некорректные данные проекта: name:'
+    ), 'Ошибка валидации должна возвращаться для своего элемента.'
+    assert 'project' not in results[2] and 'error' in results[2]
+
+
+def test_create_projects_batch_name_taken_concurrently(
+    superuser_client, charity_project, monkeypatch,
+):
+    calls = []
+    get_existing_names = charity_project_crud.get_existing_names
+
+    async def get_existing_names_before_race(names, session):
+        calls.append(names)
+        if len(calls) == 1:
+            return set()
+        return await get_existing_names(names=names, session=session)
+
+    monkeypatch.setattr(
+        charity_project_crud, 'get_existing_names',
+        get_existing_names_before_race,
+    )
+    response = superuser_client.post('/charity_project/batch', json=[
+        project('winter', 100), project(charity_project.name, 100),
+    ])
+    assert response.status_code == 200, (
+        'Имя, занятое параллельным запросом, не должно отклонять пачку.'
+    )
+    results = response.json()
+    assert 'project' in results[0]
+    assert results[1] == {
+        'name': charity_project.name,
+        'error': 'Проект с таким именем уже существует!',
+    }, 'Нарушение уникальности имени должно возвращаться для элемента.'
+    assert len(calls) == 2
+
+
+def test_create_projects_batch_requires_superuser(user_client):
+    response = user_client.post('/charity_project/batch', json=[
+        project('winter', 100),
+    ])
+    assert response.status_code == 401, (
+        'Создание пачки проектов должно быть доступно только суперюзерам.'
+    )
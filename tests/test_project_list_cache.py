@@ -0,0 +1,118 @@
+import pytest
+from conftest import app, current_user
+from fixtures.user import superuser
+
+from app.core.cache import MemoryCache, RedisCache
+from app.core.config import settings
+from app.services.response_cache import project_list_cache
+
+
+class RedisStandIn:
+    """Локальная замена клиента Redis: get, set(ex=...) и incr."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def project_cache(request, monkeypatch):
+    monkeypatch.setattr(settings, 'project_list_cache_ttl', 60)
+    backend = (
+        MemoryCache(max_size=10) if request.param == 'memory'
+        else RedisCache(client=RedisStandIn())
+    )
+    monkeypatch.setattr(project_list_cache, 'backend', backend)
+
+
+def test_project_list_etag(user_client, charity_project):
+    response = user_client.get('/charity_project/')
+    etag = response.headers.get('ETag')
+    assert etag, 'Список проектов должен возвращаться с заголовком ETag.'
+    response = user_client.get(
+        '/charity_project/', headers={'If-None-Match': etag}
+    )
+    assert response.status_code == 304, (
+        'Если список проектов не изменился, на запрос с If-None-Match '
+        'должен возвращаться статус-код 304.'
+    )
+    assert response.content == b'', 'Ответ 304 не должен содержать тела.'
+
+
+def test_project_list_cache_invalidated_by_create(
+    project_cache, superuser_client, charity_project, mixer,
+):
+    expected = superuser_client.get('/charity_project/').json()
+    mixer.blend(
+        'app.models.charity_project.CharityProject',
+        name='Out of band',
+        description='Written past the API',
+        full_amount=10,
+    )
+    assert superuser_client.get('/charity_project/').json() == expected, (
+        'Повторный запрос списка проектов должен обслуживаться из кэша.'
+    )
+    etag = superuser_client.get('/charity_project/').headers['ETag']
+    response = superuser_client.post('/charity_project/', json={
+        'name': 'New project',
+        'description': 'Invalidates the cache',
+        'full_amount': 100,
+    })
+    assert response.status_code == 200
+    projects = superuser_client.get(
+        '/charity_project/', headers={'If-None-Match': etag}
+    )
+    assert projects.status_code == 200 and len(projects.json()) == 3, (
+        'Создание проекта должно сбрасывать кэш списка проектов.'
+    )
+
+
+def test_project_list_cache_invalidated_by_donation(
+    project_cache, superuser_client, charity_project,
+):
+    superuser_client.get('/charity_project/')
+    app.dependency_overrides[current_user] = lambda: superuser
+    superuser_client.post('/donation/', json={'full_amount': 100})
+    response = superuser_client.get('/charity_project/')
+    assert response.json()[0]['invested_amount'] == 100, (
+        'Вложение пожертвования в проект должно сбрасывать кэш '
+        'списка проектов.'
+    )
+
+
+def test_project_list_cache_invalidated_by_update(
+    project_cache, superuser_client, charity_project,
+):
+    superuser_client.get('/charity_project/')
+    superuser_client.patch('/charity_project/1', json={'name': 'Renamed'})
+    response = superuser_client.get('/charity_project/')
+    assert response.json()[0]['name'] == 'Renamed', (
+        'Изменение проекта должно сбрасывать кэш списка проектов.'
+    )
+
+
+async def test_memory_cache_eviction_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('app.core.cache.time.monotonic', lambda: now[0])
+    cache = MemoryCache(max_size=2)
+    await cache.set('a', b'1', ttl=10)
+    await cache.set('b', b'2', ttl=10)
+    await cache.get('a')
+    await cache.set('c', b'3', ttl=10)
+    assert await cache.get('b') is None, (
+        'При переполнении должен вытесняться давно не использованный ключ.'
+    )
+    assert await cache.get('a') == b'1'
+    now[0] = 11
+    assert await cache.get('a') is None, (
+        'Значение с истёкшим TTL не должно возвращаться.'
+    )
@@ -0,0 +1,132 @@
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from conftest import TEST_DB
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.models import CharityProject
+from app.services.report import LOCAL_REPORT_BACKEND, LocalFileSink
+
+PROJECTS_COUNT = 2500
+
+
+@pytest.fixture
+def local_reports(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, 'report_backend', LOCAL_REPORT_BACKEND)
+    monkeypatch.setattr(settings, 'report_dir', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def many_closed_projects():
+    create_date = datetime(2020, 1, 1)
+    engine = create_engine(f'sqlite:///{str(TEST_DB)}')
+    with engine.begin() as connection:
+        connection.execute(
+            CharityProject.__table__.insert(),
+            [
+                {
+                    'name': f'project_{number}',
+                    'description': 'Closed project',
+                    'full_amount': 100,
+                    'invested_amount': 100,
+                    'fully_invested': True,
+                    'allocated': True,
+                    'create_date': create_date,
+                    'close_date': create_date + timedelta(minutes=number),
+                    'completion_rate': number * 60,
+                }
+                for number in range(PROJECTS_COUNT, 0, -1)
+            ],
+        )
+    engine.dispose()
+
+
+def get_report(client, limit):
+    response = client.get('/google/', params={'limit': limit})
+    assert response.status_code == 200, (
+        'GET-запрос к эндпоинту `/google/` должен вернуть статус-код 200.'
+    )
+    url = response.json()
+    assert url.startswith('/google/files/'), (
+        'Локальный отчёт должен возвращать ссылку на скачивание файла.'
+    )
+    response = client.get(url)
+    assert response.status_code == 200, (
+        f'GET-запрос к `{url}` должен вернуть файл отчёта.'
+    )
+    return url, response
+
+
+def test_local_csv_report(superuser_client, local_reports, many_closed_projects):
+    url, response = get_report(superuser_client, limit=2000)
+    rows = list(csv.reader(io.StringIO(response.content.decode())))
+    assert rows[2] == ['Название проекта', 'Время сбора', 'Описание']
+    assert len(rows) == 2003, (
+        'В отчёт должны попадать limit проектов после шапки.'
+    )
+    assert rows[3] == ['project_1', '0:01:00', 'Closed project'], (
+        'Проекты должны идти по возрастанию времени сбора.'
+    )
+    assert rows[-1][0] == 'project_2000'
+    assert [path.name for path in local_reports.iterdir()] == [
+        url.rsplit('/', 1)[1]
+    ], 'В каталоге отчётов не должно оставаться временных файлов.'
+
+
+def test_local_xlsx_report(
+    superuser_client, local_reports, many_closed_projects, monkeypatch
+):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.setattr(settings, 'report_format', 'xlsx')
+    url, response = get_report(superuser_client, limit=PROJECTS_COUNT)
+    assert url.endswith('.xlsx')
+    workbook = openpyxl.load_workbook(io.BytesIO(response.content))
+    rows = list(workbook.active.values)
+    assert len(rows) == PROJECTS_COUNT + 3
+    assert rows[3] == ('project_1', '0:01:00', 'Closed project')
+
+
+def test_local_parquet_report(
+    superuser_client, local_reports, many_closed_projects, monkeypatch
+):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(settings, 'report_format', 'parquet')
+    url, response = get_report(superuser_client, limit=10)
+    table = parquet.read_table(io.BytesIO(response.content))
+    assert table.column_names == ['name', 'description', 'completion_rate']
+    assert table.column('completion_rate').to_pylist() == [
+        number * 60 for number in range(1, 11)
+    ], 'В Parquet время сбора хранится в секундах.'
+
+
+@pytest.mark.parametrize('file_name', ['..%2Ftest.db', 'missing.csv'])
+def test_report_file_not_found(superuser_client, local_reports, file_name):
+    response = superuser_client.get(f'/google/files/{file_name}')
+    assert response.status_code == 404, (
+        'Скачивать можно только существующие файлы из каталога отчётов.'
+    )
+
+
+def test_report_file_requires_superuser(user_client, local_reports):
+    response = user_client.get('/google/files/report.csv')
+    assert response.status_code == 401, (
+        'Скачивание отчётов должно быть доступно только суперюзерам.'
+    )
+
+
+async def test_local_report_removes_tmp_file_on_error(tmp_path):
+    async def failing_batches():
+        yield [('project_1', 'Closed project', 60)]
+        raise RuntimeError('Ошибка чтения проектов')
+
+    sink = LocalFileSink(directory=str(tmp_path), report_format='csv')
+    with pytest.raises(RuntimeError):
+        await sink.write(failing_batches(), limit=10)
+    assert list(tmp_path.iterdir()) == [], (
+        'После ошибки в каталоге отчётов не должно оставаться '
+        'временных файлов.'
+    )
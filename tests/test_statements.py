@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+
+from conftest import TestingSessionLocal, engine
+from sqlalchemy import event
+
+from app.crud import charity_project_crud, donation_crud
+from app.schemas.charity_project import CharityProjectCreate
+from app.schemas.donation import DonationCreate
+from app.services.investment import create_and_invest
+
+
+@contextmanager
+def count_statements():
+    """Считает SQL-запросы и транзакции, выполненные на тестовой БД."""
+    counter = {'statements': [], 'transactions': 0}
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        counter['statements'].append(statement.split()[0])
+
+    def commit(conn):
+        counter['transactions'] += 1
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine.sync_engine, 'commit', commit)
+    try:
+        yield counter
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+        )
+        event.remove(engine.sync_engine, 'commit', commit)
+
+
+def report(name, counter):
+    print(
+        f'\n{name}: {len(counter["statements"])} SQL-запросов '
+        f'({", ".join(counter["statements"])}), '
+        f'{counter["transactions"]} транзакций'
+    )
+
+
+def check_single_transaction(counter):
+    assert counter['transactions'] == 1, (
+        'Создание объекта и распределение средств должны выполняться '
+        'в одной транзакции.'
+    )
+    assert counter['statements'][0] == 'INSERT', (
+        'Создание объекта не должно начинаться с лишних запросов.'
+    )
+
+
+def test_post_donation_statements(user_client, charity_project):
+    with count_statements() as counter:
+        response = user_client.post('/donation/', json={'full_amount': 100})
+    assert response.status_code == 200, (
+        'POST-запрос к эндпоинту `/donation/` должен вернуть статус-код 200.'
+    )
+    report('POST /donation/', counter)
+    check_single_transaction(counter)
+
+
+def test_post_charity_project_statements(superuser_client, donation):
+    with count_statements() as counter:
+        response = superuser_client.post('/charity_project/', json={
+            'name': 'Statements project',
+            'description': 'Count statements',
+            'full_amount': 50,
+        })
+    assert response.status_code == 200, (
+        'POST-запрос к эндпоинту `/charity_project/` должен вернуть '
+        'статус-код 200.'
+    )
+    report('POST /charity_project/', counter)
+    # Проверка уникальности имени выполняется до транзакции создания.
+    assert counter['statements'][0] == 'SELECT'
+    counter['statements'] = counter['statements'][1:]
+    check_single_transaction(counter)
+
+
+async def test_create_and_invest_statements_without_queue(donation):
+    async with TestingSessionLocal() as session:
+        with count_statements() as counter:
+            project = await create_and_invest(
+                crud=charity_project_crud,
+                obj_in=CharityProjectCreate(
+                    name='Statements project',
+                    description='Count statements',
+                    full_amount=50,
+                ),
+                session=session,
+            )
+            donation = await create_and_invest(
+                crud=donation_crud,
+                obj_in=DonationCreate(full_amount=20),
+                session=session,
+                user_id=1,
+            )
+    report('create_and_invest (проект и пожертвование)', counter)
+    assert counter['transactions'] == 2, (
+        'Каждое создание объекта должно выполняться в одной транзакции.'
+    )
+    assert project.invested_amount == 50 and project.fully_invested, (
+        'Средства открытого пожертвования должны быть вложены в проект.'
+    )
+    assert donation.invested_amount == 0, (
+        'При отсутствии открытых проектов пожертвование не инвестируется.'
+    )
@@ -0,0 +1,78 @@
+import pytest
+from conftest import app, engine, get_async_session, override_db
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.user_cache import user_cache
+
+
+@pytest.fixture
+def auth_client():
+    app.dependency_overrides = {}
+    app.dependency_overrides[get_async_session] = override_db
+    with TestClient(app) as client:
+        client.post('/auth/register', json={
+            'email': 'dead@pool.com',
+            'password': 'chimichangas4life',
+        })
+        response = client.post('/auth/jwt/login', data={
+            'username': 'dead@pool.com',
+            'password': 'chimichangas4life',
+        })
+        client.headers['Authorization'] = (
+            f'Bearer {response.json()["access_token"]}'
+        )
+        yield client
+    user_cache.invalidate(user_id=1)
+
+
+def count_user_selects(client, url):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+        )
+    assert response.status_code == 200, (
+        f'GET-запрос к эндпоинту `{url}` должен вернуть статус-код 200.'
+    )
+    return sum('FROM user' in statement for statement in statements)
+
+
+def test_user_cache_skips_user_select(auth_client):
+    assert count_user_selects(auth_client, '/donation/my') == 1, (
+        'При первом запросе пользователь загружается из БД.'
+    )
+    assert count_user_selects(auth_client, '/donation/my') == 0, (
+        'Повторный запрос с тем же токеном не должен загружать '
+        'пользователя из БД.'
+    )
+
+
+def test_user_cache_disabled(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, 'user_cache_ttl', 0)
+    user_cache.invalidate(user_id=1)
+    auth_client.get('/donation/my')
+    assert count_user_selects(auth_client, '/donation/my') == 1, (
+        'С выключенным кэшем пользователь загружается на каждый запрос.'
+    )
+
+
+def test_user_cache_invalidated_on_update(auth_client):
+    auth_client.get('/users/me')
+    response = auth_client.patch(
+        '/users/me', json={'email': 'wade@pool.com'}
+    )
+    assert response.status_code == 200, (
+        'Пользователь должен иметь возможность изменить свои данные.'
+    )
+    assert auth_client.get('/users/me').json()['email'] == 'wade@pool.com', (
+        'Изменение пользователя через /users должно сбрасывать кэш.'
+    )